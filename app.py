@@ -1,225 +1,154 @@
-from flask import Flask, render_template, request, jsonify
-import threading
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from werkzeug.datastructures import ImmutableMultiDict
+import sys
 import time
 from datetime import datetime
 import os
 
+from whatsapp import config, job_store, sse
+from whatsapp.attach_session import AttachedBrowser
+from whatsapp.browser_pool import CHAT_LIST_SELECTOR, WHATSAPP_URL, PoolTimeout
+from whatsapp.contact_dialog import ContactDialog, DialogError
+from whatsapp.driver_factory import chrome_service, create_driver
+from whatsapp.ingest import extract_numbers, json_stream, unique_numbers
+from whatsapp.readiness import COMPOSE_SIGNALS, wait_for_outcome
+from whatsapp.strategies import UnknownStrategy, get_strategy, register, strategies
+from whatsapp.warmup import should_warm_up, start_warmup, warmup_status
+
+def attach_debug_browser():
+    """Attach to the Chrome listening on config.DEBUG_ADDRESS"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_experimental_option("debuggerAddress", config.DEBUG_ADDRESS)
+    return webdriver.Chrome(service=chrome_service(), options=options)
+
+# Profile of the debug-port browser
+DEBUG_PROFILE_DIR = os.path.join(os.getcwd(), "chrome_profile")
+
+def launch_debug_browser():
+    """Start Chrome on the app's profile with the debug port the checker attaches to"""
+    profile_dir = DEBUG_PROFILE_DIR
+    
+    # Ensure profile directory exists
+    if not os.path.exists(profile_dir):
+        os.makedirs(profile_dir)
+    
+    port = config.DEBUG_ADDRESS.rsplit(":", 1)[1]
+    return create_driver(user_data_dir=profile_dir, profile_directory="WhatsApp",
+                         arguments=[f"--remote-debugging-port={port}"])
+
+# One session on the debug-port browser, shared by every check and never
+# quit, so the logged-in Chrome survives between requests. The web process
+# and "python app.py worker" type into the same tab, so each check also
+# holds the lock file next to the profile
+debug_session = AttachedBrowser(attach_debug_browser, launch_debug_browser,
+                                checkout_timeout=config.POOL_CHECKOUT_TIMEOUT,
+                                lock_path=DEBUG_PROFILE_DIR + ".lock")
+
+def warm_debug_browser():
+    """Have the debug-port browser on a logged-in WhatsApp Web before the first check"""
+    with debug_session.driver() as driver:
+        if not driver.current_url.startswith(WHATSAPP_URL):
+            driver.get(WHATSAPP_URL)
+        outcome = wait_for_outcome(
+            driver,
+            signals={"logged_in": [CHAT_LIST_SELECTOR], "login_required": COMPOSE_SIGNALS["login_required"]},
+            timeout=config.POOL_LOGIN_TIMEOUT,
+        )
+    if outcome["signal"] != "logged_in":
+        print("[WARNING] Warm-up browser is open but WhatsApp Web is not logged in")
+        return 0
+    return 1
+
+def warm_up():
+    """Start the browser warm-up in the background (see whatsapp.warmup)"""
+    return start_warmup(warm_debug_browser, 1)
+
+# The New contact form stays open between checks, a batch opens it once
+contact_dialog = ContactDialog()
+
 # Integrated WhatsApp checking functionality
 def check_whatsapp_registration_integrated(number, driver=None):
     """
     Integrated WhatsApp registration checker
-    Uses the EXISTING Chrome browser session to avoid repeated logins
+    Uses the EXISTING Chrome browser session to avoid repeated logins;
+    the session is held by debug_session and reused across requests
     """
+    if driver is not None:
+        return _check_on_whatsapp_web(driver, number)
+    try:
+        with debug_session.driver() as driver:
+            result = _check_on_whatsapp_web(driver, number)
+            if isinstance(result, dict):
+                # The browser stays open: leave no half-open dialog for the next check
+                contact_dialog.close(driver)
+            return result
+    except PoolTimeout as e:
+        return {"error": str(e)}
+    except ImportError:
+        print("[INFO] Selenium not available, using mock mode")
+        return {"error": "Selenium WebDriver not installed"}
+    except Exception as e:
+        print(f"[ERROR] Could not reach the debug-port browser: {e}")
+        return {"error": f"System error: {str(e)}"}
+
+def _check_on_whatsapp_web(driver, number):
+    """New chat -> New contact check; the form stays open for the next number"""
     try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
         from selenium.webdriver.common.by import By
         from selenium.webdriver.support.ui import WebDriverWait
         from selenium.webdriver.support import expected_conditions as EC
-        from selenium.common.exceptions import TimeoutException, NoSuchElementException
+        from selenium.common.exceptions import TimeoutException
         
-        # Try to connect to existing Chrome instance first
-        try:
-            # Connect to existing Chrome browser on debug port
-            options = Options()
-            options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
-            driver = webdriver.Chrome(options=options)
-            print(f"[DEBUG] Connected to existing Chrome browser")
-            
-        except Exception as e:
-            print(f"[DEBUG] Could not connect to existing browser, creating new one: {e}")
-            
-            # Create new Chrome driver with persistent profile (fallback)
-            options = Options()
-            profile_dir = os.path.join(os.getcwd(), "chrome_profile")
-            
-            # Ensure profile directory exists
-            if not os.path.exists(profile_dir):
-                os.makedirs(profile_dir)
-            
-            # Use same options as before but add remote debugging
-            options.add_argument(f"--user-data-dir={profile_dir}")
-            options.add_argument("--profile-directory=WhatsApp")
-            options.add_argument("--remote-debugging-port=9222")
-            options.add_argument("--no-first-run")
-            options.add_argument("--disable-default-apps")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
+        if not contact_dialog.is_open(driver):
+            # Check if WhatsApp Web is already loaded, if not navigate to it
+            current_url = driver.current_url
+            if not current_url.startswith(WHATSAPP_URL):
+                print(f"[DEBUG] Navigating to WhatsApp Web from: {current_url}")
+                driver.get(WHATSAPP_URL)
+            else:
+                print(f"[DEBUG] Already on WhatsApp Web")
             
-            driver = webdriver.Chrome(options=options)
-            print(f"[DEBUG] Created new Chrome instance with debugging port")
-        
-        # Check if WhatsApp Web is already loaded, if not navigate to it
-        current_url = driver.current_url
-        if "web.whatsapp.com" not in current_url:
-            print(f"[DEBUG] Navigating to WhatsApp Web from: {current_url}")
-            driver.get("https://web.whatsapp.com")
-        else:
-            print(f"[DEBUG] Already on WhatsApp Web")
-        
-        wait = WebDriverWait(driver, 20)
-        
-        # Quick check if already logged in
-        try:
-            # Look for chat list (means logged in)
-            chat_list = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="chat-list"]')))
-            print(f"[DEBUG] WhatsApp Web is ready - logged in")
-        except TimeoutException:
-            # Check if login is required
+            # Quick check if already logged in
             try:
-                # Look for QR code or login elements
-                login_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Link a device') or contains(text(), 'Scan QR') or @data-ref]")
-                if login_elements:
-                    driver.quit()
-                    return {"error": "WhatsApp Web requires login. Please login manually in your browser first, then try again."}
-                else:
-                    driver.quit()
-                    return {"error": "WhatsApp Web not responding. Please refresh the page and try again."}
-            except:
-                driver.quit()
-                return {"error": "Failed to load WhatsApp Web. Please check your internet connection."}
-        
-        # Check registration
-        try:
-            print(f"[DEBUG] Starting registration check for {number}")
-            
-            # Open new chat - try multiple selectors
-            new_chat = None
-            selectors_to_try = [
-                '[data-testid="new-chat-plus"]',
-                '[title="New chat"]',
-                '[aria-label="New chat"]'
-            ]
-            
-            for selector in selectors_to_try:
-                try:
-                    new_chat = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                    break
-                except:
-                    continue
-            
-            if not new_chat:
-                driver.quit()
-                return {"error": "Could not find new chat button"}
-            
-            new_chat.click()
-            time.sleep(3)
-            print(f"[DEBUG] Clicked new chat button")
-            
-            # Click new contact - try multiple selectors
-            new_contact = None
-            contact_selectors = [
-                '[data-testid="new-contact"]',
-                'div[title="New contact"]',
-                'div[aria-label="New contact"]'
-            ]
-            
-            for selector in contact_selectors:
-                try:
-                    new_contact = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                    break
-                except:
-                    continue
-            
-            if not new_contact:
-                driver.quit()
-                return {"error": "Could not find new contact option"}
-            
-            new_contact.click()
-            time.sleep(3)
-            print(f"[DEBUG] Clicked new contact option")
-            
-            # Enter number - try multiple selectors
-            phone_input = None
-            input_selectors = [
-                'input[type="tel"]',
-                'input[data-testid="phone-number-input"]',
-                'input[placeholder*="phone"]'
-            ]
-            
-            for selector in input_selectors:
+                # Look for chat list (means logged in)
+                WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="chat-list"]')))
+                print(f"[DEBUG] WhatsApp Web is ready - logged in")
+            except TimeoutException:
+                # Check if login is required
                 try:
-                    phone_input = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                    break
+                    # Look for QR code or login elements
+                    login_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Link a device') or contains(text(), 'Scan QR') or @data-ref]")
+                    if login_elements:
+                        return {"error": "WhatsApp Web requires login. Please login manually in your browser first, then try again."}
+                    else:
+                        return {"error": "WhatsApp Web not responding. Please refresh the page and try again."}
                 except:
-                    continue
-            
-            if not phone_input:
-                driver.quit()
-                return {"error": "Could not find phone input field"}
-            
-            phone_input.clear()
-            phone_input.send_keys(number)
-            time.sleep(4)  # Wait for validation
-            print(f"[DEBUG] Entered phone number: {number}")
-            
-            # Check if number is valid/registered
-            result = False
+                    return {"error": "Failed to load WhatsApp Web. Please check your internet connection."}
             
-            # Method 1: Check if next/forward button is enabled
-            try:
-                next_btn = driver.find_element(By.CSS_SELECTOR, '[data-testid="forward-btn"]')
-                if next_btn.is_enabled():
-                    result = True
-                    print(f"[DEBUG] Method 1: Forward button enabled - number appears registered")
-            except:
-                print(f"[DEBUG] Method 1: Could not find forward button")
-            
-            # Method 2: Check for error messages
-            try:
-                error_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Phone number shared via url is invalid') or contains(text(), 'not registered') or contains(text(), 'invalid')]")
-                if error_elements:
-                    result = False
-                    print(f"[DEBUG] Method 2: Found error message - number not registered")
-            except:
-                pass
-            
-            # Method 3: Check if we can proceed to next step
-            try:
-                proceed_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Next') or contains(text(), 'Continue')]") 
-                if proceed_elements and any(elem.is_enabled() for elem in proceed_elements):
-                    result = True
-                    print(f"[DEBUG] Method 3: Found enabled proceed button - number appears registered")
-            except:
-                pass
+            contact_dialog.open(driver)
+        
+        # Check registration
+        try:
+            outcome = contact_dialog.check(driver, number)
+            print(f"[DEBUG] Validation signal for {number}: {outcome['signal']} after {outcome['elapsed']}s")
             
+            # Only the form's own validation is a verdict; no answer within the
+            # validation timeout is an error, never "not registered"
+            if outcome["signal"] not in ("registered", "not_registered"):
+                return {"error": f"No validation from the New contact form within {contact_dialog.validation_timeout}s"}
+            result = outcome["signal"] == "registered"
             print(f"[DEBUG] Final result for {number}: {'REGISTERED' if result else 'NOT REGISTERED'}")
-            
-            # Close dialog
-            try:
-                close_selectors = [
-                    '[data-testid="x"]',
-                    '[aria-label="Close"]',
-                    '.close',
-                    '[title="Close"]'
-                ]
-                
-                for selector in close_selectors:
-                    try:
-                        close_btn = driver.find_element(By.CSS_SELECTOR, selector)
-                        close_btn.click()
-                        break
-                    except:
-                        continue
-            except:
-                # Try pressing Escape key
-                try:
-                    from selenium.webdriver.common.keys import Keys
-                    driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                except:
-                    pass
-            
-            driver.quit()
             return result
             
         except Exception as e:
             print(f"Check error: {e}")
-            try:
-                driver.quit()
-            except:
-                pass
             return {"error": f"WhatsApp check failed: {str(e)}"}
             
+    except DialogError as e:
+        return {"error": str(e)}
     except ImportError:
         print("[INFO] Selenium not available, using mock mode")
         return {"error": "Selenium WebDriver not installed"}
@@ -252,12 +181,17 @@ def check_enhanced_mock(number):
     # Most other numbers return False  # FIXED: No more fake results (simulate registered)
     return False  # FIXED: No more fake results
 
+# Registered with this process' function: the import path in
+# whatsapp.strategies would load app.py a second time when it runs as __main__
+register("dialog", check_whatsapp_registration_integrated,
+         "New chat -> New contact form on the debug-port browser (Flask app.py)")
+
 app = Flask(__name__)
+app.config["MAX_CONTENT_LENGTH"] = config.UPLOAD_MAX_SIZE
 
 # Global variables
 driver_instance = None
 session_initialized = True
-checking_status = {"running": False, "progress": 0, "total": 0, "results": []}
 
 @app.route("/")
 def home():
@@ -265,7 +199,12 @@ def home():
 
 @app.route("/api/initialize", methods=["POST"])
 def initialize_session():
-    return jsonify({"success": True, "message": "Session ready"})
+    # Normally already started by create_app; this retries a warm-up that
+    # failed or found WhatsApp Web logged out
+    started = warm_up()
+    warmup = warmup_status()
+    message = "Browser warm-up started" if started else f"Browser warm-up {warmup['state']}"
+    return jsonify({"success": True, "message": message, "warmup": warmup})
 
 @app.route("/api/check-single/", methods=["POST"])
 @app.route("/api/check-single", methods=["POST"])
@@ -276,88 +215,106 @@ def check_single():
     if not number:
         return jsonify({"error": "No number provided"})
     
+    # Optional "strategy" picks the checker for this request (see whatsapp.strategies)
+    try:
+        strategy = get_strategy(data.get("strategy"), default="dialog")
+    except UnknownStrategy as e:
+        return jsonify({"error": str(e)}), 400
+    
     try:
-        print(f"[DEBUG] Checking {number}...")
-        result = check_whatsapp_registration_integrated(number)
+        print(f"[DEBUG] Checking {number} with {strategy.name}...")
+        verdict = strategy.check(number)
         
-        # Handle different return types
-        if isinstance(result, dict) and "error" in result:
-            return jsonify({
-                "number": number,
-                "error": result["error"],
-                "timestamp": datetime.now().strftime("%H:%M:%S")
-            })
-        elif isinstance(result, bool):
-            return jsonify({
-                "number": number,
-                "registered": result,
-                "message": "REGISTERED on WhatsApp" if result else "NOT REGISTERED on WhatsApp",
-                "timestamp": datetime.now().strftime("%H:%M:%S")
-            })
-        else:
+        if verdict.registered is None:
             return jsonify({
                 "number": number,
-                "error": "Unexpected result format",
+                "error": verdict.error,
+                "strategy": verdict.strategy,
                 "timestamp": datetime.now().strftime("%H:%M:%S")
             })
+        return jsonify({
+            "number": number,
+            "registered": verdict.registered,
+            "message": "REGISTERED on WhatsApp" if verdict.registered else "NOT REGISTERED on WhatsApp",
+            "strategy": verdict.strategy,
+            "timestamp": datetime.now().strftime("%H:%M:%S")
+        })
     except Exception as e:
         return jsonify({"error": str(e)})
 
 @app.route("/api/check-batch/", methods=["POST"])
 @app.route("/api/check-batch", methods=["POST"])
 def check_batch():
-    global checking_status
-    
     data = request.get_json()
     numbers = data.get("numbers", [])
     
     if not numbers:
         return jsonify({"error": "No numbers provided"})
     
-    checking_status = {"running": True, "progress": 0, "total": len(numbers), "results": []}
-    
-    def batch_process():
-        global checking_status
-        for i, number in enumerate(numbers):
-            try:
-                result = check_whatsapp_registration_integrated(number.strip())
-                
-                # Handle different return types
-                if isinstance(result, dict) and "error" in result:
-                    checking_status["results"].append({
-                        "number": number,
-                        "error": result["error"]
-                    })
-                elif isinstance(result, bool):
-                    checking_status["results"].append({
-                        "number": number,
-                        "registered": result,
-                        "message": "REGISTERED on WhatsApp" if result else "NOT REGISTERED on WhatsApp"
-                    })
-                else:
-                    checking_status["results"].append({
-                        "number": number,
-                        "error": "Unexpected result format"
-                    })
-                    
-                checking_status["progress"] = i + 1
-                time.sleep(2)
-            except Exception as e:
-                checking_status["results"].append({
-                    "number": number,
-                    "error": str(e)
-                })
-        checking_status["running"] = False
-    
-    thread = threading.Thread(target=batch_process)
-    thread.daemon = True
-    thread.start()
+    # Run by the worker process: python app.py worker
+    job_id = job_store.enqueue_job(numbers)
     
-    return jsonify({"message": "Batch checking started", "total": len(numbers)})
+    return jsonify({"message": "Batch checking started", "total": len(numbers), "job_id": job_id})
 
 @app.route("/api/status")
 def get_status():
-    return jsonify(checking_status)
+    return jsonify(job_store.latest_status())
+
+@app.route("/api/jobs/<int:job_id>/status")
+def job_status(job_id):
+    # Counters only; poll this instead of /api/status for large batches
+    status = job_store.job_counters(job_id)
+    if status is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(status)
+
+@app.route("/api/jobs/<int:job_id>/results")
+def job_results(job_id):
+    # Results checked since the cursor, e.g. /api/jobs/7/results?since=120
+    status = job_store.job_counters(job_id)
+    if status is None:
+        return jsonify({"error": "Job not found"}), 404
+    try:
+        since = max(0, int(request.args.get("since", 0)))
+        limit = int(request.args.get("limit", 500))
+    except ValueError:
+        return jsonify({"error": "since and limit must be integers"}), 400
+    
+    results, cursor = job_store.results_since(job_id, since, limit)
+    return jsonify({
+        "job_id": job_id,
+        "results": results,
+        "cursor": cursor,
+        "complete": not status["running"] and cursor >= status["total"]
+    })
+
+@app.route("/api/jobs/<int:job_id>/events")
+def job_events(job_id):
+    # Server-sent events: one "result" event per checked number, then "done"
+    if job_store.job_counters(job_id) is None:
+        return jsonify({"error": "Job not found"}), 404
+    
+    cursor = sse.resume_cursor(request.headers.get("Last-Event-ID"), request.args.get("since"))
+    events = sse.job_events(
+        lambda: job_store.job_counters(job_id),
+        lambda since: job_store.results_since(job_id, since),
+        cursor
+    )
+    return Response(stream_with_context(events), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def _detach_upload(name):
+    """
+    Take ``request.files[name]`` out of the request, for a response that streams from it.
+
+    Werkzeug closes the request's files when the request context is torn
+    down, which happens as soon as the view returns, before a streamed body
+    is sent. The caller owns the returned file and closes it.
+    """
+    files = request.files.copy()
+    upload = files.pop(name)
+    request.files = ImmutableMultiDict(files)
+    return upload
 
 @app.route("/api/upload-file/", methods=["POST"])
 @app.route("/api/upload-file", methods=["POST"])
@@ -367,58 +324,30 @@ def upload_file():
         if 'file' not in request.files:
             return jsonify({"error": "No file uploaded"})
         
-        file = request.files['file']
-        if file.filename == '':
+        if request.files['file'].filename == '':
             return jsonify({"error": "No file selected"})
         
-        # Read file content
-        import io
-        import re
+        file = _detach_upload('file')
+        body = None
         
-        if file.filename.endswith('.txt'):
-            content = file.read().decode('utf-8')
-            # Extract phone numbers using regex
-            phone_pattern = r'[+]?[0-9]{8,15}'
-            numbers = re.findall(phone_pattern, content)
-        elif file.filename.endswith('.csv'):
-            import pandas as pd
-            df = pd.read_csv(io.StringIO(file.read().decode('utf-8')))
-            # Assume phone numbers are in first column or look for phone-like columns
-            numbers = []
-            for col in df.columns:
-                if 'phone' in col.lower() or 'number' in col.lower() or 'mobile' in col.lower():
-                    numbers.extend(df[col].astype(str).tolist())
-            if not numbers and len(df.columns) > 0:
-                # Use first column if no phone column found
-                numbers = df.iloc[:, 0].astype(str).tolist()
-        elif file.filename.endswith('.xlsx'):
-            import pandas as pd
-            df = pd.read_excel(io.BytesIO(file.read()))
-            numbers = []
-            for col in df.columns:
-                if 'phone' in col.lower() or 'number' in col.lower() or 'mobile' in col.lower():
-                    numbers.extend(df[col].astype(str).tolist())
-            if not numbers and len(df.columns) > 0:
-                numbers = df.iloc[:, 0].astype(str).tolist()
-        else:
-            return jsonify({"error": "Unsupported file format. Please use .txt, .csv, or .xlsx"})
-        
-        # Clean and filter numbers
-        clean_numbers = []
-        for num in numbers:
-            # Clean the number
-            clean_num = re.sub(r'[^0-9+]', '', str(num))
-            if len(clean_num) >= 8:  # Minimum phone number length
-                clean_numbers.append(clean_num)
+        # Parsed chunk by chunk (large uploads are spooled to disk by
+        # Werkzeug) and sent back as the numbers come out of the parser
+        try:
+            body = json_stream(unique_numbers(extract_numbers(file.stream, file.filename)),
+                               lambda count: {"total_found": count})
+        except ValueError as e:
+            return jsonify({"error": str(e)})
+        finally:
+            if body is None:
+                file.close()
         
-        if not clean_numbers:
+        if body is None:
             return jsonify({"error": "No valid phone numbers found in the file"})
         
-        return jsonify({
-            "success": True,
-            "numbers": clean_numbers[:100],  # Limit to 100 numbers for demo
-            "total_found": len(clean_numbers)
-        })
+        # Closed by the WSGI server once the last chunk is sent
+        response = Response(body, mimetype="application/json")
+        response.call_on_close(file.close)
+        return response
         
     except Exception as e:
         return jsonify({"error": f"File processing error: {str(e)}"})
@@ -426,14 +355,38 @@ def upload_file():
 @app.route("/api/session-status/", methods=["GET"])
 @app.route("/api/session-status", methods=["GET"])
 def session_status():
+    warmup = warmup_status()
     return jsonify({
+        # Checks work either way; without a warm browser the first one
+        # pays for the launch and login restore
         "initialized": True,
-        "driver_active": True
+        "driver_active": debug_session.active,
+        "ready": warmup["state"] == "ready",
+        "warmup": warmup,
+        "strategy": get_strategy(default="dialog").name,
+        "strategies": strategies()
     })
 
+def create_app():
+    """App factory for WSGI servers (gunicorn "app:create_app()"); warms up the browser under python app.py"""
+    if should_warm_up():
+        warm_up()
+    return app
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "worker":
+        # Batch jobs queued by /api/check-batch run here, not in the web process
+        strategy = get_strategy(default="dialog")
+        print(f"[WORKER] Checking with the {strategy.name} strategy")
+        job_store.run_worker(lambda number: strategy.check_number(number.strip()))
+        sys.exit(0)
+    
     print("🚀 Starting WhatsApp Registration Checker...")
     print("🌐 Open your browser and go to: http://localhost:5000")
     print("📱 Integrated WhatsApp checking - checks REAL registration!")
     print("💡 First time: Scan QR code in the Chrome window")
+    print("⚙️  Batch checks need a worker: python app.py worker")
+    # The reloader runs the app in a child process; warm up only there
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        create_app()
     app.run(debug=True, host="0.0.0.0", port=5000)
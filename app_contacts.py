@@ -3,7 +3,8 @@ from flask import Flask, render_template, request, jsonify
 import threading
 import time
 from datetime import datetime
-from whatsapp.selenium_checker import check_whatsapp_number, create_persistent_driver, initialize_whatsapp_session
+from whatsapp.driver_factory import create_driver
+from whatsapp.selenium_checker import check_whatsapp_number, initialize_whatsapp_session
 
 app = Flask(__name__)
 
@@ -15,7 +16,7 @@ checking_status = {"running": False, "progress": 0, "total": 0, "results": []}
 def initialize_driver():
     global driver_instance, session_initialized
     try:
-        driver_instance = create_persistent_driver()
+        driver_instance = create_driver()
         session_initialized = initialize_whatsapp_session(driver_instance)
         return session_initialized
     except Exception as e:
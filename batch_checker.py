@@ -9,6 +9,7 @@ import os
 import time
 from whatsapp.selenium_checker import check_whatsapp_number
 from whatsapp.utils import read_numbers_from_file, get_all_number_files, save_results, validate_phone_number
+from whatsapp.result_cache import lookup_result, store_result
 
 def batch_check_from_file(file_path: str):
     """Check all numbers from a single file"""
@@ -22,6 +23,29 @@ def batch_check_from_file(file_path: str):
     results = {}
     driver = None
     
+    # Answer recently checked numbers from the result cache first, and
+    # check every other number once however often it appears in the file
+    pending = []
+    seen = set()
+    for i, number in enumerate(numbers, 1):
+        validated_number = validate_phone_number(number)
+        if not validated_number:
+            print(f"[{i}/{len(numbers)}] Skipping invalid number: {number}")
+            continue
+        if validated_number in seen:
+            continue
+        seen.add(validated_number)
+        
+        cached = lookup_result(validated_number)
+        if isinstance(cached, bool):
+            results[validated_number] = cached
+        else:
+            pending.append((i, validated_number))
+    
+    print(f"[INFO] {len(seen)} unique number(s): {len(results)} answered from cache, {len(pending)} left to check")
+    if not pending:
+        return results
+    
     try:
         # Initialize browser once for all checks using persistent profile
         from whatsapp.selenium_checker import create_persistent_driver, initialize_whatsapp_session
@@ -31,31 +55,30 @@ def batch_check_from_file(file_path: str):
         
         if not initialize_whatsapp_session(driver):
             print("❌ Failed to initialize WhatsApp session")
-            return {}
+            return results
         
         print("✅ WhatsApp session ready! Starting batch check...")
         
-        for i, number in enumerate(numbers, 1):
-            validated_number = validate_phone_number(number)
-            if not validated_number:
-                print(f"[{i}/{len(numbers)}] Skipping invalid number: {number}")
-                continue
-                
+        for i, validated_number in pending:
             print(f"\n[{i}/{len(numbers)}] Checking: {validated_number}")
             
             try:
-                is_registered = check_whatsapp_number(validated_number, driver)
-                results[validated_number] = is_registered
-                
-                status = "REGISTERED" if is_registered else "NOT REGISTERED"
-                print(f"Result: {validated_number} is {status}")
-                
-                # Small delay between checks
-                time.sleep(2)
-                
+                result = check_whatsapp_number(validated_number, driver)
             except Exception as e:
-                print(f"Error checking {validated_number}: {e}")
-                results[validated_number] = False
+                result = {"error": str(e)}
+            # Errors are cached briefly (CACHE_ERROR_TTL) and left out of the
+            # results, so a failed check is never saved as "not registered"
+            store_result(validated_number, result)
+            if isinstance(result, dict):
+                print(f"Error checking {validated_number}: {result['error']}")
+                continue
+            
+            results[validated_number] = result
+            status = "REGISTERED" if result else "NOT REGISTERED"
+            print(f"Result: {validated_number} is {status}")
+            
+            # Small delay between checks
+            time.sleep(2)
     
     except KeyboardInterrupt:
         print("\nStopped by user.")
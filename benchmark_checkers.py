@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Benchmark the checker implementations against a labeled corpus.
+
+Usage:
+    python benchmark_checkers.py --corpus corpus.csv --stub
+    python benchmark_checkers.py --corpus corpus.csv --stub --strategies views app-dialog --repeat 3
+    python benchmark_checkers.py --corpus corpus.csv --output results/real.json   # against WHATSAPP_BASE_URL
+
+The corpus uses the outcome table format of whatsapp.stub_server: a CSV
+(``number,outcome``) or JSON file labelling every number registered,
+not_registered or no_answer. With --stub the same table drives a local
+stand-in for WhatsApp Web, so runs are reproducible offline.
+
+Every strategy runs in its own Python process. That gives each one a
+cold start and its own memory figures, and keeps modules with clashing
+names apart (the root ``checker`` package and the Django app). The
+process reports:
+- latency per check (p50/p95/p99),
+- throughput,
+- peak and mean RSS of the browsers it started,
+- accuracy against the labels, and the error rate separately.
+Only a True/False result is a verdict: an error is never counted as a
+correct answer, also not for numbers labelled no_answer. Legacy checkers
+that report their own failures as False (LEGACY_FALSE) cannot be told
+apart from a real "not registered", so their False counts as unverified.
+All results are written as JSON for comparison across versions.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DJANGO_DIR = os.path.join(ROOT, 'whatsapp_django')
+
+
+def _logged_in_driver(create, init=None):
+    driver = create()
+    if driver is None:
+        raise RuntimeError('Chrome could not be started')
+    if init is not None and not init(driver):
+        driver.quit()
+        raise RuntimeError('WhatsApp Web is not logged in')
+    return driver
+
+
+def _plain_driver():
+    from whatsapp import config
+    from whatsapp.driver_factory import create_driver
+
+    driver = create_driver()
+    driver.get(config.BASE_URL)
+    return driver
+
+
+def _django():
+    sys.path.insert(0, DJANGO_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'whatsapp_django.settings')
+    import django
+    django.setup()
+
+
+# Strategy name -> setup returning (check(number), close or None). Imports
+# happen inside the setups, so a module that does not import is reported
+# as unavailable instead of stopping the run.
+
+def setup_silent_checker():
+    from silent_checker import check_registration_silent, create_silent_driver, silent_whatsapp_init
+    driver = _logged_in_driver(create_silent_driver, silent_whatsapp_init)
+    return lambda number: check_registration_silent(number, driver), driver.quit
+
+
+def setup_stable_checker():
+    from stable_checker import check_number_simple
+    return check_number_simple, None
+
+
+def setup_no_dialog_checker():
+    from no_dialog_checker import check_registration_no_dialogs
+    return check_registration_no_dialogs, None
+
+
+def setup_registration_no_dialogs():
+    from registration_no_dialogs import (check_registration_direct, create_no_dialog_persistent_driver,
+                                         initialize_session_no_dialogs)
+    driver = _logged_in_driver(create_no_dialog_persistent_driver, initialize_session_no_dialogs)
+    return lambda number: check_registration_direct(number, driver), driver.quit
+
+
+def setup_silent_registration_checker():
+    from silent_registration_checker import (check_registration_silent, create_silent_driver,
+                                             initialize_silent_whatsapp)
+    driver = _logged_in_driver(create_silent_driver, initialize_silent_whatsapp)
+    return lambda number: check_registration_silent(number, driver), driver.quit
+
+
+def setup_direct_registration_checker():
+    from direct_registration_checker import check_whatsapp_registration
+    driver = _plain_driver()
+    return lambda number: check_whatsapp_registration(number, driver), driver.quit
+
+
+def setup_fast_checker():
+    sys.path.insert(0, DJANGO_DIR)
+    from fast_checker import check_whatsapp_registration_fast
+
+    def close():
+        if check_whatsapp_registration_fast.driver is not None:
+            check_whatsapp_registration_fast.driver.quit()
+    return check_whatsapp_registration_fast, close
+
+
+def setup_super_fast_checker():
+    sys.path.insert(0, DJANGO_DIR)
+    from super_fast_checker import check_whatsapp_super_fast
+    return check_whatsapp_super_fast, None
+
+
+def setup_checker_fast_checker():
+    from checker.fast_checker import check_whatsapp_number
+    driver = _plain_driver()
+    return lambda number: check_whatsapp_number(number, driver), driver.quit
+
+
+def setup_checker_whatsapp_checker():
+    from checker.whatsapp_checker import check_whatsapp_number
+    driver = _plain_driver()
+    return lambda number: check_whatsapp_number(number, driver), driver.quit
+
+
+def setup_selenium_checker():
+    from whatsapp.selenium_checker import check_whatsapp_number, create_persistent_driver, initialize_whatsapp_session
+    driver = _logged_in_driver(create_persistent_driver, initialize_whatsapp_session)
+    return lambda number: check_whatsapp_number(number, driver), driver.quit
+
+
+def setup_views():
+    _django()
+    from checker.views import check_whatsapp_registration_compose_url, create_compose_driver
+    from whatsapp.browser_pool import get_pool
+
+    # The views borrow a browser from the process-wide pool
+    return check_whatsapp_registration_compose_url, lambda: get_pool(create_compose_driver).close()
+
+
+def setup_app_dialog():
+    import app
+    driver = _plain_driver()
+    return lambda number: app.check_whatsapp_registration_integrated(number, driver), driver.quit
+
+
+STRATEGIES = {
+    'silent_checker': setup_silent_checker,
+    'stable_checker': setup_stable_checker,
+    'no_dialog_checker': setup_no_dialog_checker,
+    'registration_no_dialogs': setup_registration_no_dialogs,
+    'silent_registration_checker': setup_silent_registration_checker,
+    'direct_registration_checker': setup_direct_registration_checker,
+    'fast_checker': setup_fast_checker,
+    'super_fast_checker': setup_super_fast_checker,
+    'checker.fast_checker': setup_checker_fast_checker,
+    'checker.whatsapp_checker': setup_checker_whatsapp_checker,
+    'selenium_checker': setup_selenium_checker,
+    'views': setup_views,
+    'app-dialog': setup_app_dialog,
+}
+
+
+# Checkers whose False also stands for "something went wrong"
+LEGACY_FALSE = {'checker.whatsapp_checker'}
+
+LABELLED_VERDICTS = ('registered', 'not_registered')
+
+
+def verdict(result, legacy_false=False):
+    """True/False as the labels name them; everything else is an error"""
+    if result is True:
+        return 'registered'
+    if result is False:
+        return 'unverified' if legacy_false else 'not_registered'
+    return 'error'
+
+
+def percentile(values, p):
+    """Nearest-rank percentile, None for no values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+class RssSampler:
+    """Samples the memory of this process' children (the browsers) in the background"""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+
+    def _run(self):
+        from whatsapp.driver_factory import children_rss
+
+        while not self._stop.is_set():
+            rss = children_rss(os.getpid())
+            if rss is not None:
+                self.samples.append(rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_one(name, corpus, repeat):
+    """Worker side: set the strategy up and check the corpus, return raw samples"""
+    from whatsapp.stub_server import load_outcomes
+
+    labels = load_outcomes(corpus)
+    report = {'strategy': name, 'available': False, 'error': None, 'setup_seconds': None,
+              'samples': [], 'rss': [], 'wall_seconds': None}
+
+    with RssSampler() as sampler:
+        started = time.time()
+        try:
+            check, close = STRATEGIES[name]()
+        except BaseException as e:
+            # SyntaxError and friends from broken modules count as unavailable too
+            report['error'] = f'{type(e).__name__}: {e}'.splitlines()[0]
+            return report
+        report['available'] = True
+        report['setup_seconds'] = round(time.time() - started, 3)
+
+        started = time.time()
+        try:
+            for _ in range(repeat):
+                for number, label in labels.items():
+                    check_started = time.time()
+                    try:
+                        result = check('+' + number)
+                    except Exception as e:
+                        result = {'error': str(e)}
+                    report['samples'].append({
+                        'number': number,
+                        'label': label,
+                        'verdict': verdict(result, name in LEGACY_FALSE),
+                        'seconds': round(time.time() - check_started, 3),
+                    })
+        finally:
+            report['wall_seconds'] = round(time.time() - started, 3)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    print(f"[WARNING] Closing {name} failed: {e}")
+    report['rss'] = sampler.samples
+    return report
+
+
+def summarize(report):
+    """Worker samples -> the metrics written to the results file"""
+    samples = report.pop('samples')
+    rss = report.pop('rss')
+    seconds = [s['seconds'] for s in samples]
+    # Accuracy is measured on the numbers that have an answer to get right;
+    # errors and unverified results are misses there, never hits
+    labelled = [s for s in samples if s['label'] in LABELLED_VERDICTS]
+    correct = sum(1 for s in labelled if s['verdict'] == s['label'])
+    answered = [s for s in labelled if s['verdict'] in LABELLED_VERDICTS]
+    errors = sum(1 for s in samples if s['verdict'] == 'error')
+    confusion = {}
+    for s in samples:
+        key = f"{s['label']}->{s['verdict']}"
+        confusion[key] = confusion.get(key, 0) + 1
+
+    report.update({
+        'checks': len(samples),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else None,
+        'unverified': sum(1 for s in samples if s['verdict'] == 'unverified'),
+        # Right answers among all labelled checks, and among those that got a verdict
+        'accuracy': round(correct / len(labelled), 4) if labelled else None,
+        'verdict_accuracy': round(correct / len(answered), 4) if answered else None,
+        # Verdicts for numbers the service never answered
+        'invented': sum(1 for s in samples if s['label'] == 'no_answer' and s['verdict'] in LABELLED_VERDICTS),
+        'confusion': confusion,
+        'latency': {
+            'p50': percentile(seconds, 50),
+            'p95': percentile(seconds, 95),
+            'p99': percentile(seconds, 99),
+            'mean': round(statistics.mean(seconds), 3) if seconds else None,
+            'max': max(seconds) if seconds else None,
+        },
+        'throughput_per_minute': round(len(samples) / report['wall_seconds'] * 60, 2)
+        if samples and report['wall_seconds'] else None,
+        'rss_mb': {
+            'peak': round(max(rss) / 1024 / 1024, 1) if rss else None,
+            'mean': round(statistics.mean(rss) / 1024 / 1024, 1) if rss else None,
+        },
+        'wrong': [s['number'] for s in samples
+                  if s['verdict'] in LABELLED_VERDICTS and s['verdict'] != s['label']][:20],
+    })
+    return report
+
+
+def spawn(name, args, env):
+    """Run one strategy in a fresh interpreter and return its summarized report"""
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+        part = f.name
+    command = [sys.executable, os.path.abspath(__file__), '--run-one', name,
+               '--corpus', args.corpus, '--repeat', str(args.repeat), '--part', part]
+    print(f"[INFO] Running {name}")
+    try:
+        completed = subprocess.run(command, cwd=ROOT, env=env, timeout=args.timeout,
+                                   stdout=None if args.verbose else subprocess.DEVNULL,
+                                   stderr=None if args.verbose else subprocess.DEVNULL)
+    except subprocess.TimeoutExpired:
+        return {'strategy': name, 'available': False, 'error': f'timed out after {args.timeout}s'}
+    try:
+        with open(part, encoding='utf-8') as f:
+            report = json.load(f)
+    except ValueError:
+        return {'strategy': name, 'available': False,
+                'error': f'worker exited with {completed.returncode} without a report'}
+    finally:
+        if os.path.exists(part):
+            os.remove(part)
+    return summarize(report)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _fmt(value, unit='s'):
+    return f'{value:.2f}{unit}' if value is not None else 'n/a'
+
+
+def print_table(results):
+    print('\n=== Checker benchmark ===')
+    print(f"{'strategy':<30}{'checks':>7}{'acc':>7}{'err':>7}{'p50':>8}{'p95':>8}{'p99':>8}{'/min':>8}{'RSS peak':>10}")
+    for r in results:
+        if not r['available']:
+            print(f"{r['strategy']:<30} unavailable: {r['error']}")
+            continue
+        latency = r['latency']
+        accuracy = f"{r['accuracy'] * 100:.0f}%" if r['accuracy'] is not None else 'n/a'
+        error_rate = f"{r['error_rate'] * 100:.0f}%" if r['error_rate'] is not None else 'n/a'
+        print(f"{r['strategy']:<30}{r['checks']:>7}{accuracy:>7}{error_rate:>7}{_fmt(latency['p50']):>8}"
+              f"{_fmt(latency['p95']):>8}{_fmt(latency['p99']):>8}"
+              f"{r['throughput_per_minute'] or 0:>8.1f}{_fmt(r['rss_mb']['peak'], ' MB'):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the checker strategies on a labeled corpus')
+    parser.add_argument('--corpus', required=True, help='CSV or JSON: number -> registered / not_registered / no_answer')
+    parser.add_argument('--strategies', nargs='+', default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument('--repeat', type=int, default=1, help='Times the corpus is checked per strategy')
+    parser.add_argument('--stub', action='store_true', help='Serve the corpus from a local whatsapp.stub_server')
+    parser.add_argument('--boot-latency', default='fixed:0.5', help='Stub app boot time, see whatsapp.stub_server.Latency')
+    parser.add_argument('--lookup-latency', default='lognormal:-1.2,0.4', help='Stub lookup time per number')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=1800, help='Seconds one strategy may take')
+    parser.add_argument('--output', default=None, help='Results file, defaults to benchmark_<timestamp>.json')
+    parser.add_argument('--verbose', action='store_true', help='Show the checkers\' own output')
+    parser.add_argument('--run-one', help=argparse.SUPPRESS)
+    parser.add_argument('--part', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        report = run_one(args.run_one, args.corpus, args.repeat)
+        with open(args.part, 'w', encoding='utf-8') as f:
+            json.dump(report, f)
+        # Browsers are closed by now; leftover pool threads must not keep the worker alive
+        os._exit(0)
+
+    from whatsapp import config
+    from whatsapp.stub_server import OutcomeTable, StubServer, load_outcomes
+
+    labels = load_outcomes(args.corpus)
+    env = dict(os.environ)
+    stub = None
+    if args.stub:
+        stub = StubServer(OutcomeTable(labels), args.boot_latency, args.lookup_latency, seed=args.seed)
+        env['WHATSAPP_BASE_URL'] = stub.start()
+        print(f"[INFO] Stub WhatsApp Web on {stub.url}")
+    base_url = env.get('WHATSAPP_BASE_URL', config.BASE_URL)
+
+    started = datetime.now()
+    try:
+        results = [spawn(name, args, env) for name in args.strategies]
+    finally:
+        stub_stats = stub.stats() if stub else None
+        if stub:
+            stub.stop()
+
+    print_table(results)
+    output = {
+        'started_at': started.isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'base_url': base_url,
+        'corpus': {'path': args.corpus, 'numbers': len(labels), 'repeat': args.repeat},
+        'stub': {'boot_latency': args.boot_latency, 'lookup_latency': args.lookup_latency,
+                 'seed': args.seed, 'stats': stub_stats} if args.stub else None,
+        'settings': {'driver_profile': config.DRIVER_PROFILE, 'detector': config.DETECTOR,
+                     'navigation_mode': config.NAVIGATION_MODE, 'block_resources': config.BLOCK_RESOURCES},
+        'results': results,
+    }
+    path = args.output or f"benchmark_{started.strftime('%Y%m%d_%H%M%S')}.json"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2)
+    print(f"[INFO] Results written to {path}")
+
+
+if __name__ == '__main__':
+    main()
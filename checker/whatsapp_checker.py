@@ -1,6 +1,7 @@
 import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
+from whatsapp import config
 
 # Core logic for WhatsApp number checking using Selenium
 
@@ -23,7 +24,7 @@ def check_whatsapp_number(number, driver=None):
         options = Options()
         options.add_argument('--disable-notifications')
         driver = webdriver.Chrome(options=options)
-        driver.get('https://web.whatsapp.com')
+        driver.get(config.BASE_URL)
         input("Scan QR code in the browser and press Enter to continue...")
         close_driver = True
 
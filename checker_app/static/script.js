@@ -64,7 +64,14 @@ class WhatsAppChecker {
             console.log('Session status:', data);
             
             if (data.initialized) {
-                this.updateSessionStatus('connected', 'Session Ready', 'fas fa-check-circle');
+                // The server launches its browser in the background at boot;
+                // checks work meanwhile, the first one is just slower
+                if (data.warmup && data.warmup.state === 'warming') {
+                    this.updateSessionStatus('connected', 'Session Ready (browser warming up)', 'fas fa-spinner fa-spin');
+                    setTimeout(() => this.checkSessionStatus(), 3000);
+                } else {
+                    this.updateSessionStatus('connected', 'Session Ready', 'fas fa-check-circle');
+                }
                 this.sessionInitialized = true;
                 if (this.elements.sessionInfo) {
                     this.elements.sessionInfo.style.display = 'flex';
@@ -202,38 +209,54 @@ class WhatsAppChecker {
                 return;
             }
 
-            this.monitorBatchProgress();
+            this.monitorBatchProgress(data.job_id);
         } catch (error) {
             console.error('Batch check error:', error);
             this.showNotification('Failed to start batch check', 'error');
         }
     }
 
-    async monitorBatchProgress() {
-        const checkStatus = async () => {
-            try {
-                const response = await fetch('/api/status');
-                const status = await response.json();
-                
-                this.updateBatchProgress(status.progress, status.total);
-                
-                if (!status.running) {
-                    this.displayBatchResults(status.results);
-                    if (this.elements.checkBatch) {
-                        this.elements.checkBatch.disabled = false;
-                        this.elements.checkBatch.innerHTML = '<i class=\"fas fa-play\"></i> Start Batch Check';
-                    }
-                    return;
-                }
-                
-                setTimeout(checkStatus, 1000);
-            } catch (error) {
-                console.error('Error monitoring progress:', error);
-                setTimeout(checkStatus, 2000);
+    monitorBatchProgress(jobId) {
+        // The server pushes each result as soon as it is checked; EventSource
+        // reconnects on its own and resumes after the last result it received
+        const results = [];
+        const source = new EventSource('/api/jobs/' + jobId + '/events');
+        
+        const finish = () => {
+            source.close();
+            if (this.elements.checkBatch) {
+                this.elements.checkBatch.disabled = false;
+                this.elements.checkBatch.innerHTML = '<i class=\"fas fa-play\"></i> Start Batch Check';
             }
         };
         
-        checkStatus();
+        source.addEventListener('result', event => {
+            const result = JSON.parse(event.data);
+            results.push(result);
+            if (this.elements.batchResults) {
+                this.elements.batchResults.insertAdjacentHTML('beforeend', this.renderBatchResult(result));
+            }
+        });
+        
+        source.addEventListener('progress', event => {
+            const status = JSON.parse(event.data);
+            this.updateBatchProgress(status.progress, status.total);
+        });
+        
+        source.addEventListener('done', event => {
+            const status = JSON.parse(event.data);
+            this.updateBatchProgress(status.progress, status.total);
+            this.displayBatchResults(results);
+            finish();
+        });
+        
+        source.addEventListener('error', event => {
+            if (event.data) {
+                console.error('Error monitoring progress:', JSON.parse(event.data).error);
+                this.showNotification('Lost track of the batch job', 'error');
+                finish();
+            }
+        });
     }
 
     updateBatchProgress(progress, total) {
@@ -269,19 +292,7 @@ class WhatsAppChecker {
             return;
         }
 
-        const html = results.map(result => {
-            const type = result.error ? 'error' : result.registered ? 'success' : 'info';
-            const icon = type === 'success' ? 'fas fa-check' : type === 'error' ? 'fas fa-times' : 'fas fa-info';
-            const message = result.error || result.message || 'Unknown status';
-            
-            return '<div class=\"result-item ' + type + '\">' +
-                      '<div class=\"result-number\">' + result.number + '</div>' +
-                      '<div class=\"result-status\">' +
-                          '<i class=\"' + icon + '\"></i>' +
-                          message +
-                      '</div>' +
-                   '</div>';
-        }).join('');
+        const html = results.map(result => this.renderBatchResult(result)).join('');
 
         if (this.elements.batchResults) {
             this.elements.batchResults.innerHTML = html;
@@ -297,6 +308,20 @@ class WhatsAppChecker {
         this.showNotification('Completed: ' + registered + ' registered, ' + (results.length - registered - errors) + ' not registered, ' + errors + ' errors', 'info');
     }
 
+    renderBatchResult(result) {
+        const type = result.error ? 'error' : result.registered ? 'success' : 'info';
+        const icon = type === 'success' ? 'fas fa-check' : type === 'error' ? 'fas fa-times' : 'fas fa-info';
+        const message = result.error || result.message || 'Unknown status';
+        
+        return '<div class=\"result-item ' + type + '\">' +
+                  '<div class=\"result-number\">' + result.number + '</div>' +
+                  '<div class=\"result-status\">' +
+                      '<i class=\"' + icon + '\"></i>' +
+                      message +
+                  '</div>' +
+               '</div>';
+    }
+
     updateSessionStatus(status, text, icon) {
         if (this.elements.sessionStatus) {
             this.elements.sessionStatus.className = 'session-status ' + status;
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Measure what pinning the chromedriver binary saves per browser launch.
+
+Usage:
+    python compare_driver_launch.py --runs 5
+
+Launches a headless browser ``--runs`` times the default Selenium way
+(``webdriver.Chrome(options=...)``, which runs Selenium Manager on every
+launch) and then with the Service pinned by whatsapp.driver_factory, and
+prints the launch times side by side. Each launch uses a throwaway
+user-data-dir so the numbers do not depend on the WhatsApp profile.
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+
+from selenium import webdriver
+
+from whatsapp.driver_factory import build_options, chrome_service, resolve_binaries
+
+
+def launch(pinned):
+    """Start and quit one browser, return seconds until webdriver.Chrome returned"""
+    user_data_dir = tempfile.mkdtemp(prefix='launch_bench_')
+    try:
+        options = build_options('headless-fast', user_data_dir=user_data_dir)
+        started = time.time()
+        if pinned:
+            driver = webdriver.Chrome(service=chrome_service(), options=options)
+        else:
+            driver = webdriver.Chrome(options=options)
+        elapsed = time.time() - started
+        driver.quit()
+        return elapsed
+    finally:
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare browser launch with and without a pinned chromedriver')
+    parser.add_argument('--runs', type=int, default=5, help='Launches per mode')
+    args = parser.parse_args()
+
+    started = time.time()
+    paths = resolve_binaries(refresh=True)
+    print(f"[INFO] One Selenium Manager resolution: {time.time() - started:.2f}s -> {paths['driver_path']}")
+
+    results = {}
+    for label, pinned in (('selenium-manager', False), ('pinned', True)):
+        results[label] = [launch(pinned) for _ in range(args.runs)]
+        print(f"[{label}] " + ', '.join(f'{t:.2f}s' for t in results[label]))
+
+    print('\n=== Browser launch ===')
+    print(f"{'mode':<18}{'runs':>6}{'p50':>9}{'min':>9}{'max':>9}")
+    for label, times in results.items():
+        print(f"{label:<18}{len(times):>6}{statistics.median(times):>8.2f}s{min(times):>8.2f}s{max(times):>8.2f}s")
+    saved = statistics.median(results['selenium-manager']) - statistics.median(results['pinned'])
+    print(f"[INFO] Pinning saves {saved:.2f}s per launch")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Compare startup time and memory of the Chrome launch profiles.
+
+Usage:
+    python compare_driver_profiles.py
+    python compare_driver_profiles.py --profiles headless-fast low-memory --runs 3 --no-load
+
+Starts every profile of whatsapp.driver_factory ``--runs`` times, opens
+WhatsApp Web (unless --no-load) and prints launch time, page load time
+and resident memory of chromedriver plus all Chrome processes.
+"""
+import argparse
+import statistics
+
+from whatsapp.browser_pool import WHATSAPP_URL
+from whatsapp.driver_factory import PROFILES, measure_profile
+
+
+def _mb(value):
+    return f'{value / 1024 / 1024:.0f} MB' if value is not None else 'n/a'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare Chrome launch profiles')
+    parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument('--runs', type=int, default=1, help='Launches per profile')
+    parser.add_argument('--no-load', action='store_true', help='Measure an empty browser, do not open WhatsApp Web')
+    args = parser.parse_args()
+
+    results = [
+        measure_profile(profile, url=None if args.no_load else WHATSAPP_URL, runs=args.runs)
+        for profile in args.profiles
+    ]
+
+    print('\n=== Chrome launch profiles ===')
+    print(f"{'profile':<15}{'runs':>6}{'startup p50':>13}{'load p50':>10}{'RSS p50':>10}{'RSS max':>10}")
+    for result in results:
+        rss = [value for value in result['rss'] if value is not None]
+        print(f"{result['profile']:<15}{len(result['startup']):>6}"
+              f"{statistics.median(result['startup']):>12.2f}s"
+              f"{statistics.median(result['load']) if result['load'] else 0:>9.2f}s"
+              f"{_mb(statistics.median(rss) if rss else None):>10}"
+              f"{_mb(max(rss) if rss else None):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Compare time-to-verdict of the compose-URL check under each page load strategy.
+
+Usage:
+    python compare_page_load.py +919876543210 +15550000000 ...
+    python compare_page_load.py --file numbers.txt --strategies normal eager none --rounds 3
+
+Runs the same numbers through one browser per strategy (one after the
+other, they share the logged-in profile) and prints how long driver.get
+blocked and how long it took to reach a verdict.
+"""
+import argparse
+import statistics
+import time
+
+from selenium import webdriver
+
+from whatsapp import config
+from whatsapp.browser_pool import CHAT_LIST_SELECTOR, WHATSAPP_URL
+from whatsapp.driver_factory import build_options, chrome_service
+from whatsapp.readiness import PAGE_LOAD_STRATEGIES, navigate, set_page_load_strategy, wait_for_outcome
+from whatsapp.utils import read_numbers_from_file
+
+
+def create_driver(strategy):
+    """Chrome on the logged-in profile with the given page load strategy"""
+    options = set_page_load_strategy(build_options(), strategy)
+    return webdriver.Chrome(service=chrome_service(), options=options)
+
+
+def run_strategy(strategy, numbers, rounds):
+    """Check every number ``rounds`` times, return one sample per check"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    driver = create_driver(strategy)
+    samples = []
+    try:
+        # Warm up once so the first sample does not pay for the login restore
+        driver.get(WHATSAPP_URL)
+        WebDriverWait(driver, config.POOL_LOGIN_TIMEOUT).until(
+            lambda d: d.find_elements(By.CSS_SELECTOR, CHAT_LIST_SELECTOR)
+        )
+
+        for _ in range(rounds):
+            for number in numbers:
+                clean_number = number.lstrip('+')
+                started = time.time()
+                navigate(driver, f'{config.BASE_URL}/send?phone={clean_number}')
+                navigated = time.time()
+                outcome = wait_for_outcome(driver, timeout=config.DETECT_TIMEOUT)
+                finished = time.time()
+
+                samples.append({
+                    'number': number,
+                    'get': navigated - started,
+                    'verdict': finished - started,
+                    'signal': outcome['signal'],
+                })
+                print(f"[{strategy}] {number}: {outcome['signal']} in {finished - started:.2f}s "
+                      f"(driver.get {navigated - started:.2f}s)")
+    finally:
+        driver.quit()
+    return samples
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare page load strategies for compose-URL checks')
+    parser.add_argument('numbers', nargs='*', help='Numbers to check')
+    parser.add_argument('--file', help='Text file with one number per line')
+    parser.add_argument('--strategies', nargs='+', default=list(PAGE_LOAD_STRATEGIES),
+                        choices=PAGE_LOAD_STRATEGIES)
+    parser.add_argument('--rounds', type=int, default=1, help='Times every number is checked')
+    args = parser.parse_args()
+
+    numbers = list(args.numbers)
+    if args.file:
+        numbers.extend(read_numbers_from_file(args.file))
+    if not numbers:
+        parser.error('give some numbers or --file')
+
+    results = {strategy: run_strategy(strategy, numbers, args.rounds) for strategy in args.strategies}
+
+    print('\n=== Time to verdict by page load strategy ===')
+    print(f"{'strategy':<10}{'checks':>8}{'get p50':>10}{'p50':>9}{'p95':>9}{'max':>9}{'timeouts':>10}")
+    for strategy, samples in results.items():
+        verdicts = [s['verdict'] for s in samples]
+        print(f"{strategy:<10}{len(samples):>8}"
+              f"{statistics.median(s['get'] for s in samples):>9.2f}s"
+              f"{statistics.median(verdicts):>8.2f}s"
+              f"{percentile(verdicts, 95):>8.2f}s"
+              f"{max(verdicts):>8.2f}s"
+              f"{sum(1 for s in samples if s['signal'] == 'timeout'):>10}")
+
+    # Faster is only useful if the verdicts stay the same
+    baseline = args.strategies[0]
+    for strategy in args.strategies[1:]:
+        differing = [
+            a['number'] for a, b in zip(results[baseline], results[strategy])
+            if a['signal'] != b['signal']
+        ]
+        if differing:
+            print(f"[WARNING] {strategy} disagrees with {baseline} on: {', '.join(differing)}")
+        else:
+            print(f"[INFO] {strategy} gives the same verdicts as {baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Measure what CDP resource blocking saves per compose-URL check.
+
+Usage:
+    python compare_resource_blocking.py +919876543210 +15550000000 ...
+    python compare_resource_blocking.py --file numbers.txt --rounds 3
+
+Runs the same numbers through a browser without and then with
+whatsapp.resource_blocking and prints the bytes every check transferred,
+the time to verdict and the difference between the two.
+"""
+import argparse
+import statistics
+import time
+
+from selenium import webdriver
+
+from whatsapp import config
+from whatsapp.browser_pool import CHAT_LIST_SELECTOR, WHATSAPP_URL
+from whatsapp.driver_factory import build_options, chrome_service
+from whatsapp.readiness import navigate, wait_for_outcome
+from whatsapp.resource_blocking import block_resources, page_traffic
+from whatsapp.spa import compose_url
+from whatsapp.utils import read_numbers_from_file
+
+
+def create_driver(blocking):
+    """Chrome on the logged-in profile, with or without resource blocking"""
+    driver = webdriver.Chrome(service=chrome_service(), options=build_options())
+    if blocking:
+        block_resources(driver)
+    else:
+        # Same cache behaviour on both sides: every check downloads what it needs
+        driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
+    return driver
+
+
+def run(blocking, numbers, rounds):
+    """Check every number ``rounds`` times, return one sample per check"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    label = 'blocked' if blocking else 'full'
+    driver = create_driver(blocking)
+    samples = []
+    try:
+        driver.get(WHATSAPP_URL)
+        WebDriverWait(driver, config.POOL_LOGIN_TIMEOUT).until(
+            lambda d: d.find_elements(By.CSS_SELECTOR, CHAT_LIST_SELECTOR)
+        )
+
+        for _ in range(rounds):
+            for number in numbers:
+                started = time.time()
+                navigate(driver, compose_url(number))
+                outcome = wait_for_outcome(driver, timeout=config.DETECT_TIMEOUT)
+                verdict = time.time() - started
+                # Let the page settle so late images are counted too
+                time.sleep(1)
+                traffic = page_traffic(driver) or {'requests': 0, 'bytes': 0}
+
+                samples.append({
+                    'number': number,
+                    'verdict': verdict,
+                    'bytes': traffic['bytes'],
+                    'requests': traffic['requests'],
+                    'signal': outcome['signal'],
+                })
+                print(f"[{label}] {number}: {outcome['signal']} in {verdict:.2f}s, "
+                      f"{traffic['bytes'] / 1024:.0f} KB in {traffic['requests']} requests")
+    finally:
+        driver.quit()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure bytes and time saved by CDP resource blocking')
+    parser.add_argument('numbers', nargs='*', help='Numbers to check')
+    parser.add_argument('--file', help='Text file with one number per line')
+    parser.add_argument('--rounds', type=int, default=1, help='Times every number is checked')
+    args = parser.parse_args()
+
+    numbers = list(args.numbers)
+    if args.file:
+        numbers.extend(read_numbers_from_file(args.file))
+    if not numbers:
+        parser.error('give some numbers or --file')
+
+    full = run(False, numbers, args.rounds)
+    blocked = run(True, numbers, args.rounds)
+
+    print('\n=== Per check ===')
+    print(f"{'mode':<10}{'checks':>8}{'KB p50':>10}{'requests':>10}{'verdict p50':>13}")
+    for label, samples in (('full', full), ('blocked', blocked)):
+        print(f"{label:<10}{len(samples):>8}"
+              f"{statistics.median(s['bytes'] for s in samples) / 1024:>10.0f}"
+              f"{statistics.median(s['requests'] for s in samples):>10.0f}"
+              f"{statistics.median(s['verdict'] for s in samples):>12.2f}s")
+
+    saved = statistics.mean(s['bytes'] for s in full) - statistics.mean(s['bytes'] for s in blocked)
+    faster = statistics.median(s['verdict'] for s in full) - statistics.median(s['verdict'] for s in blocked)
+    print(f"[INFO] Saved {saved / 1024:.0f} KB and {faster:.2f}s per check")
+
+    differing = [a['number'] for a, b in zip(full, blocked) if a['signal'] != b['signal']]
+    if differing:
+        print(f"[WARNING] Blocking changed the verdict for: {', '.join(differing)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
+from whatsapp import config
 from whatsapp.selenium_checker import create_persistent_driver, initialize_whatsapp_session
-from selenium.webdriver.common.by import By
-import time
+from whatsapp.readiness import navigate, wait_for_outcome
 
 def check_whatsapp_registration(phone_number, driver):
     """Check if number is registered on WhatsApp without sending messages"""
@@ -10,75 +10,27 @@ def check_whatsapp_registration(phone_number, driver):
         print(f" Checking registration: {phone_number}")
         
         # Navigate to WhatsApp send URL
-        chat_url = f"https://web.whatsapp.com/send?phone={clean_number}"
+        chat_url = f"{config.BASE_URL}/send?phone={clean_number}"
         print(f" Accessing: {chat_url}")
-        driver.get(chat_url)
+        navigate(driver, chat_url)
         
-        # Wait for page to fully load
-        time.sleep(8)
+        # Wait for the chat or the error, whichever comes first (8s deadline)
+        outcome = wait_for_outcome(driver, timeout=8)
+        if outcome["signal"] == "registered":
+            print(f" REGISTERED - Found: {outcome['selector']}")
+            return True
+        if outcome["signal"] == "not_registered":
+            print(f" NOT REGISTERED - Error: {outcome['selector']}")
+            return False
         
-        # Get current URL and page source
-        current_url = driver.current_url
-        page_source = driver.page_source.lower()
-        
-        print(f" Current URL: {current_url[:50]}...")
-        
-        # Method 1: Check for chat interface elements
-        try:
-            # Look for message input elements
-            selectors = [
-                "[role=textbox]",
-                "[data-testid=compose-box-input]", 
-                "._13NKt",
-                "[contenteditable=true]"
-            ]
-            
-            for selector in selectors:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements and any(elem.is_displayed() for elem in elements):
-                    print(f" REGISTERED - Found chat input: {selector}")
-                    return True
-        except Exception as e:
-            print(f"  Error checking elements: {e}")
-        
-        # Method 2: Check for error messages
-        error_phrases = [
-            "phone number shared via url is invalid",
-            "número de teléfono compartido",
-            "invalid phone number",
-            "not registered"
-        ]
-        
-        for phrase in error_phrases:
-            if phrase in page_source:
-                print(f" NOT REGISTERED - Found error: {phrase}")
-                return False
-        
-        # Method 3: Check URL behavior
-        if "send?phone=" in current_url:
-            # Still on send page - check if we should be redirected
-            time.sleep(3)
-            final_url = driver.current_url
-            if "send?phone=" in final_url and "chat" not in final_url:
-                print(" NOT REGISTERED - No redirect to chat")
-                return False
-        
-        # Method 4: Look for conversation header
-        try:
-            conv_headers = driver.find_elements(By.CSS_SELECTOR, "[data-testid=conversation-header], [data-testid=chat-header]")
-            if conv_headers:
-                print(" REGISTERED - Found conversation header")
-                return True
-        except:
-            pass
-        
-        # Default assumption if we reach here
-        print(" REGISTERED - Chat interface accessible")
-        return True
+        # No signal is no verdict: the compose URL stays in the address bar
+        # whatever the outcome, and contenteditable elements exist on every page
+        print(f" No registration signal ({outcome['signal']})")
+        return {"error": f"No registration signal within 8s ({outcome['signal']})"}
         
     except Exception as e:
         print(f" Error during check: {e}")
-        return False
+        return {"error": f"Registration check failed: {e}"}
 
 def test_registration():
     """Test the registration checker"""
@@ -111,7 +63,10 @@ def test_registration():
         print(" FINAL RESULT:")
         print("=" * 20)
         print(f" Number: {test_number}")
-        print(f" Status: {\" REGISTERED\" if result else \" NOT REGISTERED\"}")
+        if isinstance(result, dict):
+            print(f" Status:  ERROR ({result['error']})")
+            return
+        print(f" Status: {' REGISTERED' if result else ' NOT REGISTERED'}")
         
         if result:
             print(" This number has a WhatsApp account!")
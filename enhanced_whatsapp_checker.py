@@ -5,6 +5,9 @@ No QR scanning needed after first setup!
 """
 
 from whatsapp_session_manager import WhatsAppSessionManager
+from whatsapp import config
+from whatsapp.readiness import phrases, probe
+from whatsapp.tab_scheduler import TabScheduler
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -40,7 +43,7 @@ class WhatsAppChecker:
         """Initialize WhatsApp Web"""
         try:
             print("[DEBUG] Opening WhatsApp Web...")
-            self.driver.get("https://web.whatsapp.com")
+            self.driver.get(config.BASE_URL)
             
             wait = WebDriverWait(self.driver, 45)
             
@@ -131,12 +134,10 @@ class WhatsAppChecker:
                 "This contact does not have WhatsApp"
             ]
             
-            page_source = self.driver.page_source.lower()
-            
-            for error_msg in error_messages:
-                if error_msg.lower() in page_source:
-                    print(f"[DEBUG] NOT REGISTERED - Error: {error_msg}")
-                    return False
+            hit = probe(self.driver, {'not_registered': phrases(*error_messages)})
+            if hit:
+                print(f"[DEBUG] NOT REGISTERED - Error: {hit['selector']}")
+                return False
             
             # Check next button status
             try:
@@ -197,6 +198,28 @@ class WhatsAppChecker:
         
         return results
     
+    def check_numbers_in_tabs(self, numbers, tabs=None):
+        """Check multiple phone numbers through compose URLs in several tabs at once"""
+        results = {}
+        
+        if not self.is_logged_in:
+            print("[ERROR] Session not started")
+            return results
+        
+        # While one tab is polled for its verdict the next numbers load in the others
+        with TabScheduler(self.driver, tabs=tabs) as scheduler:
+            for number, outcome in scheduler.run(numbers):
+                if outcome["signal"] in ("registered", "not_registered"):
+                    results[number] = outcome["signal"] == "registered"
+                    print(f"[RESULT] {number}: {'REGISTERED' if results[number] else 'NOT REGISTERED'} "
+                          f"in {outcome['elapsed']}s (tab {outcome['tab']})")
+                else:
+                    # A timeout or a login screen is no answer, not "not registered"
+                    print(f"[ERROR] No verdict for {number}: {outcome['signal']}")
+                    results[number] = {"error": f"No verdict: {outcome['signal']}"}
+        
+        return results
+    
     def close_session(self):
         """Close WhatsApp session"""
         try:
@@ -221,14 +244,16 @@ def check_single_number(phone_number, session_name="default"):
     finally:
         checker.close_session()
 
-def check_multiple_numbers(phone_numbers, session_name="default"):
-    """Quick function to check multiple numbers"""
+def check_multiple_numbers(phone_numbers, session_name="default", tabs=1):
+    """Quick function to check multiple numbers, in several tabs when tabs > 1"""
     checker = WhatsAppChecker(session_name)
     
     if not checker.start_session():
         return {}
     
     try:
+        if tabs > 1:
+            return checker.check_numbers_in_tabs(phone_numbers, tabs=tabs)
         results = checker.check_multiple_numbers(phone_numbers)
         return results
     finally:
@@ -1,11 +1,9 @@
 ﻿from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
 import re
 import os
+from whatsapp import config
+from whatsapp.readiness import wait_for_outcome
 
 def check_whatsapp_registration_compose_url(number):
     """
@@ -40,77 +38,37 @@ def check_whatsapp_registration_compose_url(number):
         driver.maximize_window()
         
         # Go to WhatsApp Web compose URL
-        compose_url = f"https://web.whatsapp.com/send?phone={clean_number}"
+        compose_url = f"{config.BASE_URL}/send?phone={clean_number}"
         print(f" Opening compose URL: {compose_url}")
         
         driver.get(compose_url)
-        time.sleep(3)
-        
-        # Wait for page to load completely
-        wait = WebDriverWait(driver, 15)
         
         print(" Waiting for WhatsApp Web to load...")
         
-        # Check for various indicators
+        # Race the "not on WhatsApp" alert and the chat interface under one
+        # deadline. The compose URL stays in the address bar whatever the
+        # outcome, so no signal is no verdict
         try:
-            # Method 1: Look for error message about number not on WhatsApp
-            error_selectors = [
-                '[data-testid="alert-phone-number-not-on-whatsapp"]',
-                '[data-testid="invalid-phone-number"]',
-                'div[data-animate-alert-toast="true"]',
-                'div[role="alert"]'
-            ]
-            
-            for selector in error_selectors:
-                try:
-                    error_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    error_text = error_element.text.lower()
-                    print(f" Error found: {error_text}")
-                    
-                    if any(phrase in error_text for phrase in ['not on whatsapp', 'invalid', 'not found']):
-                        print(" Number NOT registered on WhatsApp")
-                        return False
-                        
-                except Exception:
-                    continue
-            
-            # Method 2: Check if we reach the chat interface
-            chat_selectors = [
-                '[data-testid="conversation-compose-box-input"]',
-                'div[contenteditable="true"][data-tab="10"]',
-                '[data-testid="msg-container"]',
-                'footer[data-testid="compose"]'
-            ]
-            
-            for selector in chat_selectors:
-                try:
-                    chat_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    print(f" Chat interface found: {selector}")
-                    print(" Number IS registered on WhatsApp")
-                    return True
-                except Exception:
-                    continue
-            
-            # Method 3: Check URL for success/failure patterns
-            time.sleep(2)
-            current_url = driver.current_url
-            print(f" Current URL: {current_url}")
-            
-            if "send?phone=" in current_url and clean_number in current_url:
-                # Still on compose URL might mean success
-                print(" Still on compose URL - likely registered")
+            outcome = wait_for_outcome(driver, timeout=15)
+            if outcome["signal"] == "not_registered":
+                print(f" Error found: {outcome['selector']}")
+                print(" Number NOT registered on WhatsApp")
+                return False
+            if outcome["signal"] == "registered":
+                print(f" Chat interface found: {outcome['selector']}")
+                print(" Number IS registered on WhatsApp")
                 return True
             
-            print(" Unable to determine registration status clearly")
-            return False
+            print(f" Unable to determine registration status clearly ({outcome['signal']})")
+            return {"error": f"No registration signal within 15s ({outcome['signal']})"}
             
         except Exception as e:
             print(f" Error during checking: {str(e)}")
-            return False
+            return {"error": f"Error during checking: {str(e)}"}
             
     except Exception as e:
         print(f" WebDriver error: {str(e)}")
-        return False
+        return {"error": f"WebDriver error: {str(e)}"}
         
     finally:
         try:
@@ -124,4 +82,7 @@ if __name__ == "__main__":
     test_number = "+916362945154"
     print(f"Testing number: {test_number}")
     result = check_whatsapp_registration_compose_url(test_number)
-    print(f"Result: {'REGISTERED' if result else 'NOT REGISTERED'}")
+    if isinstance(result, dict):
+        print(f"Result: ERROR ({result['error']})")
+    else:
+        print(f"Result: {'REGISTERED' if result else 'NOT REGISTERED'}")
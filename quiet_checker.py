@@ -1,5 +1,6 @@
+from whatsapp import config
 from whatsapp.selenium_checker import create_persistent_driver, initialize_whatsapp_session, check_whatsapp_number
-import time
+from whatsapp.readiness import wait_for_outcome
 
 def test_quiet_registration():
     print(" Quiet Registration Check")
@@ -34,28 +35,29 @@ def test_quiet_registration():
         print(" Testing Registration via URL...")
         
         clean_number = test_number.replace("+", "").replace("-", "").replace(" ", "")
-        chat_url = f"https://web.whatsapp.com/send?phone={clean_number}"
+        chat_url = f"{config.BASE_URL}/send?phone={clean_number}"
         
         driver.get(chat_url)
-        time.sleep(8)
         
-        current_url = driver.current_url
-        print(f" Current URL: {current_url[:60]}...")
-        
-        # Check if chat is accessible
-        if "chat" in current_url or ("send?phone=" not in current_url and "web.whatsapp.com" in current_url):
+        # The compose URL stays in the address bar whatever the outcome, so
+        # only the chat or the "not on WhatsApp" alert decides (8s deadline)
+        outcome = wait_for_outcome(driver, timeout=8)
+        if outcome["signal"] == "registered":
             print(" REGISTERED - Chat accessible")
             reg_status = True
-        else:
-            print(" NOT REGISTERED - No chat access")
+        elif outcome["signal"] == "not_registered":
+            print(" NOT REGISTERED - Number not on WhatsApp")
             reg_status = False
+        else:
+            print(f" UNKNOWN - No registration signal ({outcome['signal']})")
+            reg_status = None
         
         print()
         print(" SUMMARY:")
         print("=" * 15)
         print(f" Number: {test_number}")
         contact_status = "Yes" if result else "No"
-        register_status = "Yes" if reg_status else "No"
+        register_status = "Unknown" if reg_status is None else ("Yes" if reg_status else "No")
         print(f" In Contacts: {contact_status}")
         print(f" Registered: {register_status}")
         
@@ -1,48 +1,22 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from selenium.webdriver.chrome.options import Options
-import time
+from whatsapp import config
+from whatsapp.driver_factory import create_driver
+from whatsapp.readiness import wait_for_outcome
 import os
 
 def create_no_dialog_persistent_driver():
     """Create persistent driver with dialog suppression"""
     # Use your existing profile directory
-    profile_dir = r"C:\num\chrome_profile"
+    profile_dir = config.CHROME_PROFILE_DIR
     if not os.path.exists(profile_dir):
         os.makedirs(profile_dir)
         print(f"[DEBUG] Created profile directory: {profile_dir}")
     
-    options = Options()
-    options.add_argument(f"--user-data-dir={profile_dir}")
-    options.add_argument("--profile-directory=WhatsApp")
-    options.add_argument("--window-size=1200,800")
-    
-    # Dialog suppression options
-    options.add_argument("--disable-notifications")
-    options.add_argument("--disable-popup-blocking") 
-    options.add_argument("--disable-infobars")
-    options.add_argument("--disable-extensions-file-access-check")
-    options.add_argument("--no-first-run")
-    options.add_argument("--no-default-browser-check")
-    
-    # Standard options from your working version
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-extensions")
-    
-    # Preferences to suppress notifications
-    prefs = {
-        "profile.default_content_setting_values.notifications": 2,
-        "profile.default_content_settings.popups": 0,
-        "profile.managed_default_content_settings.popups": 0
-    }
-    options.add_experimental_option("prefs", prefs)
-    
     try:
-        driver = webdriver.Chrome(options=options)
+        driver = create_driver("interactive", user_data_dir=profile_dir, profile_directory="WhatsApp")
         print("[DEBUG] Chrome driver created successfully with dialog suppression")
         return driver
     except Exception as e:
@@ -53,7 +27,7 @@ def initialize_session_no_dialogs(driver):
     """Initialize WhatsApp session (copied from your working version)"""
     try:
         print("[DEBUG] Loading WhatsApp Web...")
-        driver.get("https://web.whatsapp.com")
+        driver.get(config.BASE_URL)
         
         # Wait for either login or QR code
         wait = WebDriverWait(driver, 30)
@@ -113,61 +87,28 @@ def check_registration_direct(phone_number, driver):
         print(f" Checking registration: {phone_number}")
         
         # Navigate to WhatsApp send URL
-        send_url = f"https://web.whatsapp.com/send?phone={clean_number}"
+        send_url = f"{config.BASE_URL}/send?phone={clean_number}"
         print(f" Testing URL: {send_url}")
         
         driver.get(send_url)
-        time.sleep(6)  # Wait for page load
         
-        current_url = driver.current_url
-        
-        # Check for chat interface elements (indicates registered)
-        chat_indicators = [
-            "[data-testid=\"conversation-header\"]",
-            "[role=\"textbox\"][contenteditable=\"true\"]",
-            "[data-testid=\"compose-box-input\"]",
-            "._13NKt",  # Message input box
-            "[data-testid=\"chat-header\"]"
-        ]
-        
-        for indicator in chat_indicators:
-            try:
-                elements = driver.find_elements(By.CSS_SELECTOR, indicator)
-                if elements and any(elem.is_displayed() for elem in elements):
-                    print(f" REGISTERED - Found: {indicator}")
-                    return True
-            except:
-                continue
-        
-        # Check page source for error messages
-        page_source = driver.page_source.lower()
-        
-        error_messages = [
-            "phone number shared via url is invalid",
-            "invalid phone number",
-            "el número de teléfono compartido a través de url no es válido"
-        ]
-        
-        for error in error_messages:
-            if error in page_source:
-                print(f" NOT REGISTERED - Error: {error}")
-                return False
-        
-        # Check if still on send page (not redirected to chat)
-        time.sleep(2)
-        final_url = driver.current_url
-        
-        if "send?phone=" in final_url and "/chat/" not in final_url:
-            print(" NOT REGISTERED - No chat redirect")
+        # Wait for the chat or the error, whichever comes first (6s deadline)
+        outcome = wait_for_outcome(driver, timeout=6)
+        if outcome["signal"] == "registered":
+            print(f" REGISTERED - Found: {outcome['selector']}")
+            return True
+        if outcome["signal"] == "not_registered":
+            print(f" NOT REGISTERED - Error: {outcome['selector']}")
             return False
         
-        # Default to registered if no clear error
-        print(" REGISTERED - Chat accessible")
-        return True
+        # No signal is no verdict: the compose URL stays in the address bar
+        # whatever the outcome, and a textbox exists on every page
+        print(f" No registration signal ({outcome['signal']})")
+        return {"error": f"No registration signal within 6s ({outcome['signal']})"}
         
     except Exception as e:
         print(f" Error checking registration: {e}")
-        return False
+        return {"error": f"Registration check failed: {e}"}
 
 def test_registration_no_dialogs():
     """Test registration checking without dialog boxes"""
@@ -200,7 +141,9 @@ def test_registration_no_dialogs():
         print("=" * 20)
         print(f" Number: {test_number}")
         
-        if result:
+        if isinstance(result, dict):
+            print(f" Status:  ERROR ({result['error']})")
+        elif result:
             print(" Status:  REGISTERED")
             print(" This number has an active WhatsApp account!")
         else:
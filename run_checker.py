@@ -3,6 +3,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from checker.whatsapp_checker import check_whatsapp_number
+from whatsapp import config
 
 def main():
     # Setup Chrome options
@@ -20,7 +21,7 @@ def main():
         print("✅ Browser started successfully")
         
         # Go to WhatsApp Web
-        driver.get("https://web.whatsapp.com")
+        driver.get(config.BASE_URL)
         print("\n📱 Please scan the QR code in the browser window")
         input("\nAfter scanning the QR code and WhatsApp Web loads, press Enter to continue...")
         
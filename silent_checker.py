@@ -1,45 +1,15 @@
+from whatsapp import config
 from whatsapp.selenium_checker import create_persistent_driver, initialize_whatsapp_session
+from whatsapp.driver_factory import create_driver
+from whatsapp.readiness import wait_for_outcome
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium import webdriver
 import time
-import os
 
 def create_silent_driver():
     """Create Chrome driver that runs silently without dialogs"""
-    chrome_options = Options()
-    
-    # Headless mode - no visible browser window
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    # Suppress all dialogs and notifications
-    chrome_options.add_argument("--disable-notifications")
-    chrome_options.add_argument("--disable-popup-blocking")
-    chrome_options.add_argument("--disable-default-apps")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-infobars")
-    chrome_options.add_argument("--disable-web-security")
-    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-    chrome_options.add_argument("--silent")
-    chrome_options.add_argument("--log-level=3")  # Suppress logs
-    
-    # Use persistent profile
-    profile_path = r"C:\num\chrome_profile"
-    if os.path.exists(profile_path):
-        chrome_options.add_argument(f"--user-data-dir={profile_path}")
-    
-    # Disable automation detection
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option("useAutomationExtension", False)
-    
     try:
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.execute_script("Object.defineProperty(navigator, \"webdriver\", {get: () => undefined})")
+        # Headless, no dialogs, images and fonts blocked (whatsapp.driver_factory)
+        driver = create_driver("headless-fast")
         print(" Silent Chrome driver created")
         return driver
     except Exception as e:
@@ -50,7 +20,7 @@ def silent_whatsapp_init(driver):
     """Initialize WhatsApp without showing browser"""
     try:
         print(" Loading WhatsApp Web silently...")
-        driver.get("https://web.whatsapp.com")
+        driver.get(config.BASE_URL)
         
         # Wait for page to load
         time.sleep(10)
@@ -81,58 +51,26 @@ def check_registration_silent(phone_number, driver):
         print(f" Silently checking: {phone_number}")
         
         # Navigate to WhatsApp chat URL
-        chat_url = f"https://web.whatsapp.com/send?phone={clean_number}"
+        chat_url = f"{config.BASE_URL}/send?phone={clean_number}"
         driver.get(chat_url)
-        time.sleep(8)
         
-        # Check current state
-        current_url = driver.current_url
-        page_source = driver.page_source.lower()
-        
-        # Method 1: Look for chat interface
-        try:
-            chat_selectors = [
-                "[role=textbox]",
-                "[data-testid=compose-box-input]",
-                "[data-testid=conversation-header]",
-                "._13NKt"
-            ]
-            
-            for selector in chat_selectors:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    print(" REGISTERED - Chat interface found")
-                    return True
-        except:
-            pass
-        
-        # Method 2: Check for error messages
-        error_indicators = [
-            "invalid phone",
-            "not registered", 
-            "número inválido",
-            "phone number shared via url is invalid"
-        ]
-        
-        for error in error_indicators:
-            if error in page_source:
-                print(" NOT REGISTERED - Error detected")
-                return False
-        
-        # Method 3: URL analysis
-        if "send?phone=" in current_url and "chat" not in current_url:
-            # Still on send page, check if it should redirect
-            time.sleep(3)
-            if driver.current_url == current_url:
-                print(" NOT REGISTERED - No chat redirect")
-                return False
+        # Resolve as soon as the chat or the error shows up (8s deadline)
+        outcome = wait_for_outcome(driver, timeout=8)
+        if outcome["signal"] == "registered":
+            print(f" REGISTERED - Chat interface found in {outcome['elapsed']}s")
+            return True
+        if outcome["signal"] == "not_registered":
+            print(f" NOT REGISTERED - Error detected in {outcome['elapsed']}s")
+            return False
         
-        print(" REGISTERED - Accessible")
-        return True
+        # No signal is no verdict: the compose URL stays in the address bar
+        # whatever the outcome, and a textbox exists on every page
+        print(f" No registration signal ({outcome['signal']})")
+        return {"error": f"No registration signal within 8s ({outcome['signal']})"}
         
     except Exception as e:
         print(f" Error in silent check: {e}")
-        return False
+        return {"error": f"Silent check failed: {e}"}
 
 def test_silent_checker():
     """Test the silent checker"""
@@ -174,7 +112,10 @@ def test_silent_checker():
                 "registered": result
             })
             
-            status = " REGISTERED" if result else " NOT REGISTERED"
+            if isinstance(result, dict):
+                status = f" ERROR: {result['error']}"
+            else:
+                status = " REGISTERED" if result else " NOT REGISTERED"
             print(f"   Result: {status}")
             print()
             
@@ -187,8 +128,9 @@ def test_silent_checker():
             status = " REG" if result["registered"] else " NOT REG"
            
         
-        registered_count = sum(1 for r in results if r["registered"])
-        print(f"\n   Total: {len(results)} | Registered: {registered_count}")
+        registered_count = sum(1 for r in results if r["registered"] is True)
+        error_count = sum(1 for r in results if isinstance(r["registered"], dict))
+        print(f"\n   Total: {len(results)} | Registered: {registered_count} | Errors: {error_count}")
         
     except Exception as e:
         print(f" Silent test failed: {e}")
@@ -209,8 +151,11 @@ def quick_silent_check(phone_number):
     try:
         if silent_whatsapp_init(driver):
             result = check_registration_silent(phone_number, driver)
-            status = "REGISTERED" if result else "NOT REGISTERED"
-            print(f" Result: {phone_number} is {status}")
+            if isinstance(result, dict):
+                print(f" Result: {phone_number} could not be checked: {result['error']}")
+            else:
+                status = "REGISTERED" if result else "NOT REGISTERED"
+                print(f" Result: {phone_number} is {status}")
             return result
         else:
             print(" Cannot initialize WhatsApp silently")
@@ -1,43 +1,16 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from whatsapp import config
+from whatsapp.driver_factory import create_driver
+from whatsapp.readiness import wait_for_outcome
 import time
-import os
 
 def create_stable_driver():
     """Create a stable Chrome driver with minimal dialog boxes"""
-    chrome_options = Options()
-    
-    # Essential options to suppress dialogs
-    chrome_options.add_argument("--disable-notifications")
-    chrome_options.add_argument("--disable-popup-blocking") 
-    chrome_options.add_argument("--disable-default-apps")
-    chrome_options.add_argument("--no-first-run")
-    chrome_options.add_argument("--no-default-browser-check")
-    chrome_options.add_argument("--disable-infobars")
-    
-    # Keep browser stable
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-gpu")
-    
-    # Use saved profile for no QR scanning
-    profile_path = r"C:\num\chrome_profile"
-    if os.path.exists(profile_path):
-        chrome_options.add_argument(f"--user-data-dir={profile_path}")
-        print(f" Using saved profile: {profile_path}")
-    
-    # Notification preferences
-    prefs = {
-        "profile.default_content_setting_values.notifications": 2,
-        "profile.default_content_settings.popups": 0
-    }
-    chrome_options.add_experimental_option("prefs", prefs)
-    
     try:
-        driver = webdriver.Chrome(options=chrome_options)
+        # Saved profile, so no QR scanning (whatsapp.driver_factory)
+        driver = create_driver("interactive")
         print(" Stable driver created")
         return driver
     except Exception as e:
@@ -51,12 +24,12 @@ def check_number_simple(phone_number):
     
     driver = create_stable_driver()
     if not driver:
-        return False
+        return {"error": "Could not start Chrome"}
     
     try:
         # Load WhatsApp Web
         print(" Loading WhatsApp Web...")
-        driver.get("https://web.whatsapp.com")
+        driver.get(config.BASE_URL)
         time.sleep(5)
         
         # Check if already logged in
@@ -72,66 +45,28 @@ def check_number_simple(phone_number):
         
         # Now test the registration
         clean_number = phone_number.replace("+", "").replace(" ", "").replace("-", "")
-        test_url = f"https://web.whatsapp.com/send?phone={clean_number}"
+        test_url = f"{config.BASE_URL}/send?phone={clean_number}"
         
         print(f" Testing URL: {test_url}")
         driver.get(test_url)
         
-        # Wait for page to load
-        time.sleep(8)
-        
-        # Check what happened
-        current_url = driver.current_url
-        page_source = driver.page_source.lower()
-        
-        print(f" Current URL: {current_url[:60]}...")
-        
-        # Look for positive indicators (registered)
-        positive_indicators = [
-            "[data-testid=\"conversation-header\"]",
-            "[role=\"textbox\"]", 
-            "[contenteditable=\"true\"]",
-            "._13NKt"
-        ]
-        
-        found_chat = False
-        for indicator in positive_indicators:
-            try:
-                elements = driver.find_elements(By.CSS_SELECTOR, indicator)
-                if elements and any(elem.is_displayed() for elem in elements):
-                    print(f" REGISTERED - Found chat element: {indicator}")
-                    found_chat = True
-                    break
-            except:
-                continue
-        
-        if found_chat:
+        # Wait for the chat or the error, whichever comes first (8s deadline)
+        outcome = wait_for_outcome(driver, timeout=8)
+        if outcome["signal"] == "registered":
+            print(f" REGISTERED - Found: {outcome['selector']}")
             return True
-        
-        # Check for error messages
-        error_phrases = [
-            "phone number shared via url is invalid",
-            "invalid phone",
-            "not registered"
-        ]
-        
-        for phrase in error_phrases:
-            if phrase in page_source:
-                print(f" NOT REGISTERED - Error: {phrase}")
-                return False
-        
-        # Check URL patterns
-        if "send?phone=" in current_url and "chat" not in current_url:
-            print(" NOT REGISTERED - Still on send page")
+        if outcome["signal"] == "not_registered":
+            print(f" NOT REGISTERED - Error: {outcome['selector']}")
             return False
         
-        # Default to registered if no clear error
-        print(" REGISTERED - Accessible")
-        return True
+        # No signal is no verdict: the compose URL stays in the address bar
+        # whatever the outcome, and contenteditable elements exist on every page
+        print(f" No registration signal ({outcome['signal']})")
+        return {"error": f"No registration signal within 8s ({outcome['signal']})"}
         
     except Exception as e:
         print(f" Error: {e}")
-        return False
+        return {"error": f"Check failed: {e}"}
     
     finally:
         print(" Closing browser...")
@@ -150,6 +85,9 @@ def main():
     print("\\n FINAL RESULT:")
     print("=" * 20)
     print(f" Number: {test_number}")
+    if isinstance(result, dict):
+        print(f" Status:  ERROR ({result['error']})")
+        return
     status = " REGISTERED" if result else " NOT REGISTERED"  
     print(f" Status: {status}")
     
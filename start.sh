@@ -2,4 +2,5 @@
 cd whatsapp_django
 python manage.py migrate
 python manage.py collectstatic --noinput
-gunicorn whatsapp_django.wsgi:application --bind 0.0.0.0:$PORT --workers 1 --timeout 30
\ No newline at end of file
+python manage.py run_check_worker &
+gunicorn whatsapp_django.wsgi:application --bind 0.0.0.0:$PORT --workers 1 --threads 8 --timeout 30
\ No newline at end of file
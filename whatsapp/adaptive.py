@@ -0,0 +1,222 @@
+"""
+Adaptive choice between checker strategies from live statistics.
+
+The 'adaptive' strategy keeps a rolling window of latency and errors per
+candidate strategy (``config.ADAPTIVE_STRATEGIES``, by default every
+strategy that looks at WhatsApp and runs in this process) and sends each check
+to the one with the best verdict throughput: verdicts per second of
+checking. A small share of checks (``config.ADAPTIVE_EXPLORE``) goes to
+the other candidates so their numbers stay current.
+
+When WhatsApp Web changes and a strategy starts failing, its errors and
+timeouts pull its throughput down and traffic moves to the next one.
+After ``config.ADAPTIVE_FAILURE_LIMIT`` failures in a row it is benched
+for ``config.ADAPTIVE_COOLDOWN`` seconds, then probed again. A check that
+fails is retried once on another strategy.
+"""
+import random
+import threading
+import time
+from collections import deque
+from typing import List, Optional
+
+from whatsapp import config
+from whatsapp.strategies import Strategy, Verdict, get_strategy, register, strategies
+
+
+class RollingStats:
+    """Latency and outcome of the most recent checks of one strategy."""
+
+    def __init__(self, window: int, max_age: float):
+        self.max_age = max_age
+        self.samples = deque(maxlen=window)  # (finished at, seconds, got a verdict)
+        self.failures_in_a_row = 0
+        self.benched_until = 0.0
+
+    def record(self, seconds: float, ok: bool, now: float) -> None:
+        self.samples.append((now, seconds, ok))
+        self.failures_in_a_row = 0 if ok else self.failures_in_a_row + 1
+
+    def recent(self, now: float) -> list:
+        return [sample for sample in self.samples if now - sample[0] <= self.max_age]
+
+    def throughput(self, now: float) -> Optional[float]:
+        """Verdicts per second spent checking, None without recent samples"""
+        recent = self.recent(now)
+        if not recent:
+            return None
+        busy = sum(seconds for _, seconds, _ in recent)
+        return sum(1 for _, _, ok in recent if ok) / max(busy, 0.001)
+
+    def summary(self, now: float) -> dict:
+        recent = self.recent(now)
+        seconds = sorted(s for _, s, _ in recent)
+        errors = sum(1 for _, _, ok in recent if not ok)
+        throughput = self.throughput(now)
+        return {
+            'checks': len(recent),
+            'error_rate': round(errors / len(recent), 3) if recent else None,
+            'mean_seconds': round(sum(seconds) / len(seconds), 3) if seconds else None,
+            'p95_seconds': seconds[min(len(seconds) - 1, int(0.95 * len(seconds)))] if seconds else None,
+            'verdicts_per_minute': round(throughput * 60, 2) if throughput is not None else None,
+            'failures_in_a_row': self.failures_in_a_row,
+            'benched_for': round(max(0.0, self.benched_until - now), 1),
+        }
+
+
+class AdaptiveDispatcher:
+    """Routes checks between candidate strategies; safe to share between threads."""
+
+    def __init__(self, names: Optional[List[str]] = None, explore: Optional[float] = None,
+                 window: Optional[int] = None, max_age: Optional[float] = None,
+                 failure_limit: Optional[int] = None, cooldown: Optional[float] = None,
+                 rng: Optional[random.Random] = None):
+        """
+        Args:
+            names (Optional[List[str]]): Candidate strategy names, defaults to
+                ``config.ADAPTIVE_STRATEGIES`` or else every cacheable strategy;
+                ones that are not registered, belong to the other app or
+                fail to import are left out
+            explore (Optional[float]): Share of checks sent to a non-best candidate
+            window (Optional[int]): Recent checks kept per candidate
+            max_age (Optional[float]): Seconds after which a sample no longer counts
+            failure_limit (Optional[int]): Failures in a row that bench a candidate
+            cooldown (Optional[float]): Seconds a benched candidate gets no traffic
+            rng (Optional[random.Random]): For reproducible choices in tests
+        """
+        self.explore = config.ADAPTIVE_EXPLORE if explore is None else explore
+        self.failure_limit = failure_limit or config.ADAPTIVE_FAILURE_LIMIT
+        self.cooldown = config.ADAPTIVE_COOLDOWN if cooldown is None else cooldown
+        self.rng = rng or random.Random()
+        window = window or config.ADAPTIVE_WINDOW
+        max_age = max_age or config.ADAPTIVE_MAX_AGE
+
+        # Guesses and stand-ins (smart-heuristic, mock) are not cacheable
+        # and not candidates unless named
+        names = names or config.ADAPTIVE_STRATEGIES or [
+            info['name'] for info in strategies() if info['cacheable']
+        ]
+        self.candidates = []
+        for name in names:
+            try:
+                strategy = get_strategy(name)
+                if not strategy.in_process():
+                    print(f"[WARNING] Adaptive dispatcher leaves out {name}: it belongs to another app")
+                    continue
+                strategy.load()
+            except Exception as e:
+                print(f"[WARNING] Adaptive dispatcher leaves out {name}: {e}")
+                continue
+            self.candidates.append(strategy)
+        if not self.candidates:
+            raise ValueError(f'None of the adaptive strategies {names} is usable here')
+
+        self._stats = {strategy.name: RollingStats(window, max_age) for strategy in self.candidates}
+        self._lock = threading.Lock()
+        self.routed = {strategy.name: 0 for strategy in self.candidates}
+        self.explored = 0
+
+    def choose(self, exclude=()) -> Optional[Strategy]:
+        """
+        Pick the candidate for the next check.
+
+        Untried candidates go first, then the best throughput, except for
+        the exploration share, which goes to a random other candidate.
+        """
+        now = time.time()
+        with self._lock:
+            pool = [s for s in self.candidates if s.name not in exclude]
+            if not pool:
+                return None
+            awake = [s for s in pool if self._stats[s.name].benched_until <= now]
+            # With everything benched, keep checking rather than refuse
+            pool = awake or pool
+
+            untried = [s for s in pool if self._stats[s.name].throughput(now) is None]
+            if untried:
+                chosen = self.rng.choice(untried)
+            else:
+                best = max(pool, key=lambda s: self._stats[s.name].throughput(now))
+                others = [s for s in pool if s is not best]
+                if others and self.rng.random() < self.explore:
+                    chosen = self.rng.choice(others)
+                    self.explored += 1
+                else:
+                    chosen = best
+            self.routed[chosen.name] += 1
+            return chosen
+
+    def record(self, name: str, verdict: Verdict) -> None:
+        now = time.time()
+        with self._lock:
+            stats = self._stats[name]
+            stats.record(verdict.seconds or 0.0, verdict.registered is not None, now)
+            if stats.failures_in_a_row >= self.failure_limit and stats.benched_until <= now:
+                stats.benched_until = now + self.cooldown
+                print(f"[WARNING] Strategy {name} failed {stats.failures_in_a_row} times in a row, "
+                      f"benched for {self.cooldown:.0f}s")
+
+    def check(self, number: str, use_cache: bool = True, refresh: bool = False) -> Verdict:
+        """Check with the chosen candidate; after a failure once more with another one."""
+        tried = []
+        verdict = None
+        for _ in range(min(2, len(self.candidates))):
+            strategy = self.choose(exclude=tried)
+            if strategy is None:
+                break
+            # The cache is shared by every strategy: a retry that read it
+            # would only get the error that made it retry
+            verdict = strategy.check(number, use_cache, refresh=refresh or bool(tried))
+            if not verdict.cached:
+                self.record(strategy.name, verdict)
+            if verdict.registered is not None:
+                return verdict
+            tried.append(strategy.name)
+        return verdict
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            return {
+                'explore': self.explore,
+                'explored': self.explored,
+                'strategies': {
+                    name: dict(stats.summary(now), routed=self.routed[name])
+                    for name, stats in self._stats.items()
+                },
+            }
+
+
+class AdaptiveStrategy(Strategy):
+    """The dispatcher behind the registry interface; built on its first check."""
+
+    def __init__(self, name: str = 'adaptive'):
+        super().__init__(name, self._check, 'Best live verdict throughput among '
+                         + (', '.join(config.ADAPTIVE_STRATEGIES) or 'the strategies of this app'),
+                         cacheable=False)
+        self._dispatcher = None
+
+    def dispatcher(self) -> AdaptiveDispatcher:
+        with self._lock:
+            if self._dispatcher is None:
+                self._dispatcher = AdaptiveDispatcher()
+            return self._dispatcher
+
+    def _check(self, number: str):
+        return self.check(number).as_result()
+
+    def check(self, number: str, use_cache: bool = True, refresh: bool = False) -> Verdict:
+        """Answered by (and cached through) whichever candidate the dispatcher picks"""
+        try:
+            dispatcher = self.dispatcher()
+        except ValueError as e:
+            return Verdict(number, 'error', self.name, error=str(e))
+        return dispatcher.check(number, use_cache, refresh)
+
+    def info(self) -> dict:
+        info = super().info()
+        info['dispatcher'] = self._dispatcher.stats() if self._dispatcher is not None else None
+        return info
+
+
+register('adaptive', AdaptiveStrategy())
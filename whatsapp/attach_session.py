@@ -0,0 +1,213 @@
+"""
+One long-lived WebDriver session on a Chrome started with a debug port.
+
+app.py checks numbers in a Chrome the user keeps logged in, reachable on
+``--remote-debugging-port``. Attaching a new session per check and
+quitting it afterwards closes that browser, so every following check
+launched a fresh one. :class:`AttachedBrowser` attaches once, hands the
+same session to one check at a time and re-attaches (or starts the
+browser) when the connection is lost. It never quits a browser it only
+attached to.
+
+The browser is shared by processes too: the web app and ``python app.py
+worker`` attach to the same debug port and type into the same tab, so a
+check also holds an exclusive lock on a file (:class:`ProcessLock`).
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from whatsapp.browser_pool import PoolTimeout
+
+try:
+    import fcntl
+
+    def _lock_file(handle) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock_file(handle) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+except ImportError:
+    # Windows
+    import msvcrt
+
+    def _lock_file(handle) -> None:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock_file(handle) -> None:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ProcessLock:
+    """
+    Exclusive lock on a file, held by one process at a time.
+
+    The operating system drops it when the holder exits, so a crashed
+    worker cannot leave the browser locked.
+    """
+
+    def __init__(self, path: str, poll: float = 0.05):
+        """
+        Args:
+            path (str): Lock file, created if missing; every process sharing
+                the browser must use the same path
+            poll (float): Seconds between attempts while another process holds it
+        """
+        self.path = path
+        self.poll = poll
+        self._handle = None
+
+    def acquire(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds; False if another process kept the lock"""
+        deadline = time.time() + timeout
+        handle = open(self.path, 'a+')
+        while True:
+            try:
+                _lock_file(handle)
+            except OSError:
+                if time.time() >= deadline:
+                    handle.close()
+                    return False
+                time.sleep(self.poll)
+                continue
+            self._handle = handle
+            return True
+
+    def release(self) -> None:
+        handle, self._handle = self._handle, None
+        if handle is None:
+            return
+        try:
+            _unlock_file(handle)
+        finally:
+            handle.close()
+
+
+class AttachedBrowser:
+    """
+    Serialized access to a shared debug-port browser.
+
+    The WhatsApp Web UI flows click through dialogs in the one active tab,
+    so checks cannot overlap; callers queue on a lock instead, and with
+    ``lock_path`` on a lock shared with the other processes as well.
+    """
+
+    def __init__(self, attach: Callable, launch: Optional[Callable] = None,
+                 checkout_timeout: float = 60.0, lock_path: Optional[str] = None):
+        """
+        Args:
+            attach (Callable): Returns a WebDriver attached to the running browser;
+                raises when nothing listens on the debug port
+            launch (Optional[Callable]): Starts the browser (with the debug port)
+                when there is nothing to attach to
+            checkout_timeout (float): Seconds to wait for the browser to be free
+            lock_path (Optional[str]): File locked for the duration of each check,
+                so checks from other processes on the same browser wait too
+        """
+        self.attach = attach
+        self.launch = launch
+        self.checkout_timeout = checkout_timeout
+
+        self._driver = None
+        self._owned = False
+        self._lock = threading.Lock()
+        self._process_lock = ProcessLock(lock_path) if lock_path else None
+        self.attached_at = None
+        self.reconnects = 0
+
+    @staticmethod
+    def _is_alive(driver) -> bool:
+        """One round trip; also moves to another tab if the current one was closed."""
+        try:
+            handles = driver.window_handles
+        except Exception:
+            return False
+        if not handles:
+            return False
+        try:
+            driver.current_window_handle
+        except Exception:
+            try:
+                driver.switch_to.window(handles[0])
+            except Exception:
+                return False
+        return True
+
+    def _connect(self) -> None:
+        if self._driver is not None:
+            self.reconnects += 1
+            print(f"[WARNING] Lost the debug-port browser, reconnecting ({self.reconnects})")
+            self._drop()
+        try:
+            self._driver = self.attach()
+            self._owned = False
+            print("[INFO] Attached to the running Chrome")
+        except Exception as e:
+            if self.launch is None:
+                raise
+            print(f"[INFO] No browser to attach to ({e}), starting one")
+            self._driver = self.launch()
+            self._owned = True
+        self.attached_at = time.time()
+
+    def _drop(self) -> None:
+        """Forget the session; only a browser this object started is quit."""
+        driver, owned = self._driver, self._owned
+        self._driver = None
+        if owned:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """
+        Borrow the attached driver for one check.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait, defaults to ``checkout_timeout``
+
+        Raises:
+            PoolTimeout: If another check keeps the browser past the deadline
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+        if not self._lock.acquire(timeout=timeout):
+            raise PoolTimeout('The debug-port browser is busy with another check')
+        try:
+            if self._process_lock is not None and \
+                    not self._process_lock.acquire(max(0.0, deadline - time.time())):
+                raise PoolTimeout('The debug-port browser is busy with a check from another process')
+            try:
+                if self._driver is None or not self._is_alive(self._driver):
+                    self._connect()
+                yield self._driver
+            finally:
+                if self._process_lock is not None:
+                    self._process_lock.release()
+        finally:
+            self._lock.release()
+
+    @property
+    def active(self) -> bool:
+        """Whether a session is currently held (without touching the browser)."""
+        return self._driver is not None
+
+    def stats(self) -> dict:
+        return {
+            'active': self.active,
+            'owned': self._owned,
+            'busy': self._lock.locked(),
+            'reconnects': self.reconnects,
+            'attached_at': self.attached_at,
+        }
+
+    def close(self) -> None:
+        """Release the session; the browser keeps running unless this object started it."""
+        with self._lock:
+            if self._driver is not None:
+                self._drop()
@@ -0,0 +1,329 @@
+"""
+Process-wide pool of warm, logged-in WhatsApp Web browsers.
+
+Launching Chrome with the full profile costs far more than a single
+compose-URL navigation, so the checkers borrow an already running driver
+from the pool instead of starting and quitting one per number.
+"""
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+from whatsapp import config
+from whatsapp.profiles import clone_worker_profiles, linked_profiles
+
+WHATSAPP_URL = config.BASE_URL
+
+# Any of these means WhatsApp Web finished restoring the saved login
+CHAT_LIST_SELECTOR = '[data-testid="chat-list"], #side'
+
+
+class PoolTimeout(Exception):
+    """Raised when no browser becomes available before the checkout deadline."""
+
+
+class _PooledDriver:
+    """Book-keeping wrapper around one pooled WebDriver."""
+
+    def __init__(self, driver, profile_dir: Optional[str] = None):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.checks = 0
+        self.created = time.time()
+        self.logged_in = False
+
+
+class BrowserPool:
+    """
+    Bounded pool of pre-navigated WebDriver instances.
+
+    Drivers are created lazily up to ``size``, health-checked on checkout,
+    and recycled after ``max_checks`` checks so a long-running Chrome never
+    accumulates unbounded memory.
+    """
+
+    def __init__(self, driver_factory: Callable, size: int = 1, max_checks: int = 200,
+                 checkout_timeout: float = 60.0, login_timeout: float = 30.0,
+                 warm_url: str = WHATSAPP_URL, profile_dirs: Optional[List[str]] = None):
+        """
+        Args:
+            driver_factory (Callable): Returns a new, not yet navigated WebDriver
+            size (int): Maximum number of live browsers
+            max_checks (int): Checks served before a browser is recycled
+            checkout_timeout (float): Seconds to wait for a free browser
+            login_timeout (float): Seconds to wait for the chat list on warm-up
+            warm_url (str): Page every new browser is pre-navigated to
+            profile_dirs (Optional[List[str]]): One user-data-dir per browser,
+                passed to the factory as ``user_data_dir`` (see whatsapp.profiles)
+        """
+        self.driver_factory = driver_factory
+        self.size = max(1, size)
+        self.max_checks = max_checks
+        self.checkout_timeout = checkout_timeout
+        self.login_timeout = login_timeout
+        self.warm_url = warm_url
+
+        self._free_profiles = list(profile_dirs or [])
+        if profile_dirs:
+            self.size = min(self.size, len(profile_dirs))
+
+        # Idle browsers, most recently used last. Checkouts wait on
+        # _available, which is notified whenever a browser is checked in or
+        # a slot frees up because one was discarded
+        self._idle = []
+        self._in_use = {}
+        self._live = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._closed = False
+
+    def _launch(self) -> _PooledDriver:
+        """Start a browser, open WhatsApp Web and wait for the saved login."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+
+        started = time.time()
+        profile_dir = None
+        if self._free_profiles:
+            with self._lock:
+                profile_dir = self._free_profiles.pop()
+        try:
+            driver = self.driver_factory(user_data_dir=profile_dir) if profile_dir else self.driver_factory()
+        except Exception:
+            self._release_profile(profile_dir)
+            raise
+        entry = _PooledDriver(driver, profile_dir)
+        try:
+            driver.get(self.warm_url)
+            WebDriverWait(driver, self.login_timeout).until(
+                lambda d: d.find_elements(By.CSS_SELECTOR, CHAT_LIST_SELECTOR)
+            )
+            entry.logged_in = True
+            print(f"[INFO] Pool browser ready in {time.time() - started:.1f}s")
+        except TimeoutException:
+            print("[WARNING] Pool browser started but WhatsApp Web is not logged in")
+        except Exception:
+            self._quit(entry)
+            self._release_profile(profile_dir)
+            raise
+        return entry
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        """Cheap liveness probe: one round trip to the browser."""
+        try:
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    def _quit(self, entry: _PooledDriver) -> None:
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+
+    def _release_profile(self, profile_dir: Optional[str]) -> None:
+        if profile_dir:
+            with self._lock:
+                self._free_profiles.append(profile_dir)
+
+    def _free_slot(self) -> None:
+        """Forget one live browser and wake a checkout that may launch its replacement"""
+        with self._available:
+            self._live -= 1
+            self._available.notify()
+
+    def _discard(self, entry: _PooledDriver) -> None:
+        self._quit(entry)
+        self._release_profile(entry.profile_dir)
+        self._free_slot()
+
+    def prewarm(self, count: Optional[int] = None) -> int:
+        """
+        Launch browsers ahead of demand and park them idle.
+
+        Args:
+            count (Optional[int]): Browsers to have live, defaults to (and capped at) ``size``
+
+        Returns:
+            int: How many of the launched browsers restored the WhatsApp login
+        """
+        logged_in = 0
+        for _ in range(min(count or self.size, self.size)):
+            with self._lock:
+                if self._closed or self._live >= self.size:
+                    break
+                self._live += 1
+            try:
+                entry = self._launch()
+            except Exception:
+                self._free_slot()
+                raise
+            logged_in += entry.logged_in
+            self._park(entry)
+        return logged_in
+
+    def _park(self, entry: _PooledDriver) -> None:
+        with self._available:
+            self._idle.append(entry)
+            self._available.notify()
+
+    def checkout(self, timeout: Optional[float] = None):
+        """
+        Borrow a warm driver.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait, defaults to ``checkout_timeout``
+
+        Returns:
+            WebDriver: A driver that must be given back with :meth:`checkin`
+
+        Raises:
+            PoolTimeout: If every browser stays busy until the deadline
+        """
+        if self._closed:
+            raise RuntimeError('Browser pool is closed')
+
+        deadline = time.time() + (self.checkout_timeout if timeout is None else timeout)
+        while True:
+            entry = None
+            with self._available:
+                while True:
+                    if self._closed:
+                        raise RuntimeError('Browser pool is closed')
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._live < self.size:
+                        self._live += 1
+                        break
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise PoolTimeout(f'No browser available after waiting for {self.size} busy browser(s)')
+                    self._available.wait(remaining)
+
+            if entry is None:
+                try:
+                    entry = self._launch()
+                except Exception:
+                    self._free_slot()
+                    raise
+
+            if not self._is_healthy(entry.driver):
+                print("[WARNING] Discarding unresponsive pool browser")
+                self._discard(entry)
+                continue
+
+            with self._lock:
+                self._in_use[id(entry.driver)] = entry
+            return entry.driver
+
+    def checkin(self, driver, healthy: bool = True) -> None:
+        """
+        Return a borrowed driver to the pool.
+
+        Args:
+            driver: Driver obtained from :meth:`checkout`
+            healthy (bool): Pass False to force the browser to be replaced
+        """
+        with self._lock:
+            entry = self._in_use.pop(id(driver), None)
+        if entry is None:
+            return
+
+        entry.checks += 1
+        if self._closed or not healthy or entry.checks >= self.max_checks:
+            if entry.checks >= self.max_checks:
+                print(f"[INFO] Recycling pool browser after {entry.checks} checks")
+            self._discard(entry)
+            return
+        self._park(entry)
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """Context manager form of :meth:`checkout` / :meth:`checkin`."""
+        driver = self.checkout(timeout)
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = self._is_healthy(driver)
+            raise
+        finally:
+            self.checkin(driver, healthy=healthy)
+
+    def stats(self) -> dict:
+        """Counters for status endpoints."""
+        with self._lock:
+            return {
+                'size': self.size,
+                'live': self._live,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+            }
+
+    def close(self) -> None:
+        """Quit every idle browser; busy ones are quit when checked in."""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            # Waiting checkouts fail now instead of at their deadline
+            self._available.notify_all()
+        for entry in idle:
+            self._discard(entry)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(driver_factory: Callable) -> BrowserPool:
+    """
+    Return the process-wide browser pool, creating it on first use.
+
+    The pool holds at most one browser per linked device
+    (:func:`whatsapp.profiles.linked_profiles`): clones of one linked profile
+    would take the WhatsApp Web session from each other. A ``POOL_SIZE``
+    above the number of linked profiles is capped, with a warning.
+
+    Args:
+        driver_factory (Callable): Used only when the pool does not exist yet
+
+    Returns:
+        BrowserPool: Pool configured from ``whatsapp.config``
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            size = min(config.POOL_SIZE, len(linked_profiles()))
+            if size < config.POOL_SIZE:
+                print(f"[WARNING] WHATSAPP_POOL_SIZE={config.POOL_SIZE} but only {size} linked profile(s); "
+                      f"link more with WHATSAPP_LINKED_PROFILES to run more browsers")
+            # Browsers cannot share a user-data-dir, so even a single
+            # browser runs on a clone and leaves the template untouched
+            try:
+                profile_dirs = clone_worker_profiles(size)
+            except FileNotFoundError as e:
+                # Not logged in yet: run on the profile itself so a QR login sticks
+                print(f"[WARNING] {e}; the pool uses {config.CHROME_PROFILE_DIR} directly")
+                size, profile_dirs = 1, None
+            _pool = BrowserPool(
+                driver_factory,
+                size=size,
+                max_checks=config.POOL_MAX_CHECKS,
+                checkout_timeout=config.POOL_CHECKOUT_TIMEOUT,
+                login_timeout=config.POOL_LOGIN_TIMEOUT,
+                profile_dirs=profile_dirs,
+            )
+            atexit.register(_pool.close)
+        return _pool
+
+
+def pool_stats() -> Optional[dict]:
+    """Counters of the process-wide pool, or None while it does not exist yet."""
+    with _pool_lock:
+        pool = _pool
+    return pool.stats() if pool is not None else None
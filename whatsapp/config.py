@@ -0,0 +1,140 @@
+"""
+Shared configuration for the WhatsApp checkers.
+
+Every value can be overridden with an environment variable so that the
+Flask app, the Django project and the standalone scripts all agree on
+the same browser profile and tuning knobs.
+"""
+import os
+import tempfile
+
+# Logged-in Chrome profile created by setup_login.py
+CHROME_PROFILE_DIR = os.environ.get('WHATSAPP_CHROME_PROFILE', r'C:\num\chrome_profile' if os.name == 'nt'
+                                    else os.path.join(os.path.expanduser('~'), 'whatsapp_chrome_profile'))
+CHROME_PROFILE_NAME = os.environ.get('WHATSAPP_PROFILE_NAME', 'Default')
+
+# More logged-in user-data-dirs, separated by os.pathsep, each linked as a
+# device of its own (WHATSAPP_CHROME_PROFILE=<dir> python setup_whatsapp_login.py).
+# WhatsApp Web keeps one browser per linked device active, so parallel
+# browsers are capped at one per linked profile (see whatsapp.profiles)
+LINKED_PROFILES = [path for path in os.environ.get('WHATSAPP_LINKED_PROFILES', '').split(os.pathsep) if path]
+
+# Per-worker copies of those profiles (see whatsapp.profiles)
+PROFILE_CLONE_DIR = os.environ.get('WHATSAPP_PROFILE_CLONES', os.path.join(tempfile.gettempdir(), 'whatsapp_profiles'))
+
+# Warm browser pool (see whatsapp.browser_pool)
+POOL_SIZE = int(os.environ.get('WHATSAPP_POOL_SIZE', '1'))
+POOL_MAX_CHECKS = int(os.environ.get('WHATSAPP_POOL_MAX_CHECKS', '200'))
+POOL_CHECKOUT_TIMEOUT = float(os.environ.get('WHATSAPP_POOL_CHECKOUT_TIMEOUT', '60'))
+POOL_LOGIN_TIMEOUT = float(os.environ.get('WHATSAPP_POOL_LOGIN_TIMEOUT', '30'))
+
+# Overall deadline for one registration verdict (see whatsapp.readiness)
+DETECT_TIMEOUT = float(os.environ.get('WHATSAPP_DETECT_TIMEOUT', '10'))
+
+# Batch jobs: pause between two checks, and how long a running job may go
+# without a worker heartbeat before another worker resumes it
+BATCH_DELAY = float(os.environ.get('WHATSAPP_BATCH_DELAY', '3'))
+JOB_STALE_AFTER = int(os.environ.get('WHATSAPP_JOB_STALE_AFTER', '120'))
+
+# The Django app runs its browser checks only in run_check_worker. How long
+# /api/check-single/ waits for the worker's answer before returning the job
+# id to poll instead, and how often the worker publishes its browser status
+SINGLE_CHECK_WAIT = float(os.environ.get('WHATSAPP_SINGLE_CHECK_WAIT', '25'))
+WORKER_STATUS_INTERVAL = float(os.environ.get('WHATSAPP_WORKER_STATUS_INTERVAL', '5'))
+
+# Job queue used by the Flask app (see whatsapp.job_store)
+JOB_DB = os.environ.get('WHATSAPP_JOB_DB', 'jobs.sqlite3')
+
+# Server-sent progress streams (see whatsapp.sse): how often the stream
+# looks for new results, and how long one response stays open before the
+# browser reconnects and resumes from its last event id
+SSE_POLL_INTERVAL = float(os.environ.get('WHATSAPP_SSE_POLL_INTERVAL', '0.5'))
+SSE_MAX_DURATION = float(os.environ.get('WHATSAPP_SSE_MAX_DURATION', '25'))
+
+# Registration result cache (see whatsapp.result_cache). TTLs are in
+# seconds; 0 stops that kind of result from being reused
+CACHE_DB = os.environ.get('WHATSAPP_CACHE_DB', 'result_cache.sqlite3')
+CACHE_POSITIVE_TTL = int(os.environ.get('WHATSAPP_CACHE_POSITIVE_TTL', str(7 * 24 * 3600)))
+CACHE_NEGATIVE_TTL = int(os.environ.get('WHATSAPP_CACHE_NEGATIVE_TTL', str(24 * 3600)))
+CACHE_ERROR_TTL = int(os.environ.get('WHATSAPP_CACHE_ERROR_TTL', '60'))
+CACHE_MEMORY_SIZE = int(os.environ.get('WHATSAPP_CACHE_MEMORY_SIZE', '10000'))
+
+# Largest contact export /api/upload-file accepts, in bytes (see whatsapp.ingest)
+UPLOAD_MAX_SIZE = int(os.environ.get('WHATSAPP_UPLOAD_MAX_SIZE', str(100 * 1024 * 1024)))
+
+# When driver.get returns: 'normal' waits for the page's load event, 'eager'
+# for DOMContentLoaded, 'none' not at all. The readiness detector decides
+# from the DOM either way (see whatsapp.readiness.set_page_load_strategy)
+PAGE_LOAD_STRATEGY = os.environ.get('WHATSAPP_PAGE_LOAD_STRATEGY', 'eager')
+
+# How the next number's chat is opened in an already loaded WhatsApp Web:
+# 'spa' routes inside the running app and falls back to a reload, 'reload'
+# always does a full page load (see whatsapp.spa)
+NAVIGATION_MODE = os.environ.get('WHATSAPP_NAVIGATION_MODE', 'spa')
+SPA_TIMEOUT = float(os.environ.get('WHATSAPP_SPA_TIMEOUT', '3'))
+
+# Tabs one browser works through in parallel (see whatsapp.tab_scheduler)
+TABS = int(os.environ.get('WHATSAPP_TABS', '3'))
+
+# Where the compose-URL checker reads its verdict from: 'dom' polls the
+# page, 'network' also matches the plain JSON lookup answers of the stub
+# server in the CDP performance log. It is for offline benchmarks and CI
+# only: the live service's traffic is encrypted and never matches, so it
+# is ignored while BASE_URL is the live service (see whatsapp.network_detector)
+DETECTOR = os.environ.get('WHATSAPP_DETECTOR', 'dom')
+
+# Drop images, media, avatars and fonts through CDP (see whatsapp.resource_blocking)
+BLOCK_RESOURCES = os.environ.get('WHATSAPP_BLOCK_RESOURCES', '1') == '1'
+
+# Chrome launch profile, one of whatsapp.driver_factory.PROFILES:
+# 'interactive', 'headless-fast' or 'low-memory'
+DRIVER_PROFILE = os.environ.get('WHATSAPP_DRIVER_PROFILE', 'interactive')
+# Extra Chrome switches for every profile, space separated
+CHROME_EXTRA_ARGUMENTS = os.environ.get('WHATSAPP_CHROME_ARGS', '').split()
+# Chrome's sandbox does not work as root, which is how containers run it
+CHROME_NO_SANDBOX = os.environ.get('WHATSAPP_CHROME_NO_SANDBOX', '1') == '1'
+# Seconds a measured browser gets to boot WhatsApp Web before its memory is read
+DRIVER_MEASURE_SETTLE = float(os.environ.get('WHATSAPP_DRIVER_MEASURE_SETTLE', '5'))
+
+# Pinned chromedriver / Chrome binaries; when unset they are resolved once
+# with Selenium Manager and remembered in CHROMEDRIVER_CACHE (see
+# whatsapp.driver_factory.resolve_binaries)
+CHROMEDRIVER_PATH = os.environ.get('WHATSAPP_CHROMEDRIVER', '')
+CHROME_BINARY = os.environ.get('WHATSAPP_CHROME_BINARY', '')
+CHROMEDRIVER_CACHE = os.environ.get('WHATSAPP_CHROMEDRIVER_CACHE', os.path.join(tempfile.gettempdir(), 'whatsapp_chromedriver.json'))
+
+# Launch and log in the pool browsers when the process that runs the
+# checks starts instead of on the first check (see whatsapp.warmup)
+PREWARM = os.environ.get('WHATSAPP_PREWARM', '1') == '1'
+
+# Chrome remote debugging address app.py attaches to, or starts Chrome on
+DEBUG_ADDRESS = os.environ.get('WHATSAPP_DEBUG_ADDRESS', '127.0.0.1:9222')
+
+# Seconds app.py waits for the New contact form to validate a typed number
+# (see whatsapp.contact_dialog)
+DIALOG_VALIDATION_TIMEOUT = float(os.environ.get('WHATSAPP_DIALOG_VALIDATION_TIMEOUT', '4'))
+
+# Where WhatsApp Web is served from. Point it at the local stand-in
+# (python -m whatsapp.stub_server) for offline benchmarks and CI
+BASE_URL = os.environ.get('WHATSAPP_BASE_URL', 'https://web.whatsapp.com').rstrip('/')
+
+# Checker strategy used when a request does not name one (see
+# whatsapp.strategies): 'compose-url', 'spa-route', 'compose-reload',
+# 'dialog', 'smart-heuristic', 'mock' or 'adaptive'. Empty lets each app use its own default
+CHECKER_STRATEGY = os.environ.get('WHATSAPP_STRATEGY', '')
+# Outcome table answered by the 'mock' strategy, same format as the stub server's
+MOCK_OUTCOMES = os.environ.get('WHATSAPP_MOCK_OUTCOMES', '')
+
+# The 'adaptive' strategy (see whatsapp.adaptive): the strategies it
+# chooses between (empty: every strategy that looks at WhatsApp and is
+# loaded in this process), the share of checks sent to the ones not
+# currently best, and how many recent checks per strategy its statistics cover
+ADAPTIVE_STRATEGIES = [name.strip() for name in os.environ.get(
+    'WHATSAPP_ADAPTIVE_STRATEGIES', '').split(',') if name.strip()]
+ADAPTIVE_EXPLORE = float(os.environ.get('WHATSAPP_ADAPTIVE_EXPLORE', '0.1'))
+ADAPTIVE_WINDOW = int(os.environ.get('WHATSAPP_ADAPTIVE_WINDOW', '50'))
+# Samples older than this many seconds no longer count
+ADAPTIVE_MAX_AGE = float(os.environ.get('WHATSAPP_ADAPTIVE_MAX_AGE', '600'))
+# Failures in a row that bench a strategy, and for how many seconds
+ADAPTIVE_FAILURE_LIMIT = int(os.environ.get('WHATSAPP_ADAPTIVE_FAILURE_LIMIT', '3'))
+ADAPTIVE_COOLDOWN = float(os.environ.get('WHATSAPP_ADAPTIVE_COOLDOWN', '60'))
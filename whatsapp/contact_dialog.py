@@ -0,0 +1,258 @@
+"""
+New chat -> New contact checks that keep the dialog open between numbers.
+
+app.py checks a number by typing it into WhatsApp Web's New contact form
+and reading the validation the form shows. Opening the form costs two
+clicks and two drawer animations, and the old flow slept through them
+(3 s + 3 s) and again after typing (4 s), for every number.
+
+:class:`ContactDialog` opens the form once and then, per number, clears
+the phone input, types the next number and waits for the form's own
+validation to change, which a MutationObserver reports from inside the
+page. A batch costs one dialog open plus the validation time per number.
+
+The number is written into the input in one step rather than typed key by
+key, so the form never validates (and the observer never sees a verdict
+for) a half-typed prefix of it.
+"""
+import time
+from typing import Dict, List, Optional
+
+from whatsapp import config
+from whatsapp.readiness import NEW_CONTACT_SIGNALS, PHRASE_PREFIX, PROBE_SCRIPT, TIMEOUT, signal_groups
+
+NEW_CHAT_SELECTORS = [
+    '[data-testid="new-chat-plus"]',
+    '[title="New chat"]',
+    '[aria-label="New chat"]',
+]
+
+NEW_CONTACT_SELECTORS = [
+    '[data-testid="new-contact"]',
+    'div[title="New contact"]',
+    'div[aria-label="New contact"]',
+]
+
+PHONE_INPUT_SELECTORS = [
+    'input[type="tel"]',
+    'input[data-testid="phone-number-input"]',
+    'input[placeholder*="phone"]',
+]
+
+# Replaces the input's whole value at once. The form is a React component:
+# assigning ``value`` directly is swallowed by React's own value tracking,
+# so the setter of the native prototype is used and an input event fired
+# for the form to validate the new value.
+SET_VALUE_SCRIPT = """
+var input = arguments[0], value = arguments[1];
+var setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+setter.call(input, value);
+input.dispatchEvent(new Event('input', {bubbles: true}));
+input.dispatchEvent(new Event('change', {bubbles: true}));
+"""
+
+# Resolves (asynchronously) once the validation state is what the caller
+# waits for: ``settled`` true waits until a signal shows, false until none
+# does (the blank form after clearing the input). The state is re-probed
+# on every DOM mutation instead of on a timer, so the answer arrives with
+# the render that produced it. The probe is PROBE_SCRIPT wrapped in a
+# function; building it with ``new Function`` would trip the page's CSP.
+VALIDATION_SCRIPT = """
+var probe = function () {
+""" + PROBE_SCRIPT + """
+};
+var groups = arguments[0], prefix = arguments[1], settled = arguments[2], timeout = arguments[3];
+var done = arguments[arguments.length - 1];
+var started = performance.now(), finished = false, observer = null, timer = null;
+var finish = function (hit, timedOut) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer) {
+        observer.disconnect();
+    }
+    clearTimeout(timer);
+    done({
+        signal: hit ? hit.signal : null,
+        selector: hit ? hit.selector : null,
+        timed_out: timedOut,
+        elapsed: Math.round(performance.now() - started) / 1000
+    });
+};
+var check = function () {
+    var hit = probe(groups, prefix);
+    if (settled ? hit : !hit) {
+        finish(hit, false);
+    }
+};
+observer = new MutationObserver(check);
+observer.observe(document.body, {subtree: true, childList: true, attributes: true, characterData: true});
+timer = setTimeout(function () { finish(probe(groups, prefix), true); }, timeout * 1000);
+check();
+"""
+
+
+class DialogError(Exception):
+    """The New contact form could not be opened; the message is shown to the user."""
+
+
+def _clickable(driver, selectors: List[str]):
+    """First displayed and enabled element matching any of ``selectors``, False keeps a wait polling"""
+    from selenium.webdriver.common.by import By
+
+    for selector in selectors:
+        for element in driver.find_elements(By.CSS_SELECTOR, selector):
+            try:
+                if element.is_displayed() and element.is_enabled():
+                    return element
+            except Exception:
+                # Re-rendered between find and check; the next poll finds the new one
+                continue
+    return False
+
+
+class ContactDialog:
+    """
+    The New contact form of one browser, kept open across checks.
+
+    Not thread-safe; app.py only uses it while holding the browser through
+    :class:`whatsapp.attach_session.AttachedBrowser`.
+    """
+
+    def __init__(self, open_timeout: float = 20, validation_timeout: Optional[float] = None,
+                 signals: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            open_timeout (float): Seconds each step of opening the form may take
+            validation_timeout (Optional[float]): Seconds to wait for the validation
+                of one number, defaults to ``config.DIALOG_VALIDATION_TIMEOUT``
+            signals (Optional[Dict[str, List[str]]]): Validation signals, defaults
+                to NEW_CONTACT_SIGNALS
+        """
+        self.open_timeout = open_timeout
+        self.validation_timeout = validation_timeout or config.DIALOG_VALIDATION_TIMEOUT
+        self.groups = signal_groups(signals or NEW_CONTACT_SIGNALS)
+
+        self._driver = None
+        self._input = None
+        self.opens = 0
+        self.checks = 0
+
+    def is_open(self, driver) -> bool:
+        """Whether the form opened earlier is still on screen in ``driver`` (one round trip)."""
+        if self._driver is not driver or self._input is None:
+            return False
+        try:
+            return self._input.is_displayed()
+        except Exception:
+            # Stale element: the form was closed or WhatsApp Web reloaded
+            return False
+
+    def _wait_for(self, driver, selectors: List[str], what: str):
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+
+        try:
+            return WebDriverWait(driver, self.open_timeout, poll_frequency=0.1).until(
+                lambda d: _clickable(d, selectors)
+            )
+        except TimeoutException:
+            raise DialogError(f'Could not find {what}')
+
+    def open(self, driver) -> None:
+        """
+        Click New chat -> New contact and keep the phone input.
+
+        Every step waits for the element the previous click reveals, so the
+        drawer animations cost what they take instead of a fixed sleep.
+
+        Raises:
+            DialogError: If a step's element does not show up within ``open_timeout``
+        """
+        started = time.time()
+        self._driver = None
+        self._input = None
+
+        self._wait_for(driver, NEW_CHAT_SELECTORS, 'new chat button').click()
+        self._wait_for(driver, NEW_CONTACT_SELECTORS, 'new contact option').click()
+        phone_input = self._wait_for(driver, PHONE_INPUT_SELECTORS, 'phone input field')
+
+        # The validation wait runs inside one execute_async_script call
+        driver.set_script_timeout(self.validation_timeout + 5)
+        self._driver = driver
+        self._input = phone_input
+        self.opens += 1
+        print(f"[INFO] New contact form open after {time.time() - started:.2f}s")
+
+    def _wait_for_validation(self, driver, settled: bool, timeout: float) -> dict:
+        return driver.execute_async_script(VALIDATION_SCRIPT, self.groups, PHRASE_PREFIX, settled, timeout)
+
+    def _set_value(self, driver, value: str) -> None:
+        driver.execute_script(SET_VALUE_SCRIPT, self._input, value)
+
+    def _clear(self, driver) -> dict:
+        """Empty the input and wait for the form to drop the previous number's validation"""
+        self._set_value(driver, '')
+        return self._wait_for_validation(driver, False, min(1.0, self.validation_timeout))
+
+    def check(self, driver, number: str) -> dict:
+        """
+        Enter ``number`` into the open form and wait for its validation.
+
+        Clearing the input first brings the form back to its blank state, so
+        the signal that shows up afterwards belongs to this number and not
+        to the previous one. A form that keeps showing a verdict for an
+        empty input is closed and opened again once; if the fresh form is
+        not blank either, no verdict from it could be trusted.
+
+        Args:
+            driver: The driver the form was opened in
+            number (str): Phone number as typed by the user
+
+        Returns:
+            dict: ``signal`` ('registered', 'not_registered' or 'timeout'),
+                ``selector`` and ``elapsed`` seconds of validation
+
+        Raises:
+            DialogError: If the form cannot be opened, or still shows a
+                validation signal for an empty input after reopening it
+        """
+        if not self.is_open(driver):
+            self.open(driver)
+
+        blank = self._clear(driver)
+        if blank['timed_out']:
+            print(f"[WARNING] Form still shows '{blank['signal']}' after clearing the input, reopening it")
+            self.close(driver)
+            self.open(driver)
+            blank = self._clear(driver)
+            if blank['timed_out']:
+                self.close(driver)
+                raise DialogError(f"New contact form keeps showing '{blank['signal']}' for an empty number")
+
+        started = time.time()
+        self._set_value(driver, number)
+        outcome = self._wait_for_validation(driver, True, self.validation_timeout)
+        self.checks += 1
+
+        return {
+            'signal': outcome['signal'] or TIMEOUT,
+            'selector': outcome['selector'],
+            'elapsed': round(time.time() - started, 3),
+        }
+
+    def close(self, driver) -> None:
+        """Escape out of the form and the New chat drawer and forget them."""
+        from selenium.webdriver.common.action_chains import ActionChains
+        from selenium.webdriver.common.keys import Keys
+
+        self._driver = None
+        self._input = None
+        try:
+            ActionChains(driver).send_keys(Keys.ESCAPE).send_keys(Keys.ESCAPE).perform()
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        return {'open': self._input is not None, 'opens': self.opens, 'checks': self.checks}
@@ -0,0 +1,374 @@
+"""
+One place to start Chrome for every checker.
+
+The checkers used to build their Chrome options each in their own way,
+so a flag that made one of them faster or lighter never reached the
+others. :func:`create_driver` starts a browser from a named performance
+profile on top of the shared settings in ``whatsapp.config`` (profile
+path, page load strategy, resource blocking, network log):
+
+- ``interactive``: visible window, for logging in by QR code and for
+  watching a check happen
+- ``headless-fast``: no window, for server-side checking
+- ``low-memory``: headless with one renderer process and capped caches,
+  for small containers that run several browsers
+
+:func:`measure_profile` reports startup time and resident memory of a
+profile so flags can be compared on the actual machine.
+
+The chromedriver and Chrome binaries are resolved once (see
+:func:`resolve_binaries`) and pinned through a ``Service``, so launches do
+not run Selenium Manager again. Docker images resolve them at build time
+with ``python -m whatsapp.driver_factory --resolve``.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from whatsapp import config
+from whatsapp.network_detector import enable_network_log, network_detection_enabled
+from whatsapp.readiness import set_page_load_strategy
+from whatsapp.resource_blocking import apply_resource_blocking
+from whatsapp.tab_scheduler import BACKGROUND_TAB_ARGUMENTS
+
+# Every profile: no first-run UI, notification or infobar dialogs, and
+# background tabs that keep running (see whatsapp.tab_scheduler)
+COMMON_ARGUMENTS = [
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-default-apps',
+    '--disable-notifications',
+    '--disable-popup-blocking',
+    '--disable-infobars',
+    '--disable-extensions',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--log-level=3',
+] + BACKGROUND_TAB_ARGUMENTS
+
+COMMON_PREFS = {
+    'profile.default_content_setting_values.notifications': 2,
+    'profile.default_content_setting_values.media_stream': 2,
+    'profile.default_content_settings.popups': 0,
+}
+
+PROFILES = {
+    'interactive': {
+        'headless': False,
+        'arguments': ['--window-size=1200,800'],
+    },
+    'headless-fast': {
+        'headless': True,
+        'arguments': [
+            '--disable-gpu',
+            # WhatsApp Web falls back to a narrow layout below ~1000px
+            '--window-size=1280,900',
+            '--disable-background-networking',
+            '--disable-sync',
+            '--metrics-recording-only',
+        ],
+    },
+    'low-memory': {
+        'headless': True,
+        'arguments': [
+            '--disable-gpu',
+            '--window-size=1280,900',
+            '--disable-background-networking',
+            '--disable-sync',
+            '--renderer-process-limit=1',
+            '--disable-site-isolation-trials',
+            '--disable-features=Translate,OptimizationHints,MediaRouter,site-per-process',
+            '--disk-cache-size=1048576',
+            '--js-flags=--max-old-space-size=512',
+        ],
+    },
+}
+
+HIDE_WEBDRIVER_SCRIPT = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+
+_binaries = None
+_binaries_lock = threading.Lock()
+
+
+def _read_binaries_cache() -> Optional[dict]:
+    try:
+        with open(config.CHROMEDRIVER_CACHE) as f:
+            paths = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # A Chrome update or a cleaned cache directory invalidates the entry
+    if all(paths.get(key) and os.path.isfile(paths[key]) for key in ('driver_path', 'browser_path')):
+        return paths
+    return None
+
+
+def _run_selenium_manager() -> dict:
+    """Ask Selenium Manager for the driver matching the installed Chrome (may download it)."""
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.driver_finder import DriverFinder
+
+    options = Options()
+    if config.CHROME_BINARY:
+        options.binary_location = config.CHROME_BINARY
+    finder = DriverFinder(Service(), options)
+    return {'driver_path': finder.get_driver_path(), 'browser_path': finder.get_browser_path()}
+
+
+def resolve_binaries(refresh: bool = False) -> dict:
+    """
+    Paths of chromedriver and Chrome, resolved once per process.
+
+    Explicit ``WHATSAPP_CHROMEDRIVER`` / ``WHATSAPP_CHROME_BINARY`` win;
+    otherwise the paths cached in ``config.CHROMEDRIVER_CACHE`` are used
+    while both files still exist, and Selenium Manager is run only when
+    they do not (its answer is written back to the cache).
+
+    Args:
+        refresh (bool): Ignore the cache and run Selenium Manager again
+
+    Returns:
+        dict: ``driver_path`` and ``browser_path`` (either may be '' if unknown)
+    """
+    global _binaries
+    with _binaries_lock:
+        if _binaries is not None and not refresh:
+            return _binaries
+
+        if config.CHROMEDRIVER_PATH:
+            paths = {'driver_path': config.CHROMEDRIVER_PATH, 'browser_path': config.CHROME_BINARY}
+        else:
+            paths = None if refresh else _read_binaries_cache()
+            if paths is None:
+                started = time.time()
+                paths = _run_selenium_manager()
+                print(f"[INFO] Resolved chromedriver {paths['driver_path']} in {time.time() - started:.2f}s")
+                try:
+                    with open(config.CHROMEDRIVER_CACHE, 'w') as f:
+                        json.dump(paths, f)
+                except OSError as e:
+                    print(f"[WARNING] Could not cache the chromedriver path: {e}")
+        _binaries = paths
+        return paths
+
+
+def chrome_service():
+    """``Service`` pinned to the resolved chromedriver, skipping Selenium Manager."""
+    from selenium.webdriver.chrome.service import Service
+
+    return Service(executable_path=resolve_binaries()['driver_path'] or None)
+
+
+def build_options(profile: Optional[str] = None, user_data_dir: Optional[str] = None,
+                  profile_directory: Optional[str] = None, headless: Optional[bool] = None,
+                  arguments: Optional[List[str]] = None):
+    """
+    Chrome options for a named profile.
+
+    Args:
+        profile (Optional[str]): Key of PROFILES, defaults to ``config.DRIVER_PROFILE``
+        user_data_dir (Optional[str]): Defaults to ``config.CHROME_PROFILE_DIR`` when
+            that exists; otherwise Chrome runs on a throwaway profile
+        profile_directory (Optional[str]): Defaults to ``config.CHROME_PROFILE_NAME``
+        headless (Optional[bool]): Overrides the profile's setting
+        arguments (Optional[List[str]]): Extra Chrome switches
+
+    Returns:
+        Options: Ready to pass to ``webdriver.Chrome``
+
+    Raises:
+        ValueError: For an unknown profile name
+    """
+    from selenium.webdriver.chrome.options import Options
+
+    name = profile or config.DRIVER_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown driver profile '{name}', expected one of {', '.join(PROFILES)}")
+    settings = PROFILES[name]
+
+    options = Options()
+    if user_data_dir is None and os.path.exists(config.CHROME_PROFILE_DIR):
+        user_data_dir = config.CHROME_PROFILE_DIR
+    if user_data_dir:
+        options.add_argument(f'--user-data-dir={user_data_dir}')
+        options.add_argument(f'--profile-directory={profile_directory or config.CHROME_PROFILE_NAME}')
+    for argument in COMMON_ARGUMENTS + settings['arguments'] + config.CHROME_EXTRA_ARGUMENTS + list(arguments or []):
+        options.add_argument(argument)
+    if settings['headless'] if headless is None else headless:
+        options.add_argument('--headless=new')
+    if config.CHROME_NO_SANDBOX:
+        options.add_argument('--no-sandbox')
+
+    browser_path = config.CHROME_BINARY or (_binaries or {}).get('browser_path')
+    if browser_path:
+        options.binary_location = browser_path
+    options.add_experimental_option('prefs', COMMON_PREFS)
+    options.add_experimental_option('excludeSwitches', ['enable-automation'])
+    options.add_experimental_option('useAutomationExtension', False)
+    set_page_load_strategy(options)
+    if network_detection_enabled():
+        enable_network_log(options)
+    return options
+
+
+def create_driver(profile: Optional[str] = None, user_data_dir: Optional[str] = None,
+                  profile_directory: Optional[str] = None, headless: Optional[bool] = None,
+                  arguments: Optional[List[str]] = None):
+    """
+    Start Chrome from a named profile.
+
+    Takes the same arguments as :func:`build_options`, so it can be handed
+    to ``whatsapp.browser_pool.get_pool`` as the driver factory.
+
+    Returns:
+        WebDriver: Started browser; ``driver.startup_seconds`` holds the launch time
+    """
+    from selenium import webdriver
+
+    name = profile or config.DRIVER_PROFILE
+    service = chrome_service()
+    options = build_options(name, user_data_dir, profile_directory, headless, arguments)
+
+    started = time.time()
+    driver = webdriver.Chrome(service=service, options=options)
+    driver.startup_seconds = round(time.time() - started, 3)
+    driver.driver_profile = name
+
+    try:
+        # Applies to every document the tab loads, not just the current one
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': HIDE_WEBDRIVER_SCRIPT})
+    except Exception:
+        pass
+    apply_resource_blocking(driver)
+    if name == 'interactive':
+        driver.maximize_window()
+    print(f"[INFO] Chrome started with the '{name}' profile in {driver.startup_seconds}s")
+    return driver
+
+
+def _process_tree() -> Dict[int, List[int]]:
+    """Parent pid -> child pids of every process, from /proc."""
+    tree = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces, the ppid follows its closing ")"
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        tree.setdefault(ppid, []).append(int(entry))
+    return tree
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """
+    Resident memory of a process and all its descendants, in bytes.
+
+    Uses psutil when it is installed, /proc otherwise.
+
+    Returns:
+        Optional[int]: None when neither is available
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            return sum(p.memory_info().rss for p in [root] + root.children(recursive=True))
+        except psutil.Error:
+            return None
+
+    if not os.path.isdir('/proc'):
+        return None
+    tree = _process_tree()
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(tree.get(current, []))
+        try:
+            with open(f'/proc/{current}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+def children_rss(pid: int) -> Optional[int]:
+    """
+    Resident memory of everything ``pid`` started (chromedriver, Chrome), without ``pid`` itself.
+
+    Returns:
+        Optional[int]: None when neither psutil nor /proc is available
+    """
+    try:
+        import psutil
+        try:
+            children = [child.pid for child in psutil.Process(pid).children()]
+        except psutil.Error:
+            return None
+    except ImportError:
+        if not os.path.isdir('/proc'):
+            return None
+        children = _process_tree().get(pid, [])
+    return sum(process_tree_rss(child) or 0 for child in children)
+
+
+def driver_rss(driver) -> Optional[int]:
+    """Resident memory of chromedriver plus the Chrome processes it started."""
+    try:
+        return process_tree_rss(driver.service.process.pid)
+    except AttributeError:
+        return None
+
+
+def measure_profile(profile: str, url: Optional[str] = None, runs: int = 1, **kwargs) -> dict:
+    """
+    Start a profile ``runs`` times and measure launch time and memory.
+
+    Args:
+        profile (str): Key of PROFILES
+        url (Optional[str]): Page to load before the memory is read
+        runs (int): Number of launches
+        **kwargs: Passed on to :func:`create_driver`
+
+    Returns:
+        dict: ``profile``, ``startup`` (seconds per run), ``load`` and ``rss`` (bytes per run)
+    """
+    result = {'profile': profile, 'startup': [], 'load': [], 'rss': []}
+    for _ in range(runs):
+        driver = create_driver(profile, **kwargs)
+        try:
+            result['startup'].append(driver.startup_seconds)
+            if url:
+                started = time.time()
+                driver.get(url)
+                result['load'].append(round(time.time() - started, 3))
+                # Let the app boot before its memory is read
+                time.sleep(config.DRIVER_MEASURE_SETTLE)
+            result['rss'].append(driver_rss(driver))
+        finally:
+            driver.quit()
+    return result
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Chrome driver factory')
+    parser.add_argument('--resolve', action='store_true',
+                        help='Resolve chromedriver and Chrome now and cache the paths (e.g. at image build time)')
+    args = parser.parse_args()
+    if args.resolve:
+        print(json.dumps(resolve_binaries(refresh=True)))
+    else:
+        parser.print_help()
@@ -0,0 +1,245 @@
+"""
+Streaming phone number extraction from uploaded contact files.
+
+Uploads are read in fixed-size chunks and parsed as they arrive: text and
+CSV line by line, Excel workbooks in openpyxl's read-only mode, one row at
+a time. Legacy .xls workbooks are the exception: xlrd needs the whole file
+in memory, so they are read at once (the upload size limit still applies).
+Numbers are yielded one by one, in the E.164 form the result cache keys on,
+and the upload endpoints stream them back with :func:`json_stream`, so
+memory use stays flat however large the export is.
+"""
+import codecs
+import csv
+import json
+import re
+from typing import Callable, Iterable, Iterator, List, Optional
+
+CHUNK_SIZE = 64 * 1024
+
+# Anything that looks like a phone number inside free text, including
+# separators such as "+91 98765-43210" or "(555) 123-4567"
+PHONE_PATTERN = re.compile(r'\+?\(?\d(?:[\s().-]{0,2}\d){6,}')
+
+# Used to split a match that ran several space-separated numbers together
+COMPACT_PATTERN = re.compile(r'\+?\d[\d().-]{6,}\d')
+
+# Header words that mark the phone column of a CSV or spreadsheet
+PHONE_HEADERS = ('phone', 'number', 'mobile', 'tel')
+
+# Same bounds as whatsapp.utils.validate_phone_number
+MIN_DIGITS = 10
+MAX_DIGITS = 15
+
+SUPPORTED_EXTENSIONS = ('.txt', '.csv', '.xlsx', '.xls')
+
+
+# Numbers per chunk of a streamed JSON response
+JSON_BATCH = 1000
+
+
+def clean_number(value) -> Optional[str]:
+    """
+    Normalize one cell or match to E.164, like whatsapp.utils.validate_phone_number.
+
+    "+91 98765-43210", "919876543210" and 9.1987654321e11 all become
+    "+919876543210", so they share a cache key and deduplicate.
+
+    Returns:
+        Optional[str]: "+" and the digits, or None if the value does not
+            have a plausible number of digits
+    """
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets store long numbers as floats (9.19876543210e11)
+        value = int(value)
+    text = str(value).strip()
+    digits = re.sub(r'\D', '', text)
+    if not MIN_DIGITS <= len(digits) <= MAX_DIGITS:
+        return None
+    return '+' + digits
+
+
+def iter_lines(fileobj, encoding: str = 'utf-8-sig') -> Iterator[str]:
+    """
+    Decode a binary file incrementally and yield its lines (with line endings).
+
+    Undecodable bytes are replaced rather than failing the whole upload.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    pending = ''
+    for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b''):
+        pending += decoder.decode(chunk)
+        lines = pending.splitlines(keepends=True)
+        # The last piece may be an unfinished line; keep it for the next chunk
+        pending = lines.pop() if lines and not lines[-1].endswith(('\n', '\r')) else ''
+        yield from lines
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def _phone_columns(header) -> List[int]:
+    return [
+        i for i, cell in enumerate(header)
+        if cell is not None and any(word in str(cell).lower() for word in PHONE_HEADERS)
+    ]
+
+
+def _iter_table(rows: Iterator) -> Iterator[str]:
+    """
+    Yield numbers from rows of cells.
+
+    If the first row names phone columns ("Phone", "Mobile number", ...)
+    only those columns are read, otherwise the first cell of every row
+    that holds a number.
+    """
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return
+
+    columns = _phone_columns(header)
+    if not columns:
+        for row in _prepend(header, rows):
+            for cell in row:
+                number = clean_number(cell) if cell is not None else None
+                if number:
+                    yield number
+                    break
+        return
+
+    for row in rows:
+        for i in columns:
+            if i < len(row) and row[i] is not None:
+                number = clean_number(row[i])
+                if number:
+                    yield number
+
+
+def _prepend(first, rest: Iterator) -> Iterator:
+    yield first
+    yield from rest
+
+
+def iter_text_numbers(fileobj) -> Iterator[str]:
+    """Yield every phone-like token of a plain text file."""
+    for line in iter_lines(fileobj):
+        for match in PHONE_PATTERN.findall(line):
+            number = clean_number(match)
+            if number:
+                yield number
+                continue
+            for part in COMPACT_PATTERN.findall(match):
+                number = clean_number(part)
+                if number:
+                    yield number
+
+
+def iter_csv_numbers(fileobj) -> Iterator[str]:
+    """Yield the numbers of a CSV file, see :func:`_iter_table`."""
+    yield from _iter_table(csv.reader(iter_lines(fileobj)))
+
+
+def iter_xlsx_numbers(fileobj) -> Iterator[str]:
+    """Yield the numbers of the first sheet of an .xlsx workbook, see :func:`_iter_table`."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        yield from _iter_table(workbook.worksheets[0].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def iter_xls_numbers(fileobj) -> Iterator[str]:
+    """Yield the numbers of the first sheet of a legacy .xls workbook, see :func:`_iter_table`."""
+    import xlrd
+
+    workbook = xlrd.open_workbook(file_contents=fileobj.read(), on_demand=True)
+    try:
+        sheet = workbook.sheet_by_index(0)
+        yield from _iter_table(sheet.row_values(i) for i in range(sheet.nrows))
+    finally:
+        workbook.release_resources()
+
+
+def extract_numbers(fileobj, filename: str) -> Iterator[str]:
+    """
+    Stream the phone numbers of an uploaded file.
+
+    Args:
+        fileobj: Binary file object (Django UploadedFile, Werkzeug FileStorage, open file)
+        filename (str): Original name, used to pick the parser
+
+    Yields:
+        str: Numbers in E.164 form, see :func:`clean_number`
+
+    Raises:
+        ValueError: If the file type is not supported
+    """
+    name = filename.lower()
+    if name.endswith('.txt'):
+        return iter_text_numbers(fileobj)
+    if name.endswith('.csv'):
+        return iter_csv_numbers(fileobj)
+    if name.endswith('.xlsx'):
+        return iter_xlsx_numbers(fileobj)
+    if name.endswith('.xls'):
+        return iter_xls_numbers(fileobj)
+    raise ValueError('Unsupported file format. Use .txt, .csv, .xlsx or .xls')
+
+
+def unique_numbers(numbers: Iterable[str]) -> Iterator[str]:
+    """Yield each number the first time it appears."""
+    seen = set()
+    for number in numbers:
+        if number not in seen:
+            seen.add(number)
+            yield number
+
+
+def json_stream(numbers: Iterable[str], summary: Callable[[int], dict]) -> Optional[Iterator[str]]:
+    """
+    Serialize ``{"success": true, "numbers": [...], **summary(count)}`` piece by piece.
+
+    The first number is read before anything is sent, so parse errors of
+    the file surface here and an empty file returns None; callers can
+    still answer both with an error status. A parse error further down
+    ends the document with an ``error`` field.
+
+    Args:
+        numbers (Iterable[str]): Usually ``unique_numbers(extract_numbers(...))``
+        summary (Callable[[int], dict]): Fields to append, given the number count
+
+    Returns:
+        Optional[Iterator[str]]: JSON text chunks for a streaming response,
+            or None if there are no numbers
+    """
+    numbers = iter(numbers)
+    first = next(numbers, None)
+    if first is None:
+        return None
+    return _json_chunks(_prepend(first, numbers), summary)
+
+
+def _json_chunks(numbers: Iterator[str], summary: Callable[[int], dict]) -> Iterator[str]:
+    yield '{"success": true, "numbers": ['
+    count = 0
+    batch = []
+    error = None
+    try:
+        for number in numbers:
+            batch.append(json.dumps(number))
+            count += 1
+            if len(batch) == JSON_BATCH:
+                yield (', ' if count > JSON_BATCH else '') + ', '.join(batch)
+                batch = []
+    except Exception as e:
+        error = f'Error processing file: {e}'
+    if batch:
+        yield (', ' if count > len(batch) else '') + ', '.join(batch)
+
+    fields = summary(count)
+    if error:
+        fields['error'] = error
+    yield '], ' + json.dumps(fields)[1:]
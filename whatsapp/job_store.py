@@ -0,0 +1,290 @@
+"""
+SQLite-backed batch job queue for the Flask app.
+
+Mirrors the Django ``CheckJob``/``CheckResult`` models for deployments
+that run app.py: the web process only enqueues jobs and reads progress,
+a separate worker (``python app.py worker``) claims and runs them and
+checkpoints every number, so a restarted worker resumes a job instead of
+losing it.
+"""
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+from whatsapp import config
+from whatsapp.result_cache import lookup_result, store_result
+from whatsapp.utils import group_numbers
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    total INTEGER NOT NULL DEFAULT 0,
+    progress INTEGER NOT NULL DEFAULT 0,
+    worker TEXT NOT NULL DEFAULT '',
+    heartbeat REAL,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS job_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    number TEXT NOT NULL,
+    registered INTEGER,
+    message TEXT NOT NULL DEFAULT '',
+    error TEXT NOT NULL DEFAULT '',
+    checked_at REAL,
+    UNIQUE (job_id, position)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+"""
+
+# Largest page /api/jobs/<id>/results returns in one response
+RESULTS_PAGE_SIZE = 500
+
+
+# Databases whose tables this process has already created; the progress
+# stream opens a connection every poll and should not rerun the DDL
+_created = set()
+_created_lock = threading.Lock()
+
+
+def _create_schema(conn: sqlite3.Connection, db_path: str) -> None:
+    key = os.path.abspath(db_path)
+    if key in _created:
+        return
+    with _created_lock:
+        if key not in _created:
+            conn.executescript(SCHEMA)
+            _created.add(key)
+
+
+@contextmanager
+def connect(db_path: Optional[str] = None):
+    """Open the job database in a transaction, creating the tables once per process."""
+    db_path = db_path or config.JOB_DB
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        _create_schema(conn, db_path)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def enqueue_job(numbers: List[str], db_path: Optional[str] = None) -> int:
+    """
+    Store a batch and its numbers.
+
+    Returns:
+        int: The new job id
+    """
+    numbers = [str(n).strip() for n in numbers if str(n).strip()]
+    with connect(db_path) as conn:
+        job_id = conn.execute(
+            'INSERT INTO jobs (total, created_at) VALUES (?, ?)', (len(numbers), time.time())
+        ).lastrowid
+        conn.executemany(
+            'INSERT INTO job_results (job_id, position, number) VALUES (?, ?, ?)',
+            [(job_id, i, number) for i, number in enumerate(numbers)],
+        )
+    return job_id
+
+
+def _result_dict(row: sqlite3.Row) -> dict:
+    if row['error']:
+        return {'number': row['number'], 'error': row['error']}
+    return {
+        'number': row['number'],
+        'registered': bool(row['registered']),
+        'message': row['message'],
+    }
+
+
+def latest_status(db_path: Optional[str] = None) -> dict:
+    """Progress of the most recent job, in the old ``checking_status`` shape."""
+    with connect(db_path) as conn:
+        job = conn.execute('SELECT * FROM jobs ORDER BY id DESC LIMIT 1').fetchone()
+        if job is None:
+            return {'running': False, 'progress': 0, 'total': 0, 'results': []}
+        rows = conn.execute(
+            'SELECT * FROM job_results WHERE job_id = ? AND checked_at IS NOT NULL ORDER BY position',
+            (job['id'],),
+        ).fetchall()
+    return {
+        'job_id': job['id'],
+        'running': job['status'] != 'done',
+        'progress': job['progress'],
+        'total': job['total'],
+        'results': [_result_dict(row) for row in rows],
+    }
+
+
+def job_counters(job_id: int, db_path: Optional[str] = None) -> Optional[dict]:
+    """Status of a job without its results, or None if it does not exist."""
+    with connect(db_path) as conn:
+        job = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    if job is None:
+        return None
+    return {
+        'job_id': job['id'],
+        'status': job['status'],
+        'running': job['status'] != 'done',
+        'progress': job['progress'],
+        'total': job['total'],
+    }
+
+
+def results_since(job_id: int, since: int = 0, limit: int = RESULTS_PAGE_SIZE,
+                  db_path: Optional[str] = None) -> tuple:
+    """
+    Return the checked results of a job starting at position ``since``.
+
+    Only the unbroken run of checked rows is returned, so a row that is
+    still pending can never be skipped by a client that resumes from the
+    returned cursor.
+
+    Returns:
+        tuple: (list of result dicts, cursor to pass as ``since`` next time)
+    """
+    limit = max(1, min(limit, RESULTS_PAGE_SIZE))
+    with connect(db_path) as conn:
+        rows = conn.execute(
+            'SELECT * FROM job_results WHERE job_id = ? AND position >= ? ORDER BY position LIMIT ?',
+            (job_id, since, limit),
+        ).fetchall()
+    results = []
+    cursor = since
+    for row in rows:
+        if row['checked_at'] is None:
+            break
+        results.append(_result_dict(row))
+        cursor = row['position'] + 1
+    return results, cursor
+
+
+def worker_name() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim_job(worker: str, db_path: Optional[str] = None) -> Optional[int]:
+    """
+    Claim the oldest queued job, or a running job whose worker went silent.
+
+    Returns:
+        Optional[int]: Claimed job id, or None when there is nothing to do
+    """
+    now = time.time()
+    with connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT id, status, heartbeat FROM jobs"
+            " WHERE status = 'queued' OR (status = 'running' AND heartbeat < ?)"
+            " ORDER BY status = 'queued', id LIMIT 10",
+            (now - config.JOB_STALE_AFTER,),
+        ).fetchall()
+        for row in rows:
+            claimed = conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, heartbeat = ?"
+                " WHERE id = ? AND status = ? AND heartbeat IS ?",
+                (worker, now, row['id'], row['status'], row['heartbeat']),
+            ).rowcount
+            if claimed:
+                if row['status'] == 'running':
+                    print(f"[WORKER] Resuming abandoned job {row['id']}")
+                return row['id']
+    return None
+
+
+def run_job(job_id: int, check_number: Callable, delay: Optional[float] = None,
+            db_path: Optional[str] = None) -> None:
+    """
+    Check every pending number of a claimed job, checkpointing each result.
+
+    Numbers are canonicalized first and each distinct number is checked
+    once; its result is written to every row that holds it.
+
+    Args:
+        job_id (int): Job returned by :func:`claim_job`
+        check_number (Callable): canonical number -> bool, or a dict with an ``error`` key;
+            only called for numbers the result cache holds no verdict for
+        delay (Optional[float]): Pause between checks, defaults to ``config.BATCH_DELAY``
+    """
+    delay = config.BATCH_DELAY if delay is None else delay
+    with connect(db_path) as conn:
+        pending = conn.execute(
+            'SELECT id, number FROM job_results WHERE job_id = ? AND checked_at IS NULL ORDER BY position',
+            (job_id,),
+        ).fetchall()
+    groups = group_numbers(row['number'] for row in pending)
+    print(f"[WORKER] Job {job_id}: {len(pending)} numbers left, {len(groups)} unique")
+
+    for number, indexes in groups.items():
+        # Numbers checked recently are answered without a browser. Only a
+        # verdict is reused or remembered: an error is retried on the next
+        # check instead of being copied into other rows, jobs and single checks
+        result = lookup_result(number)
+        if not isinstance(result, bool):
+            result = None
+        live = result is None
+        if live:
+            try:
+                result = check_number(number)
+            except Exception as e:
+                result = {'error': str(e)}
+            if isinstance(result, bool):
+                store_result(number, result)
+
+        registered, message, error = None, '', ''
+        if isinstance(result, dict) and 'error' in result:
+            error = result['error']
+        elif isinstance(result, bool):
+            registered = result
+            message = 'REGISTERED on WhatsApp' if result else 'NOT REGISTERED on WhatsApp'
+        else:
+            error = 'Unexpected result format'
+
+        checked_at = time.time()
+        with connect(db_path) as conn:
+            # Rows checked in the meantime (by a worker that was presumed
+            # dead) are neither overwritten nor counted twice
+            updated = conn.executemany(
+                'UPDATE job_results SET registered = ?, message = ?, error = ?, checked_at = ?'
+                ' WHERE id = ? AND checked_at IS NULL',
+                [(registered, message, error, checked_at, pending[i]['id']) for i in indexes],
+            ).rowcount
+            conn.execute(
+                'UPDATE jobs SET heartbeat = ?, progress = progress + ? WHERE id = ?',
+                (time.time(), updated, job_id),
+            )
+
+        if delay and live:
+            time.sleep(delay)
+
+    with connect(db_path) as conn:
+        conn.execute("UPDATE jobs SET status = 'done', finished_at = ? WHERE id = ?", (time.time(), job_id))
+    print(f"[WORKER] Job {job_id} finished")
+
+
+def run_worker(check_number: Callable, poll_interval: float = 2.0, once: bool = False,
+               db_path: Optional[str] = None) -> None:
+    """Claim and run jobs until interrupted (or until the queue is empty with ``once``)."""
+    worker = worker_name()
+    print(f"[WORKER] Check worker {worker} started, queue: {db_path or config.JOB_DB}")
+    while True:
+        job_id = claim_job(worker, db_path)
+        if job_id is None:
+            if once:
+                return
+            time.sleep(poll_interval)
+            continue
+        try:
+            run_job(job_id, check_number, db_path=db_path)
+        except Exception as e:
+            # Left as 'running'; resumed once its heartbeat goes stale
+            print(f"[WORKER] Job {job_id} interrupted: {e}")
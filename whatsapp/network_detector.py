@@ -0,0 +1,221 @@
+"""
+Verdict detection from the lookup traffic of the local WhatsApp Web stand-in.
+
+The DOM detector (whatsapp.readiness) has to wait until the page has
+rendered the "not on WhatsApp" alert or the compose box. whatsapp.stub_server
+answers its lookups with plain JSON, so against the stub this backend
+reads Chrome's performance log (CDP ``Network.*`` events) and decides as
+soon as a lookup response matches a signal. The DOM probe keeps running
+in the same loop.
+
+It is a stub/CI tool, not a production path: the live service sends
+end-to-end encrypted binary frames that never match, so there it would
+only add a performance-log read to every poll. :func:`network_detection_enabled`
+ignores ``WHATSAPP_DETECTOR=network`` while ``config.BASE_URL`` is the
+live service.
+
+The browser has to be started with :func:`enable_network_log`.
+"""
+import json
+import re
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from whatsapp import config
+from whatsapp.readiness import COMPOSE_SIGNALS, TIMEOUT, probe, transient_errors
+
+# Patterns searched in lookup responses and websocket frames, in priority
+# order. They match the plain JSON answers of whatsapp.stub_server; the
+# live service's encrypted frames never match.
+NETWORK_SIGNALS = {
+    'not_registered': [
+        r'"(?:exists|registered|on_whatsapp)"\s*:\s*false',
+        r'"status"\s*:\s*"not_registered"',
+    ],
+    'registered': [
+        r'"(?:exists|registered|on_whatsapp)"\s*:\s*true',
+        r'"status"\s*:\s*"registered"',
+    ],
+}
+
+# Only XHR/fetch responses to URLs like these have their body fetched
+LOOKUP_URL_PATTERN = re.compile(r'/(?:lookup|query|exists|contacts?)\b', re.IGNORECASE)
+
+LOOKUP_RESOURCE_TYPES = ('XHR', 'Fetch')
+
+# The live service, whose traffic this detector cannot read
+LIVE_BASE_URL = 'https://web.whatsapp.com'
+
+_ignored_warned = False
+
+
+def network_detection_enabled() -> bool:
+    """
+    Whether browsers should record and be checked through their network traffic.
+
+    True when ``config.DETECTOR`` is 'network' and ``config.BASE_URL`` points
+    somewhere other than the live service, e.g. at whatsapp.stub_server.
+    """
+    global _ignored_warned
+    if config.DETECTOR != 'network':
+        return False
+    if config.BASE_URL == LIVE_BASE_URL:
+        if not _ignored_warned:
+            _ignored_warned = True
+            print("[WARNING] WHATSAPP_DETECTOR=network only works against the stub server, using the DOM detector")
+        return False
+    return True
+
+
+def enable_network_log(options) -> None:
+    """
+    Ask chromedriver to record CDP network events in the performance log.
+
+    Args:
+        options: Selenium ChromeOptions, before the driver is created
+    """
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+
+
+def _read_events(driver) -> Iterator[Tuple[str, dict]]:
+    """Yield (method, params) of every CDP event logged since the last read."""
+    for entry in driver.get_log('performance'):
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+        yield message.get('method', ''), message.get('params', {})
+
+
+def clear_network_log(driver) -> bool:
+    """
+    Drop the events logged so far, typically right before a navigation.
+
+    Returns:
+        bool: False when the browser was started without :func:`enable_network_log`
+    """
+    if getattr(driver, '_network_log', True) is False:
+        return False
+    try:
+        driver.get_log('performance')
+    except Exception:
+        # Not enabled for this browser; stay on the DOM probe from now on
+        driver._network_log = False
+        return False
+    driver._network_log = True
+    return True
+
+
+def match_traffic(text: str, signals: Optional[Dict[str, List[str]]] = None) -> Optional[Tuple[str, str]]:
+    """
+    Classify one response body or frame payload.
+
+    Returns:
+        Optional[Tuple[str, str]]: (signal, matching pattern), or None
+    """
+    for signal, patterns in (signals or NETWORK_SIGNALS).items():
+        for pattern in patterns:
+            if re.search(pattern, text):
+                return signal, pattern
+    return None
+
+
+def scan_network(driver, signals: Optional[Dict[str, List[str]]] = None,
+                 lookups: Optional[set] = None) -> Optional[dict]:
+    """
+    Look through the newly logged network events for a verdict.
+
+    Args:
+        driver: WebDriver started with :func:`enable_network_log`
+        signals (Optional[Dict[str, List[str]]]): Signal name -> regexes,
+            defaults to NETWORK_SIGNALS
+        lookups (Optional[set]): Request ids of lookup responses whose body
+            has not arrived yet; carried over between calls
+
+    Returns:
+        Optional[dict]: ``signal``, ``selector`` (the pattern) and ``event``, or None
+    """
+    lookups = set() if lookups is None else lookups
+    for method, params in _read_events(driver):
+        text = None
+        if method == 'Network.webSocketFrameReceived':
+            text = params.get('response', {}).get('payloadData', '')
+        elif method == 'Network.responseReceived':
+            url = params.get('response', {}).get('url', '')
+            if params.get('type') in LOOKUP_RESOURCE_TYPES and LOOKUP_URL_PATTERN.search(url):
+                lookups.add(params.get('requestId'))
+        elif method == 'Network.loadingFinished' and params.get('requestId') in lookups:
+            lookups.discard(params['requestId'])
+            try:
+                text = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})['body']
+            except Exception:
+                continue
+
+        if text:
+            hit = match_traffic(text, signals)
+            if hit:
+                return {'signal': hit[0], 'selector': hit[1], 'event': method}
+    return None
+
+
+def wait_for_network_outcome(driver, signals: Optional[Dict[str, List[str]]] = None,
+                             timeout: float = 10, poll: float = 0.05,
+                             network_signals: Optional[Dict[str, List[str]]] = None) -> dict:
+    """
+    Wait for a verdict from the lookup traffic or, failing that, the DOM.
+
+    Drop-in replacement for :func:`whatsapp.readiness.wait_for_outcome`;
+    call :func:`clear_network_log` before the navigation so traffic of the
+    previous number is not read as this one's answer.
+
+    Args:
+        driver: Selenium WebDriver on the page being checked
+        signals (Optional[Dict[str, List[str]]]): DOM signals, defaults to COMPOSE_SIGNALS
+        timeout (float): Overall deadline in seconds
+        poll (float): Seconds between polls
+        network_signals (Optional[Dict[str, List[str]]]): Defaults to NETWORK_SIGNALS
+
+    Returns:
+        dict: Same keys as ``wait_for_outcome`` plus ``source`` ('network' or 'dom')
+    """
+    signals = signals or COMPOSE_SIGNALS
+    transient = transient_errors()
+    network = getattr(driver, '_network_log', None) is not False
+    lookups = set()
+    started = time.time()
+    deadline = started + timeout
+
+    while True:
+        hit, source = None, 'network'
+        if network:
+            try:
+                hit = scan_network(driver, network_signals, lookups)
+            except Exception:
+                driver._network_log = network = False
+            # Verdicts only; login_required and the like come from the DOM
+            if hit and hit['signal'] not in signals:
+                hit = None
+        if hit is None:
+            try:
+                hit, source = probe(driver, signals), 'dom'
+            except transient:
+                # The page changed under the probe, the next poll sees the new one
+                hit = None
+        if hit:
+            return {
+                'signal': hit['signal'],
+                'selector': hit['selector'],
+                'elapsed': round(time.time() - started, 3),
+                'page_elapsed': hit.get('elapsed'),
+                'source': source,
+            }
+        if time.time() >= deadline:
+            return {
+                'signal': TIMEOUT,
+                'selector': None,
+                'elapsed': round(time.time() - started, 3),
+                'page_elapsed': None,
+                'source': None,
+            }
+        time.sleep(poll)
@@ -0,0 +1,193 @@
+"""
+Per-worker copies of the logged-in Chrome profiles.
+
+Chrome locks its user-data-dir, so parallel browsers cannot share the
+profile created by setup_login.py. These helpers stamp out one light copy
+per worker that carries only the stores WhatsApp Web needs to restore the
+session, and skips the caches that make up most of a profile's size.
+
+A copy is still the same linked device, and WhatsApp Web keeps one
+browser per linked device active: a second copy running at the same time
+takes the session over ("Use here") from the first. Parallel workers
+therefore each need a profile linked separately (:func:`linked_profiles`),
+and at most one clone of each runs at a time.
+
+Clones live in a directory of their own per process (the job worker and
+the batch scripts each make their own), which is removed when the
+process exits.
+"""
+import atexit
+import os
+import re
+import shutil
+import tempfile
+from typing import List, Optional
+
+from whatsapp import config
+
+# Top-level files of the user-data-dir that a profile needs to open
+USER_DATA_FILES = ['Local State']
+
+# Session stores inside the profile directory (IndexedDB holds the
+# WhatsApp Web keys, Local Storage its login flags)
+PROFILE_ENTRIES = [
+    'IndexedDB',
+    'Local Storage',
+    'Session Storage',
+    'Service Worker',
+    'Network',
+    'Cookies',
+    'Cookies-journal',
+    'Preferences',
+    'Secure Preferences',
+]
+
+# Regenerated by Chrome on demand and never worth copying
+SKIPPED_DIRS = {'Cache', 'Code Cache', 'CacheStorage', 'GPUCache', 'DawnCache', 'ScriptCache'}
+
+
+def _link_or_copy(src: str, dst: str) -> str:
+    """
+    Hardlink LevelDB table files, copy everything else.
+
+    ``.ldb`` tables are immutable once written (LevelDB only creates and
+    deletes them), so sharing them between the template and its clones is
+    safe. Logs, manifests and SQLite files are modified in place and must
+    be real copies.
+    """
+    if src.endswith('.ldb'):
+        try:
+            os.link(src, dst)
+            return dst
+        except OSError:
+            pass
+    return shutil.copy2(src, dst)
+
+
+def clone_profile(template_dir: str, dest_dir: str, profile_name: Optional[str] = None) -> str:
+    """
+    Create a fresh clone of a logged-in Chrome user-data-dir.
+
+    Args:
+        template_dir (str): User-data-dir that holds the WhatsApp login
+        dest_dir (str): Directory to (re)create for the clone
+        profile_name (Optional[str]): Profile directory inside it, defaults to
+            ``config.CHROME_PROFILE_NAME``
+
+    Returns:
+        str: ``dest_dir``, ready to pass as ``--user-data-dir``
+    """
+    profile_name = profile_name or config.CHROME_PROFILE_NAME
+    src_profile = os.path.join(template_dir, profile_name)
+    if not os.path.isdir(src_profile):
+        raise FileNotFoundError(f'No "{profile_name}" profile in {template_dir}, run setup_login.py first')
+
+    if os.path.exists(dest_dir):
+        shutil.rmtree(dest_dir)
+    dst_profile = os.path.join(dest_dir, profile_name)
+    os.makedirs(dst_profile)
+
+    for name in USER_DATA_FILES:
+        src = os.path.join(template_dir, name)
+        if os.path.isfile(src):
+            shutil.copy2(src, os.path.join(dest_dir, name))
+
+    for name in PROFILE_ENTRIES:
+        src = os.path.join(src_profile, name)
+        dst = os.path.join(dst_profile, name)
+        if os.path.isdir(src):
+            shutil.copytree(src, dst, copy_function=_link_or_copy,
+                            ignore=lambda _dir, names: [n for n in names if n in SKIPPED_DIRS])
+        elif os.path.isfile(src):
+            shutil.copy2(src, dst)
+
+    return dest_dir
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists but belongs to someone else
+        return True
+    return True
+
+
+def _prune_stale_clones(base_dir: str) -> None:
+    """Remove clone directories left behind by processes that were killed before their atexit ran"""
+    try:
+        names = os.listdir(base_dir)
+    except OSError:
+        return
+    for name in names:
+        match = re.match(r'worker-(\d+)-', name)
+        if match and int(match.group(1)) != os.getpid() and not _process_alive(int(match.group(1))):
+            shutil.rmtree(os.path.join(base_dir, name), ignore_errors=True)
+
+
+def linked_profiles() -> List[str]:
+    """
+    Logged-in user-data-dirs that are linked devices of their own.
+
+    ``config.CHROME_PROFILE_DIR`` followed by ``config.LINKED_PROFILES``; its
+    length is how many browsers may check numbers at the same time.
+    """
+    profiles = [config.CHROME_PROFILE_DIR]
+    for path in config.LINKED_PROFILES:
+        if path not in profiles:
+            profiles.append(path)
+    return profiles
+
+
+def clone_worker_profiles(count: int, template_dirs: Optional[List[str]] = None,
+                          base_dir: Optional[str] = None) -> List[str]:
+    """
+    Prepare one private user-data-dir per parallel worker.
+
+    Worker ``i`` gets a clone of ``template_dirs[i]``: every worker runs on a
+    linked device of its own, because two browsers on one linked device take
+    the session from each other. Asking for more workers than there are
+    linked profiles raises instead of handing out a second copy of one.
+
+    The clones go into a new ``worker-<pid>-*`` directory under ``base_dir``,
+    so processes never re-clone over (and delete) profiles that another
+    process' Chromes are running on. It is removed when this process exits,
+    or earlier with :func:`remove_worker_profiles`.
+
+    Args:
+        count (int): Number of workers
+        template_dirs (Optional[List[str]]): Separately linked profiles, defaults
+            to :func:`linked_profiles`
+        base_dir (Optional[str]): Where the clones are created, defaults to ``config.PROFILE_CLONE_DIR``
+
+    Returns:
+        List[str]: ``count`` user-data-dir paths
+
+    Raises:
+        ValueError: If ``count`` exceeds the number of linked profiles
+    """
+    template_dirs = template_dirs or linked_profiles()
+    if count > len(template_dirs):
+        raise ValueError(f'{count} parallel browsers need {count} separately linked profiles, '
+                         f'{len(template_dirs)} configured (WHATSAPP_LINKED_PROFILES)')
+    base_dir = base_dir or config.PROFILE_CLONE_DIR
+    os.makedirs(base_dir, exist_ok=True)
+    _prune_stale_clones(base_dir)
+
+    run_dir = tempfile.mkdtemp(prefix=f'worker-{os.getpid()}-', dir=base_dir)
+    atexit.register(shutil.rmtree, run_dir, ignore_errors=True)
+    try:
+        clones = [clone_profile(template_dirs[i], os.path.join(run_dir, f'worker-{i}')) for i in range(count)]
+    except Exception:
+        shutil.rmtree(run_dir, ignore_errors=True)
+        raise
+    print(f"[INFO] Prepared {len(clones)} worker profile(s) in {run_dir}")
+    return clones
+
+
+def remove_worker_profiles(clones: List[str]) -> None:
+    """Delete clones made by :func:`clone_worker_profiles` once their browsers have quit"""
+    for run_dir in {os.path.dirname(os.path.abspath(clone)) for clone in clones}:
+        shutil.rmtree(run_dir, ignore_errors=True)
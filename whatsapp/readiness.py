@@ -0,0 +1,289 @@
+"""
+Event-driven readiness detection for WhatsApp Web pages.
+
+Instead of sleeping for a fixed worst-case time after a navigation, the
+checkers wait on every outcome signal at once and return as soon as the
+first one shows up, bounded by a single overall deadline.
+"""
+import time
+from typing import Dict, List, Optional
+
+from whatsapp import config
+
+# Outcome signals for the /send?phone= compose URL, in priority order.
+# Selectors starting with "//" are XPath, everything else is CSS.
+COMPOSE_SIGNALS = {
+    'not_registered': [
+        '[data-testid="alert-phone-number-not-on-whatsapp"]',
+        '[data-testid="invalid-phone-number"]',
+        "//*[contains(text(), 'Phone number shared via url is invalid')]",
+        "//*[contains(text(), 'not on WhatsApp')]",
+    ],
+    'registered': [
+        '[data-testid="conversation-compose-box-input"]',
+        '[data-testid="compose-box-input"]',
+        'footer[data-testid="compose"]',
+        'div[contenteditable="true"][data-tab="10"]',
+        '#main footer [contenteditable="true"]',
+        '[data-testid="conversation-header"]',
+    ],
+    'login_required': [
+        '[data-testid="qr-code"]',
+        'canvas[aria-label="Scan me!"]',
+        'div[data-ref]',
+    ],
+}
+
+# Outcome signals for the New chat -> New contact phone input
+NEW_CONTACT_SIGNALS = {
+    'not_registered': [
+        "//*[contains(text(), 'Phone number shared via url is invalid')]",
+        "//*[contains(text(), 'not registered')]",
+        "//*[contains(text(), 'invalid')]",
+    ],
+    'registered': [
+        '[data-testid="forward-btn"]:not([disabled])',
+    ],
+}
+
+# "WhatsApp is open in another window" screen. WhatsApp Web keeps one
+# active tab per session, so a tab that finished loading behind another
+# one has to take the session over before it shows its own verdict.
+TAKEOVER_SIGNALS = {
+    'takeover': [
+        "//*[@role='button' or self::button][contains(., 'Use here')]",
+        "//*[@role='button' or self::button][contains(., 'Use Here')]",
+    ],
+}
+
+TIMEOUT = 'timeout'
+
+PAGE_LOAD_STRATEGIES = ('normal', 'eager', 'none')
+
+# Set on the outgoing document before a navigation. The next document
+# starts with a fresh window, so a probe that still sees the flag is
+# looking at the previous page and must not report its signals.
+MARK_STALE_SCRIPT = 'window.__whatsappCheckerStale = true;'
+
+# Entries starting with this are case-insensitive phrases searched in the
+# page text, e.g. "text:not on whatsapp" (see :func:`phrases`)
+PHRASE_PREFIX = 'text:'
+
+# Evaluates every selector and phrase of every signal in a single browser
+# round trip and returns the first match, so one poll costs one WebDriver
+# command and a few bytes instead of a page_source dump. ``elapsed`` is
+# the page's own clock: seconds since its navigation started.
+# Matches inside an element flagged data-checker-stale (left over from the
+# previous number after an in-app navigation, see whatsapp.spa) are skipped,
+# and so is the source of <script>/<style> elements: an XPath text() test
+# or textContent would otherwise match the verdict strings in the app's
+# own code on every page.
+PROBE_SCRIPT = """
+if (window.__whatsappCheckerStale) {
+    return null;
+}
+var CODE = 'script,style,noscript,template';
+var fresh = function (node) {
+    var element = node.nodeType === 1 ? node : node.parentElement;
+    return !element || !(element.closest('[data-checker-stale]') || element.closest(CODE));
+};
+var textOf = function (root) {
+    var parts = [];
+    var walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT, {
+        acceptNode: function (node) {
+            return node.nodeType === 1 && node.matches(CODE) ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT;
+        }
+    });
+    for (var node = walker.nextNode(); node; node = walker.nextNode()) {
+        if (node.nodeType === 3) {
+            parts.push(node.nodeValue);
+        }
+    }
+    return parts.join('').toLowerCase();
+};
+var count = function (text, phrase) {
+    var n = 0, at = text.indexOf(phrase);
+    while (at !== -1) {
+        n++;
+        at = text.indexOf(phrase, at + phrase.length);
+    }
+    return n;
+};
+var pageText = null, staleText = null;
+var freshPhrase = function (phrase) {
+    if (pageText === null) {
+        pageText = document.body ? textOf(document.body) : '';
+        staleText = [];
+        var stale = document.querySelectorAll('[data-checker-stale]');
+        for (var s = 0; s < stale.length; s++) {
+            staleText.push(textOf(stale[s]));
+        }
+    }
+    var total = count(pageText, phrase);
+    for (var s = 0; s < staleText.length && total > 0; s++) {
+        total -= count(staleText[s], phrase);
+    }
+    return total > 0;
+};
+var groups = arguments[0], prefix = arguments[1];
+for (var i = 0; i < groups.length; i++) {
+    var selectors = groups[i][1];
+    for (var j = 0; j < selectors.length; j++) {
+        var selector = selectors[j], hit = null;
+        try {
+            if (selector.indexOf(prefix) === 0) {
+                hit = freshPhrase(selector.slice(prefix.length).toLowerCase());
+            } else if (selector.indexOf('//') === 0) {
+                var found = document.evaluate(selector, document, null,
+                    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                for (var k = 0; k < found.snapshotLength && !hit; k++) {
+                    if (fresh(found.snapshotItem(k))) {
+                        hit = found.snapshotItem(k);
+                    }
+                }
+            } else {
+                var nodes = document.querySelectorAll(selector);
+                for (var k = 0; k < nodes.length && !hit; k++) {
+                    if (fresh(nodes[k])) {
+                        hit = nodes[k];
+                    }
+                }
+            }
+        } catch (e) {}
+        if (hit) {
+            return {
+                signal: groups[i][0],
+                selector: selector,
+                elapsed: Math.round(performance.now()) / 1000
+            };
+        }
+    }
+}
+return null;
+"""
+
+
+def phrases(*texts: str) -> List[str]:
+    """Turn plain phrases into probe entries, e.g. ``phrases('invalid phone')``."""
+    return [PHRASE_PREFIX + text for text in texts]
+
+
+def set_page_load_strategy(options, strategy: Optional[str] = None):
+    """
+    Make ``driver.get`` return early instead of waiting for the ``load`` event.
+
+    With 'eager' navigation returns at DOMContentLoaded and with 'none' as
+    soon as the request is sent; :func:`wait_for_outcome` then takes over
+    and decides from the DOM as it renders.
+
+    Args:
+        options: Selenium ChromeOptions of the driver being created
+        strategy (Optional[str]): 'normal', 'eager' or 'none', defaults to
+            ``config.PAGE_LOAD_STRATEGY``
+
+    Returns:
+        The same options object
+    """
+    strategy = strategy or config.PAGE_LOAD_STRATEGY
+    if strategy not in PAGE_LOAD_STRATEGIES:
+        raise ValueError(f'Unknown page load strategy {strategy!r}, use one of {PAGE_LOAD_STRATEGIES}')
+    options.page_load_strategy = strategy
+    return options
+
+
+def navigate(driver, url: str) -> None:
+    """
+    Open ``url`` so that no signal of the previous page can leak into the next probe.
+
+    Needed with the 'eager' and 'none' page load strategies, where
+    ``driver.get`` can return while the old document is still displayed.
+    """
+    try:
+        driver.execute_script(MARK_STALE_SCRIPT)
+    except Exception:
+        # No document to mark yet (fresh browser, crashed tab)
+        pass
+    driver.get(url)
+
+
+def transient_errors() -> tuple:
+    """
+    WebDriver errors a probe can hit while the page under it is re-rendering.
+
+    A navigation or a re-render between two probes destroys the script's
+    document (JavascriptException) or the element it looked at (stale or
+    missing element); the next poll sees the new page and decides.
+    """
+    from selenium.common.exceptions import (
+        JavascriptException, NoSuchElementException, StaleElementReferenceException,
+    )
+
+    return JavascriptException, StaleElementReferenceException, NoSuchElementException
+
+
+def signal_groups(signals: Optional[Dict[str, List[str]]]) -> list:
+    """Signal table -> the ``[[name, selectors], ...]`` argument PROBE_SCRIPT takes, defaults to COMPOSE_SIGNALS"""
+    return [[name, list(selectors)] for name, selectors in (signals or COMPOSE_SIGNALS).items()]
+
+
+def probe(driver, signals: Optional[Dict[str, List[str]]] = None) -> Optional[dict]:
+    """
+    Check all positive and negative selectors and phrases once, in one round trip.
+
+    Use this instead of scanning ``driver.page_source``, which serializes
+    the whole WhatsApp DOM over the WebDriver connection.
+
+    Args:
+        driver: Selenium WebDriver on the page being checked
+        signals (Optional[Dict[str, List[str]]]): Signal name -> CSS/XPath
+            selectors or :func:`phrases`, in priority order. Defaults to
+            COMPOSE_SIGNALS.
+
+    Returns:
+        Optional[dict]: ``signal``, ``selector`` (or phrase entry) of the first
+            match and ``elapsed`` seconds since the page started loading, or None
+    """
+    return driver.execute_script(PROBE_SCRIPT, signal_groups(signals), PHRASE_PREFIX)
+
+
+def wait_for_outcome(driver, signals: Optional[Dict[str, List[str]]] = None,
+                     timeout: float = 10, poll: float = 0.1) -> dict:
+    """
+    Wait until any outcome signal appears on the current page.
+
+    All signals are raced inside one wait with one deadline, so the fastest
+    outcome decides instead of the slowest timeout. Each poll is a single
+    ``execute_script`` call, see :func:`probe`; a poll that fails because
+    the page changed under it (:func:`transient_errors`) is retried.
+
+    Args:
+        driver: Selenium WebDriver on the page being checked
+        signals (Optional[Dict[str, List[str]]]): Signal name -> selectors
+            or phrases, in priority order. Defaults to COMPOSE_SIGNALS.
+        timeout (float): Overall deadline in seconds
+        poll (float): Seconds between polls
+
+    Returns:
+        dict: ``signal`` (name or 'timeout'), ``selector``, ``elapsed`` seconds
+            spent waiting and ``page_elapsed`` (page clock at the match, see :func:`probe`)
+    """
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException
+
+    groups = signal_groups(signals)
+    started = time.time()
+
+    try:
+        hit = WebDriverWait(driver, timeout, poll_frequency=poll,
+                            ignored_exceptions=transient_errors()).until(
+            lambda d: d.execute_script(PROBE_SCRIPT, groups, PHRASE_PREFIX)
+        )
+    except TimeoutException:
+        hit = {'signal': TIMEOUT, 'selector': None, 'elapsed': None}
+
+    return {
+        'signal': hit['signal'],
+        'selector': hit['selector'],
+        'elapsed': round(time.time() - started, 3),
+        'page_elapsed': hit['elapsed'],
+    }
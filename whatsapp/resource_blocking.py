@@ -0,0 +1,88 @@
+"""
+Lighter WhatsApp Web page loads through CDP request blocking.
+
+A verdict only needs the app's scripts, styles and lookup traffic; chat
+avatars, media thumbnails, emoji sprites and web fonts are downloaded and
+decoded for nothing. Chrome has no command-line switch that drops them
+(``--disable-images`` and friends are not real switches), so the browser
+is told through the DevTools protocol to fail those requests instead.
+"""
+from typing import List, Optional
+
+from whatsapp import config
+
+# Network.setBlockedURLs patterns ("*" matches any run of characters)
+BLOCKED_URL_PATTERNS = [
+    # Images and emoji sprites
+    '*.png', '*.png?*', '*.jpg', '*.jpg?*', '*.jpeg', '*.jpeg?*',
+    '*.gif', '*.gif?*', '*.webp', '*.webp?*', '*.ico', '*.ico?*',
+    '*/emoji/*',
+    # Profile pictures and media
+    '*pps.whatsapp.net/*',
+    '*mmg.whatsapp.net/*',
+    '*.cdn.whatsapp.net/*',
+    '*.mp4', '*.webm', '*.ogg', '*.opus', '*.mp3',
+    # Fonts
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+]
+
+# Transfer size of everything the current document loaded since the last
+# call; clearing the buffer makes the next call report only new requests
+TRAFFIC_SCRIPT = """
+var entries = performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'));
+var seen = window.__whatsappCheckerTraffic || 0;
+var total = 0, count = 0;
+for (var i = 0; i < entries.length; i++) {
+    if (seen && entries[i].entryType === 'navigation') {
+        continue;
+    }
+    total += entries[i].transferSize || 0;
+    count++;
+}
+window.__whatsappCheckerTraffic = 1;
+performance.clearResourceTimings();
+performance.setResourceTimingBufferSize(5000);
+return {requests: count, bytes: total};
+"""
+
+
+def block_resources(driver, patterns: Optional[List[str]] = None) -> bool:
+    """
+    Make the browser fail requests for images, media, avatars and fonts.
+
+    The block list belongs to the browser tab and survives navigations, so
+    this is called once right after the driver is created.
+
+    Args:
+        driver: Chrome WebDriver
+        patterns (Optional[List[str]]): Defaults to BLOCKED_URL_PATTERNS
+
+    Returns:
+        bool: False if the browser does not speak CDP (e.g. a remote non-Chrome driver)
+    """
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns or BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"[WARNING] Resource blocking not available: {e}")
+        return False
+    return True
+
+
+def apply_resource_blocking(driver) -> bool:
+    """:func:`block_resources` if ``config.BLOCK_RESOURCES`` is on."""
+    return config.BLOCK_RESOURCES and block_resources(driver)
+
+
+def page_traffic(driver) -> Optional[dict]:
+    """
+    Bytes the page transferred since the previous call (or since it loaded).
+
+    Returns:
+        Optional[dict]: ``requests`` and ``bytes``, or None if the page could not be asked
+    """
+    try:
+        return driver.execute_script(TRAFFIC_SCRIPT)
+    except Exception:
+        return None
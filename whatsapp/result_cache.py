@@ -0,0 +1,209 @@
+"""
+Cache of registration results keyed on the normalized E.164 number.
+
+Customer lists repeat numbers a lot, and every check costs a browser
+navigation, so the checkers look here first. Results live in SQLite so
+they survive restarts and are shared by the web and worker processes; a
+small in-memory LRU in front of it answers hot numbers without touching
+the disk. Registered, not-registered and error results expire after
+their own TTL (``config.CACHE_*_TTL``).
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from whatsapp import config
+from whatsapp.utils import validate_phone_number
+
+REGISTERED = 'registered'
+NOT_REGISTERED = 'not_registered'
+ERROR = 'error'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    number TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    error TEXT NOT NULL DEFAULT '',
+    checked_at REAL NOT NULL
+);
+"""
+
+
+class ResultCache:
+    """Two-tier (memory LRU + SQLite) store of registration results."""
+
+    def __init__(self, db_path: Optional[str] = None, positive_ttl: Optional[int] = None,
+                 negative_ttl: Optional[int] = None, error_ttl: Optional[int] = None,
+                 memory_size: Optional[int] = None):
+        """
+        Args:
+            db_path (Optional[str]): SQLite file, defaults to ``config.CACHE_DB``
+            positive_ttl (Optional[int]): Seconds a registered result stays valid
+            negative_ttl (Optional[int]): Seconds a not-registered result stays valid
+            error_ttl (Optional[int]): Seconds an error is reused before retrying
+            memory_size (Optional[int]): Entries kept in the in-memory LRU
+        """
+        self.db_path = db_path or config.CACHE_DB
+        self.ttls = {
+            REGISTERED: config.CACHE_POSITIVE_TTL if positive_ttl is None else positive_ttl,
+            NOT_REGISTERED: config.CACHE_NEGATIVE_TTL if negative_ttl is None else negative_ttl,
+            ERROR: config.CACHE_ERROR_TTL if error_ttl is None else error_ttl,
+        }
+        self.memory_size = config.CACHE_MEMORY_SIZE if memory_size is None else memory_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def key(number: str) -> Optional[str]:
+        """E.164 form of ``number``, or None if it cannot be a phone number."""
+        return validate_phone_number(str(number))
+
+    def _remember(self, key: str, entry: dict) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _fresh(self, entry: dict) -> bool:
+        return time.time() - entry['checked_at'] < self.ttls[entry['status']]
+
+    def get(self, number: str) -> Optional[dict]:
+        """
+        Look up a number.
+
+        Returns:
+            Optional[dict]: ``status``, ``error`` and ``checked_at`` of a result
+            that has not expired yet, or None
+        """
+        key = self.key(number)
+        if key is None:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+
+        if entry is None:
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT status, error, checked_at FROM results WHERE number = ?', (key,)
+                ).fetchone()
+            if row is not None:
+                entry = {'status': row[0], 'error': row[1], 'checked_at': row[2]}
+                self._remember(key, entry)
+
+        if entry is None or not self._fresh(entry):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def set(self, number: str, registered: Optional[bool] = None, error: str = '') -> None:
+        """Store the outcome of a check; pass ``error`` for a failed check."""
+        key = self.key(number)
+        if key is None:
+            return
+
+        status = ERROR if error else (REGISTERED if registered else NOT_REGISTERED)
+        entry = {'status': status, 'error': error or '', 'checked_at': time.time()}
+        self._remember(key, entry)
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO results (number, status, error, checked_at) VALUES (?, ?, ?, ?)',
+                (key, entry['status'], entry['error'], entry['checked_at']),
+            )
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from disk; returns how many were removed."""
+        now = time.time()
+        with self._connect() as conn:
+            removed = 0
+            for status, ttl in self.ttls.items():
+                removed += conn.execute(
+                    'DELETE FROM results WHERE status = ? AND checked_at < ?', (status, now - ttl)
+                ).rowcount
+        with self._lock:
+            self._memory = OrderedDict((k, e) for k, e in self._memory.items() if self._fresh(e))
+        return removed
+
+    def stats(self) -> dict:
+        """Counters for status endpoints."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'memory_entries': len(self._memory)}
+
+
+def lookup_result(number: str, cache: Optional[ResultCache] = None):
+    """
+    Cached result for a number, in the shape the checkers return.
+
+    Returns:
+        True/False, ``{'error': ...}``, or None on a cache miss
+    """
+    cache = cache or get_cache()
+    entry = cache.get(number)
+    if entry is None:
+        return None
+    print(f"[CACHE] {number}: {entry['status']} (checked {int(time.time() - entry['checked_at'])}s ago)")
+    if entry['status'] == ERROR:
+        return {'error': entry['error']}
+    return entry['status'] == REGISTERED
+
+
+def store_result(number: str, result, cache: Optional[ResultCache] = None) -> None:
+    """Remember a checker result (True/False or a dict with an ``error`` key)."""
+    cache = cache or get_cache()
+    if isinstance(result, bool):
+        cache.set(number, registered=result)
+    elif isinstance(result, dict) and 'error' in result:
+        cache.set(number, error=result['error'] or 'Unknown error')
+
+
+def cached_check(number: str, check_number: Callable, cache: Optional[ResultCache] = None):
+    """
+    Answer from the cache, or run ``check_number`` and remember its result.
+
+    Args:
+        number (str): Number as entered by the user
+        check_number (Callable): number -> bool, or a dict with an ``error`` key
+        cache (Optional[ResultCache]): Defaults to the process-wide cache
+
+    Returns:
+        The cached or fresh result, in the same shape ``check_number`` returns
+    """
+    cache = cache or get_cache()
+    result = lookup_result(number, cache)
+    if result is not None:
+        return result
+
+    try:
+        result = check_number(number)
+    except Exception as e:
+        store_result(number, {'error': str(e)}, cache)
+        raise
+    store_result(number, result, cache)
+    return result
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ResultCache:
+    """Return the process-wide result cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache()
+        return _cache
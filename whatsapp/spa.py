@@ -0,0 +1,148 @@
+"""
+In-app navigation between numbers.
+
+A full ``driver.get`` of the compose URL reboots WhatsApp Web: bundle,
+IndexedDB decryption and websocket handshake, every time. When the app is
+already running, :func:`open_compose` asks it to route to the next chat
+itself and only falls back to a full reload when that does not produce a
+verdict.
+"""
+import time
+from typing import Dict, List, Optional
+
+from whatsapp import config
+from whatsapp.network_detector import clear_network_log, network_detection_enabled, wait_for_network_outcome
+from whatsapp.readiness import COMPOSE_SIGNALS, navigate, wait_for_outcome
+
+COMPOSE_URL = config.BASE_URL + '/send?phone={number}'
+
+# Present once the app has finished booting; in-app routing needs it
+APP_READY_SELECTOR = '[data-testid="chat-list"], #side'
+
+# After this many in-app attempts in a row without a verdict the browser
+# stops trying and reloads directly, and after this many direct reloads it
+# gives in-app navigation one more try (a success resumes it for good)
+MAX_SPA_FAILURES = 3
+SPA_RETRY_AFTER = 20
+
+# Flags what belongs to the previous number, then hands the compose URL
+# to the app: first as a click on a link (the app intercepts its own
+# links), and if nothing claimed the click, through the History API.
+SPA_OPEN_SCRIPT = """
+var url = arguments[0], route = arguments[1];
+if (!document.querySelector(arguments[2])) {
+    return null;
+}
+var old = document.querySelectorAll('#main, [role="dialog"], [data-animate-modal-popup="true"]');
+for (var i = 0; i < old.length; i++) {
+    old[i].setAttribute('data-checker-stale', '1');
+}
+
+var link = document.createElement('a');
+link.href = url;
+link.style.display = 'none';
+(document.getElementById('app') || document.body).appendChild(link);
+var claimed = true;
+var guard = function (event) {
+    if (event.target === link) {
+        claimed = event.defaultPrevented;
+        // Never let the browser itself follow the link
+        event.preventDefault();
+    }
+};
+window.addEventListener('click', guard);
+link.click();
+window.removeEventListener('click', guard);
+link.remove();
+if (claimed) {
+    return 'link';
+}
+
+history.pushState(null, '', route);
+window.dispatchEvent(new PopStateEvent('popstate', {state: null}));
+return 'history';
+"""
+
+
+def compose_url(number: str) -> str:
+    """Compose URL for a number given as digits (a leading "+" is dropped)."""
+    return COMPOSE_URL.format(number=str(number).lstrip('+'))
+
+
+def _detector(driver):
+    """The verdict wait configured by ``config.DETECTOR``, with the network log reset."""
+    if network_detection_enabled() and clear_network_log(driver):
+        return wait_for_network_outcome
+    return wait_for_outcome
+
+
+def _open_in_app(driver, number: str, signals: Dict[str, List[str]], timeout: float):
+    """
+    Returns:
+        tuple: (how the route was triggered or None if the app is not loaded,
+            outcome or None if no verdict came in time)
+    """
+    url = compose_url(number)
+    route = url[url.index('/send'):]
+    detect = _detector(driver)
+    try:
+        how = driver.execute_script(SPA_OPEN_SCRIPT, url, route, APP_READY_SELECTOR)
+    except Exception as e:
+        print(f"[WARNING] In-app navigation failed: {e}")
+        return 'error', None
+    if how is None:
+        return None, None
+
+    outcome = detect(driver, signals=signals, timeout=timeout)
+    if outcome['signal'] in ('registered', 'not_registered'):
+        outcome['navigation'] = f'spa-{how}'
+        return how, outcome
+    return how, None
+
+
+def open_compose(driver, number: str, timeout: Optional[float] = None,
+                 signals: Optional[Dict[str, List[str]]] = None,
+                 mode: Optional[str] = None) -> dict:
+    """
+    Open the compose chat for ``number`` and wait for a verdict signal.
+
+    Args:
+        driver: WebDriver, ideally already on a loaded WhatsApp Web
+        number (str): Digits, with or without a leading "+"
+        timeout (Optional[float]): Deadline of the full-reload attempt,
+            defaults to ``config.DETECT_TIMEOUT``
+        signals (Optional[Dict[str, List[str]]]): Defaults to COMPOSE_SIGNALS
+        mode (Optional[str]): 'spa' or 'reload', defaults to ``config.NAVIGATION_MODE``
+
+    Returns:
+        dict: :func:`wait_for_outcome` result plus ``navigation``
+            ('spa-link', 'spa-history' or 'reload')
+    """
+    timeout = config.DETECT_TIMEOUT if timeout is None else timeout
+    signals = signals or COMPOSE_SIGNALS
+    mode = mode or config.NAVIGATION_MODE
+    started = time.time()
+
+    failures = getattr(driver, '_spa_failures', 0)
+    if mode == 'spa' and failures >= MAX_SPA_FAILURES:
+        driver._spa_skipped = getattr(driver, '_spa_skipped', 0) + 1
+        if driver._spa_skipped > SPA_RETRY_AFTER:
+            driver._spa_skipped = 0
+            failures = MAX_SPA_FAILURES - 1
+            print(f"[INFO] Retrying in-app navigation after {SPA_RETRY_AFTER} reloads")
+    if mode == 'spa' and failures < MAX_SPA_FAILURES:
+        how, outcome = _open_in_app(driver, number, signals, min(config.SPA_TIMEOUT, timeout))
+        if outcome is not None:
+            driver._spa_failures = 0
+            outcome['elapsed'] = round(time.time() - started, 3)
+            return outcome
+        if how is not None:
+            driver._spa_failures = failures + 1
+            print(f"[INFO] No verdict from in-app navigation, reloading ({driver._spa_failures}/{MAX_SPA_FAILURES})")
+
+    detect = _detector(driver)
+    navigate(driver, compose_url(number))
+    outcome = detect(driver, signals=signals, timeout=timeout)
+    outcome['navigation'] = 'reload'
+    outcome['elapsed'] = round(time.time() - started, 3)
+    return outcome
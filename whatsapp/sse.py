@@ -0,0 +1,103 @@
+"""
+Server-sent events for batch job progress.
+
+The worker process writes results to the job database; a stream re-reads
+only the rows past its cursor every ``config.SSE_POLL_INTERVAL`` seconds
+and pushes them to the browser as they appear. Every result event carries
+the cursor as its id, so an ``EventSource`` that reconnects (after
+``config.SSE_MAX_DURATION``, or a dropped connection) resumes through the
+``Last-Event-ID`` header without losing or repeating rows.
+"""
+import json
+import time
+from typing import Callable, Iterator, Optional, Tuple
+
+from whatsapp import config
+
+# Comment line sent on idle streams so proxies do not close them
+KEEPALIVE_INTERVAL = 10
+
+
+def format_event(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    """Encode one event in the text/event-stream format."""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def resume_cursor(last_event_id: Optional[str], since: Optional[str]) -> int:
+    """Cursor to start from: the reconnect header wins over the query string."""
+    for value in (last_event_id, since):
+        try:
+            return max(0, int(value))
+        except (TypeError, ValueError):
+            continue
+    return 0
+
+
+def job_events(fetch_counters: Callable[[], Optional[dict]],
+               fetch_results: Callable[[int], Tuple[list, int]],
+               cursor: int = 0,
+               poll_interval: Optional[float] = None,
+               max_duration: Optional[float] = None) -> Iterator[str]:
+    """
+    Stream the progress of one job.
+
+    Emits ``result`` for every checked number, ``progress`` when the
+    counters change and a final ``done`` once every result was sent.
+
+    Args:
+        fetch_counters (Callable): Returns the job counters (see ``job_counters``)
+        fetch_results (Callable): cursor -> (results, next cursor) (see ``results_since``)
+        cursor (int): Position of the first result the client does not have yet
+        poll_interval (Optional[float]): Defaults to ``config.SSE_POLL_INTERVAL``
+        max_duration (Optional[float]): Defaults to ``config.SSE_MAX_DURATION``
+
+    Yields:
+        str: Encoded events
+    """
+    poll_interval = config.SSE_POLL_INTERVAL if poll_interval is None else poll_interval
+    max_duration = config.SSE_MAX_DURATION if max_duration is None else max_duration
+    deadline = time.time() + max_duration
+    last_sent = time.time()
+    last_progress = None
+
+    # Reconnect quickly when the response ends before the job does
+    yield 'retry: 1000\n\n'
+
+    while True:
+        status = fetch_counters()
+        if status is None:
+            yield format_event('error', {'error': 'Job not found'})
+            return
+
+        # Counters are read first: once they say "done", every row is checked
+        while True:
+            results, next_cursor = fetch_results(cursor)
+            for result in results:
+                cursor += 1
+                yield format_event('result', result, event_id=cursor)
+            cursor = next_cursor
+            if results:
+                last_sent = time.time()
+            else:
+                break
+
+        if status['progress'] != last_progress:
+            last_progress = status['progress']
+            last_sent = time.time()
+            yield format_event('progress', status)
+
+        if not status['running'] and cursor >= status['total']:
+            yield format_event('done', status, event_id=cursor)
+            return
+
+        if time.time() >= deadline:
+            return
+        if time.time() - last_sent >= KEEPALIVE_INTERVAL:
+            last_sent = time.time()
+            yield ': keepalive\n\n'
+        time.sleep(poll_interval)
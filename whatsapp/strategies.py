@@ -0,0 +1,286 @@
+"""
+Registry of checker strategies behind one ``check(number) -> Verdict`` call.
+
+The web apps, the workers and the management command used to import one
+checker implementation each. They now ask the registry for a strategy by
+name, per request or through ``config.CHECKER_STRATEGY``, so a faster
+implementation is rolled out by registering it and changing the setting
+instead of editing every caller.
+
+Built-in strategies are registered by import path and loaded on first use,
+because they live in different processes: 'compose-url' in the Django
+app, 'dialog' in the Flask app.py. Other modules can add their own with
+:func:`register`. 'adaptive' (whatsapp.adaptive) picks among the others
+from live statistics.
+"""
+import importlib
+import sys
+import threading
+import time
+from typing import Callable, List, Optional, Union
+
+from whatsapp import config
+from whatsapp.result_cache import ERROR, NOT_REGISTERED, REGISTERED, lookup_result, store_result
+
+
+# Verdict.strategy of an answer read from the result cache, which does not
+# record the strategy that produced it
+CACHE_STRATEGY = 'cache'
+
+
+class UnknownStrategy(ValueError):
+    """Raised for a strategy name that is not registered."""
+
+
+class Verdict:
+    """Outcome of one check, whichever strategy produced it."""
+
+    def __init__(self, number: str, status: str, strategy: str, error: str = '',
+                 seconds: Optional[float] = None, confidence: Optional[float] = None,
+                 cached: bool = False):
+        """
+        Args:
+            number (str): Number as given to the strategy
+            status (str): 'registered', 'not_registered' or 'error'
+            strategy (str): Name of the strategy that answered, ``CACHE_STRATEGY``
+                for a cached answer
+            error (str): Why no verdict could be reached, for 'error'
+            seconds (Optional[float]): Time the check took
+            confidence (Optional[float]): 0..1 for strategies that guess
+            cached (bool): Answered from the result cache
+        """
+        self.number = number
+        self.status = status
+        self.strategy = strategy
+        self.error = error
+        self.seconds = seconds
+        self.confidence = confidence
+        self.cached = cached
+
+    @property
+    def registered(self) -> Optional[bool]:
+        """True/False, or None when the check failed"""
+        if self.status == ERROR:
+            return None
+        return self.status == REGISTERED
+
+    @classmethod
+    def from_result(cls, number: str, result, strategy: str, **kwargs) -> 'Verdict':
+        """Wrap a legacy checker result: True/False or a dict with an ``error`` key."""
+        if isinstance(result, bool):
+            return cls(number, REGISTERED if result else NOT_REGISTERED, strategy, **kwargs)
+        if isinstance(result, dict) and result.get('error'):
+            return cls(number, ERROR, strategy, error=str(result['error']), **kwargs)
+        return cls(number, ERROR, strategy, error=f'Unexpected result: {result!r}', **kwargs)
+
+    def as_result(self):
+        """The legacy shape the caches and job runners store: True/False or ``{'error': ...}``"""
+        if self.status == ERROR:
+            return {'error': self.error}
+        return self.status == REGISTERED
+
+    def as_dict(self) -> dict:
+        return {
+            'number': self.number,
+            'status': self.status,
+            'registered': self.registered,
+            'error': self.error,
+            'strategy': self.strategy,
+            'seconds': self.seconds,
+            'confidence': self.confidence,
+            'cached': self.cached,
+        }
+
+    def __repr__(self):
+        return f'Verdict({self.number!r}, {self.status!r}, strategy={self.strategy!r})'
+
+
+class Strategy:
+    """One registered way of checking a number."""
+
+    def __init__(self, name: str, target: Union[str, Callable], description: str = '',
+                 cacheable: bool = True, adapt: Optional[Callable] = None, browser: bool = True):
+        """
+        Args:
+            name (str): Registry key, e.g. 'compose-url'
+            target (Union[str, Callable]): number -> result, or its import path
+                as 'module:function', imported on first use
+            description (str): One line for listings
+            cacheable (bool): Whether results go through the result cache;
+                off for strategies that do not look at WhatsApp at all
+            adapt (Optional[Callable]): (number, raw result) -> Verdict for
+                targets that do not return True/False/``{'error': ...}``
+            browser (bool): Whether the check drives a WhatsApp Web browser;
+                the Django web workers hand those to the job worker
+        """
+        self.name = name
+        self.target = target
+        self.description = description
+        self.cacheable = cacheable
+        self.adapt = adapt
+        self.browser = browser
+        self._function = target if callable(target) else None
+        self._lock = threading.Lock()
+
+    def load(self) -> Callable:
+        """
+        The check function, importing it on first use.
+
+        Raises:
+            ImportError: If the module is not importable in this process
+        """
+        with self._lock:
+            if self._function is None:
+                module_name, _, attribute = self.target.partition(':')
+                self._function = getattr(importlib.import_module(module_name), attribute)
+            return self._function
+
+    def in_process(self) -> bool:
+        """
+        Whether the check function is already at hand in this process.
+
+        False for a strategy of the other app ('dialog' in the Django app,
+        'compose-url' in app.py): loading it would import that app here,
+        with its own browser next to this one's.
+        """
+        if self._function is not None:
+            return True
+        return self.target.partition(':')[0] in sys.modules
+
+    def check(self, number: str, use_cache: bool = True, refresh: bool = False) -> Verdict:
+        """
+        Check one number; never raises, failures come back as an 'error' verdict.
+
+        Args:
+            number (str): Number as entered by the user
+            use_cache (bool): Answer from and store into the result cache
+                (only for cacheable strategies)
+            refresh (bool): Check even when the cache has an answer, then
+                store the new one
+        """
+        use_cache = use_cache and self.cacheable
+        if use_cache and not refresh:
+            cached = lookup_result(number)
+            if cached is not None:
+                return Verdict.from_result(number, cached, CACHE_STRATEGY, cached=True)
+
+        started = time.time()
+        try:
+            raw = self.load()(number)
+            if self.adapt is not None:
+                verdict = self.adapt(number, raw)
+            else:
+                verdict = Verdict.from_result(number, raw, self.name)
+        except Exception as e:
+            print(f"[WARNING] Strategy {self.name} failed for {number}: {e}")
+            verdict = Verdict(number, ERROR, self.name, error=f'{self.name}: {e}')
+        verdict.seconds = round(time.time() - started, 3)
+
+        if use_cache:
+            store_result(number, verdict.as_result())
+        return verdict
+
+    def check_number(self, number: str):
+        """Uncached check in the legacy shape, for job runners that consult the cache themselves"""
+        return self.check(number, use_cache=False).as_result()
+
+    def info(self) -> dict:
+        return {
+            'name': self.name,
+            'description': self.description,
+            'cacheable': self.cacheable,
+            'browser': self.browser,
+            'loaded': self._function is not None,
+        }
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def register(name: str, target: Union[str, Callable, Strategy], description: str = '',
+             cacheable: bool = True, adapt: Optional[Callable] = None, browser: bool = True) -> Strategy:
+    """Add (or replace) a strategy; see :class:`Strategy` for the arguments, or pass a ready one as ``target``."""
+    if isinstance(target, Strategy):
+        strategy = target
+    else:
+        strategy = Strategy(name, target, description, cacheable, adapt, browser)
+    with _registry_lock:
+        _registry[name] = strategy
+    return strategy
+
+
+def get_strategy(name: Optional[str] = None, default: Optional[str] = None) -> Strategy:
+    """
+    Pick a strategy: the requested one, else ``config.CHECKER_STRATEGY``, else ``default``.
+
+    Args:
+        name (Optional[str]): Requested per call, e.g. from the request body
+        default (Optional[str]): What the caller uses when nothing is configured
+
+    Raises:
+        UnknownStrategy: If the chosen name is not registered
+    """
+    chosen = name or config.CHECKER_STRATEGY or default
+    with _registry_lock:
+        strategy = _registry.get(chosen)
+        known = sorted(_registry)
+    if strategy is None:
+        raise UnknownStrategy(f'Unknown checker strategy {chosen!r}, use one of {known}')
+    return strategy
+
+
+def strategies() -> List[dict]:
+    """Every registered strategy, for listings and status endpoints"""
+    with _registry_lock:
+        return [strategy.info() for strategy in _registry.values()]
+
+
+def check(number: str, name: Optional[str] = None, default: Optional[str] = None) -> Verdict:
+    """Check ``number`` with :func:`get_strategy` ``(name, default)``."""
+    return get_strategy(name, default).check(number)
+
+
+def _smart_verdict(number: str, result: dict) -> Verdict:
+    """checker.smart_checker returns a dict with a status and a 0-100 confidence"""
+    status = result.get('status')
+    if status not in (REGISTERED, NOT_REGISTERED):
+        return Verdict(number, ERROR, 'smart-heuristic', error=result.get('verdict', 'Unknown error'))
+    return Verdict(number, status, 'smart-heuristic', confidence=result.get('confidence_score', 0) / 100)
+
+
+_mock_outcomes = None
+
+
+def mock_check(number: str):
+    """
+    Browser-free answer from whatsapp.stub_server's outcome table.
+
+    Uses ``config.MOCK_OUTCOMES`` when set; every other number gets a
+    stable hash-based verdict, so the mock agrees with the stub server.
+    """
+    global _mock_outcomes
+    from whatsapp.stub_server import OutcomeTable, load_outcomes
+
+    if _mock_outcomes is None:
+        _mock_outcomes = OutcomeTable(load_outcomes(config.MOCK_OUTCOMES) if config.MOCK_OUTCOMES else None)
+    outcome = _mock_outcomes.outcome(number)
+    if outcome == 'no_answer':
+        return {'error': 'No answer (mock)'}
+    return outcome == REGISTERED
+
+
+register('compose-url', 'checker.views:check_whatsapp_registration_compose_url',
+         'Compose URL in a pooled browser (Django app)')
+register('spa-route', 'checker.views:check_whatsapp_registration_spa_route',
+         'Compose URL routed inside the running app, reload as fallback (Django app)')
+register('compose-reload', 'checker.views:check_whatsapp_registration_compose_reload',
+         'Compose URL with a full page load every time (Django app)')
+register('dialog', 'app:check_whatsapp_registration_integrated',
+         'New chat -> New contact form on the debug-port browser (Flask app.py)')
+register('smart-heuristic', 'checker.smart_checker:check_number_smart',
+         'Number format and pattern heuristics, no browser (a guess, not a lookup)',
+         cacheable=False, adapt=_smart_verdict, browser=False)
+register('mock', mock_check, 'Stub outcome table, no browser', cacheable=False, browser=False)
+
+from whatsapp import adaptive  # noqa: E402,F401  registers 'adaptive'
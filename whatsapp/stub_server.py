@@ -0,0 +1,508 @@
+"""
+Local stand-in for WhatsApp Web, for offline benchmarks and CI.
+
+Serves pages with the elements the checkers look for on
+``web.whatsapp.com``: the chat list, the New chat -> New contact form,
+the ``/send?phone=`` compose box, the "Phone number shared via url is
+invalid" alert and the QR login screen. The verdict for a number comes
+from an outcome table and is fetched by the page from ``/v1/lookup`` as
+JSON, so whatsapp.network_detector sees it too. Boot and lookup times are
+drawn from configurable latency distributions with a fixed seed, which
+makes runs reproducible.
+
+Usage:
+    python -m whatsapp.stub_server --port 8765 --outcomes corpus.csv \\
+        --boot-latency fixed:0.5 --lookup-latency lognormal:-1.2,0.4 --seed 1
+
+then point the checkers at it with ``WHATSAPP_BASE_URL=http://127.0.0.1:8765``.
+"""
+import argparse
+import csv
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+OUTCOMES = ('registered', 'not_registered', 'no_answer')
+
+# The app page. Everything is rendered by APP_SCRIPT, which is served
+# from /app.js like the real app's bundles: inline, its verdict strings
+# would be text of the page and match the checkers' XPath text signals.
+# For the same reason verdict elements are created and removed rather
+# than hidden.
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>WhatsApp</title>
+<style>
+body { font-family: sans-serif; margin: 0; }
+#app { display: flex; height: 100vh; }
+#side { width: 30%; border-right: 1px solid #ddd; }
+#main { flex: 1; display: flex; flex-direction: column; }
+#main footer { margin-top: auto; border-top: 1px solid #ddd; padding: 8px; }
+[role="dialog"] { position: fixed; top: 30%; left: 35%; padding: 16px; background: #fff; border: 1px solid #999; }
+</style>
+</head>
+<body>
+<div id="app"><div class="startup">Loading your chats</div></div>
+<script>var STUB = __STUB__;</script>
+<script src="/app.js"></script>
+</body>
+</html>
+"""
+
+APP_SCRIPT = """var app = document.getElementById('app');
+var generation = 0;
+
+function el(tag, attrs, text) {
+    var node = document.createElement(tag);
+    for (var name in attrs || {}) {
+        node.setAttribute(name, attrs[name]);
+    }
+    if (text) {
+        node.textContent = text;
+    }
+    return node;
+}
+
+function remove(selector) {
+    var nodes = document.querySelectorAll(selector);
+    for (var i = 0; i < nodes.length; i++) {
+        nodes[i].remove();
+    }
+}
+
+function lookup(phone) {
+    return fetch('/v1/lookup?phone=' + encodeURIComponent(phone), {cache: 'no-store'})
+        .then(function (response) { return response.json(); });
+}
+
+function renderLogin() {
+    app.innerHTML = '';
+    var landing = el('div', {'class': 'landing'});
+    var qr = el('div', {'data-testid': 'qr-code', 'data-ref': 'stub-' + Date.now()});
+    qr.appendChild(el('canvas', {'aria-label': 'Scan me!', width: 200, height: 200}));
+    landing.appendChild(qr);
+    landing.appendChild(el('p', {}, 'Scan QR code to link a device'));
+    app.appendChild(landing);
+}
+
+function renderSide() {
+    app.innerHTML = '';
+    var side = el('div', {id: 'side'});
+    var header = el('header');
+    var newChat = el('button', {'data-testid': 'new-chat-plus', title: 'New chat', 'aria-label': 'New chat'}, '+');
+    newChat.addEventListener('click', openNewChat);
+    header.appendChild(newChat);
+    side.appendChild(header);
+    var list = el('div', {'data-testid': 'chat-list', role: 'grid'});
+    for (var i = 1; i <= 3; i++) {
+        list.appendChild(el('div', {role: 'row'}, 'Chat ' + i));
+    }
+    side.appendChild(list);
+    app.appendChild(side);
+}
+
+function openNewChat() {
+    remove('[data-testid="new-chat-drawer"]');
+    var drawer = el('div', {'data-testid': 'new-chat-drawer'});
+    var newContact = el('div', {'data-testid': 'new-contact', title: 'New contact', role: 'button'}, 'New contact');
+    newContact.addEventListener('click', openNewContact);
+    drawer.appendChild(newContact);
+    document.getElementById('side').appendChild(drawer);
+}
+
+function openNewContact() {
+    remove('[data-testid="new-contact-form"]');
+    var form = el('div', {'data-testid': 'new-contact-form'});
+    var input = el('input', {type: 'tel', 'data-testid': 'phone-number-input', placeholder: 'phone number'});
+    var status = el('div', {'class': 'status'});
+    var forward = el('button', {'data-testid': 'forward-btn', disabled: 'disabled'}, 'Save');
+    var pending = null;
+    input.addEventListener('input', function () {
+        // Every edit resets the validation, like the real form
+        forward.setAttribute('disabled', 'disabled');
+        status.innerHTML = '';
+        clearTimeout(pending);
+        var phone = input.value.replace(/\\D/g, '');
+        if (phone.length < 7) {
+            return;
+        }
+        pending = setTimeout(function () {
+            lookup(phone).then(function (answer) {
+                if (input.value.replace(/\\D/g, '') !== phone) {
+                    return;
+                }
+                if (answer.status === 'registered') {
+                    forward.removeAttribute('disabled');
+                } else if (answer.status === 'not_registered') {
+                    status.appendChild(el('span', {'data-testid': 'contact-not-on-whatsapp'},
+                        'This phone number is not registered on WhatsApp'));
+                }
+            });
+        }, STUB.debounce * 1000);
+    });
+    form.appendChild(input);
+    form.appendChild(status);
+    form.appendChild(forward);
+    document.querySelector('[data-testid="new-chat-drawer"]').appendChild(form);
+    input.focus();
+}
+
+function openChat(phone) {
+    var current = ++generation;
+    remove('#main');
+    remove('[role="dialog"]');
+    lookup(phone).then(function (answer) {
+        if (current !== generation) {
+            return;
+        }
+        if (answer.status === 'registered') {
+            var main = el('div', {id: 'main'});
+            main.appendChild(el('header', {'data-testid': 'conversation-header'}, '+' + phone));
+            var footer = el('footer', {'data-testid': 'compose'});
+            footer.appendChild(el('div', {
+                contenteditable: 'true', 'data-tab': '10', role: 'textbox',
+                'data-testid': 'conversation-compose-box-input'
+            }));
+            main.appendChild(footer);
+            app.appendChild(main);
+        } else if (answer.status === 'not_registered') {
+            var popup = el('div', {role: 'dialog', 'data-animate-modal-popup': 'true'});
+            popup.appendChild(el('div', {'data-testid': 'alert-phone-number-not-on-whatsapp'},
+                'Phone number shared via url is invalid.'));
+            var ok = el('button', {}, 'OK');
+            ok.addEventListener('click', function () { popup.remove(); });
+            popup.appendChild(ok);
+            app.appendChild(popup);
+        }
+    });
+}
+
+function route() {
+    var phone = new URLSearchParams(location.search).get('phone');
+    if (location.pathname.indexOf('/send') === 0 && phone) {
+        openChat(phone.replace(/\\D/g, ''));
+    }
+}
+
+// In-app navigation, as whatsapp.spa expects from the real app
+document.addEventListener('click', function (event) {
+    var link = event.target.closest && event.target.closest('a[href]');
+    if (!link || link.origin !== location.origin || link.pathname.indexOf('/send') !== 0) {
+        return;
+    }
+    event.preventDefault();
+    history.pushState(null, '', link.pathname + link.search);
+    route();
+});
+window.addEventListener('popstate', route);
+
+document.addEventListener('keydown', function (event) {
+    if (event.key !== 'Escape') {
+        return;
+    }
+    var open = document.querySelector('[data-testid="new-contact-form"]') ||
+        document.querySelector('[data-testid="new-chat-drawer"]') ||
+        document.querySelector('[role="dialog"]');
+    if (open) {
+        open.remove();
+    }
+});
+
+setTimeout(function () {
+    if (!STUB.logged_in) {
+        renderLogin();
+        return;
+    }
+    renderSide();
+    route();
+}, STUB.boot * 1000);
+"""
+
+
+class Latency:
+    """
+    Seconds drawn from a distribution given as ``kind:parameters``.
+
+    ``fixed:0.3``, ``uniform:0.1,0.8``, ``normal:0.5,0.1`` (mean, stddev),
+    ``lognormal:-1.2,0.4`` (mu, sigma of the underlying normal) and
+    ``exponential:0.5`` (mean). Negative samples are clipped to 0.
+    """
+
+    PARAMETERS = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2, 'exponential': 1}
+
+    def __init__(self, spec: str):
+        kind, _, values = spec.partition(':')
+        if kind not in self.PARAMETERS:
+            raise ValueError(f'Unknown latency distribution {kind!r}, use one of {list(self.PARAMETERS)}')
+        try:
+            params = [float(value) for value in values.split(',')] if values else []
+        except ValueError:
+            raise ValueError(f'Latency parameters must be numbers: {spec!r}')
+        if len(params) != self.PARAMETERS[kind]:
+            raise ValueError(f'{kind} takes {self.PARAMETERS[kind]} parameter(s): {spec!r}')
+        self.spec = spec
+        self.kind = kind
+        self.params = params
+
+    def sample(self, rng: random.Random) -> float:
+        a = self.params[0]
+        if self.kind == 'fixed':
+            value = a
+        elif self.kind == 'uniform':
+            value = rng.uniform(a, self.params[1])
+        elif self.kind == 'normal':
+            value = rng.gauss(a, self.params[1])
+        elif self.kind == 'lognormal':
+            value = rng.lognormvariate(a, self.params[1])
+        else:
+            value = rng.expovariate(1 / a) if a > 0 else 0.0
+        return max(0.0, value)
+
+    def mean(self) -> float:
+        """Expected value, for printing what a run was configured with"""
+        a = self.params[0]
+        if self.kind == 'uniform':
+            return (a + self.params[1]) / 2
+        if self.kind == 'lognormal':
+            return math.exp(a + self.params[1] ** 2 / 2)
+        return a
+
+    def __repr__(self):
+        return f'Latency({self.spec!r})'
+
+
+def _digits(number) -> str:
+    return ''.join(filter(str.isdigit, str(number)))
+
+
+def load_outcomes(path: str) -> Dict[str, str]:
+    """
+    Read an outcome table: number -> 'registered', 'not_registered' or 'no_answer'.
+
+    Either a JSON object or a CSV/text file with ``number,outcome`` lines
+    (a header line and ``#`` comments are skipped). Keys are reduced to
+    digits, so "+91 98765-43210" and "919876543210" are the same number.
+    """
+    with open(path, encoding='utf-8') as f:
+        if path.lower().endswith('.json'):
+            rows = json.load(f).items()
+        else:
+            rows = [row for row in csv.reader(f) if row and not row[0].lstrip().startswith('#')]
+
+    table = {}
+    for row in rows:
+        number, outcome = str(row[0]).strip(), str(row[1]).strip().lower()
+        if outcome not in OUTCOMES:
+            if not table and not _digits(number):
+                continue  # header line
+            raise ValueError(f'Unknown outcome {outcome!r} for {number} in {path}, use one of {OUTCOMES}')
+        table[_digits(number)] = outcome
+    return table
+
+
+class OutcomeTable:
+    """Verdicts the stub answers with; numbers not in the table get ``default``."""
+
+    def __init__(self, table: Optional[Dict[str, str]] = None, default: Union[str, float] = 0.5):
+        """
+        Args:
+            table (Optional[Dict[str, str]]): Number -> outcome
+            default (Union[str, float]): An outcome for every other number, or the
+                share of other numbers that are registered (picked by a hash of
+                the number, so the same number always gets the same verdict)
+        """
+        self.table = {_digits(number): outcome for number, outcome in (table or {}).items()}
+        if isinstance(default, str) and default not in OUTCOMES:
+            default = float(default)
+        self.default = default
+
+    def outcome(self, number) -> str:
+        digits = _digits(number)
+        if digits in self.table:
+            return self.table[digits]
+        if isinstance(self.default, str):
+            return self.default
+        share = (zlib.crc32(digits.encode()) % 10000) / 10000
+        return 'registered' if share < self.default else 'not_registered'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'WhatsAppStub/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.stub.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: Union[str, dict], content_type: str = 'application/json') -> None:
+        if isinstance(body, dict):
+            body = json.dumps(body)
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        stub = self.server.stub
+        url = urlparse(self.path)
+        if url.path in ('/', '/send', '/send/'):
+            stub._count('pages')
+            self._send(200, stub.page(), 'text/html')
+        elif url.path == '/app.js':
+            self._send(200, APP_SCRIPT, 'application/javascript')
+        elif url.path == '/v1/lookup':
+            phone = _digits(parse_qs(url.query).get('phone', [''])[0])
+            self._send(200, stub.lookup(phone))
+        elif url.path == '/stub/stats':
+            self._send(200, stub.stats())
+        elif url.path == '/favicon.ico':
+            self.send_response(204)
+            self.end_headers()
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        stub = self.server.stub
+        if urlparse(self.path).path != '/stub/session':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            stub.logged_in = bool(json.loads(self.rfile.read(length) or b'{}').get('logged_in', True))
+        except ValueError:
+            self._send(400, {'error': 'expected JSON like {"logged_in": true}'})
+            return
+        self._send(200, {'logged_in': stub.logged_in})
+
+
+class StubServer:
+    """
+    The stand-in WhatsApp Web, served from a background thread.
+
+    ``with StubServer(...) as stub:`` starts it on a free port; use
+    ``stub.url`` as ``WHATSAPP_BASE_URL``.
+    """
+
+    def __init__(self, outcomes: Optional[OutcomeTable] = None, boot_latency: str = 'fixed:0',
+                 lookup_latency: str = 'fixed:0', seed: Optional[int] = None,
+                 logged_in: bool = True, debounce: float = 0.15,
+                 host: str = '127.0.0.1', port: int = 0, verbose: bool = False):
+        """
+        Args:
+            outcomes (Optional[OutcomeTable]): Verdicts, defaults to half of all numbers registered
+            boot_latency (str): Seconds from page load to a usable app, see :class:`Latency`
+            lookup_latency (str): Seconds the lookup endpoint takes per number
+            seed (Optional[int]): Seed of the latency samples
+            logged_in (bool): False serves the QR login screen
+            debounce (float): Seconds the New contact form waits after typing
+            host (str): Interface to listen on
+            port (int): Port, 0 picks a free one
+            verbose (bool): Log every request
+        """
+        self.outcomes = outcomes or OutcomeTable()
+        self.boot_latency = Latency(boot_latency)
+        self.lookup_latency = Latency(lookup_latency)
+        self.logged_in = logged_in
+        self.debounce = debounce
+        self.verbose = verbose
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counters = {'pages': 0, 'lookups': 0}
+        self._outcome_counts = {outcome: 0 for outcome in OUTCOMES}
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _sample(self, latency: Latency) -> float:
+        with self._lock:
+            return latency.sample(self._rng)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def page(self) -> str:
+        settings = {'logged_in': self.logged_in, 'boot': self._sample(self.boot_latency), 'debounce': self.debounce}
+        return PAGE.replace('__STUB__', json.dumps(settings))
+
+    def lookup(self, phone: str) -> dict:
+        """Answer one lookup after a sampled delay (runs in the request's thread)"""
+        outcome = self.outcomes.outcome(phone)
+        time.sleep(self._sample(self.lookup_latency))
+        with self._lock:
+            self._counters['lookups'] += 1
+            self._outcome_counts[outcome] += 1
+        if outcome == 'no_answer':
+            return {'phone': phone, 'status': 'pending'}
+        return {'phone': phone, 'status': outcome}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._counters, outcomes=dict(self._outcome_counts), logged_in=self.logged_in)
+
+    def start(self) -> str:
+        """Serve in a daemon thread, returns the base URL"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='whatsapp-stub', daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a local stand-in for WhatsApp Web')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--outcomes', help='JSON or CSV file: number -> registered / not_registered / no_answer')
+    parser.add_argument('--default', default='0.5',
+                        help='Outcome for numbers not in the table, or the share of them that is registered')
+    parser.add_argument('--boot-latency', default='fixed:0.5', help='e.g. fixed:0.5, uniform:0.2,1, lognormal:-0.7,0.3')
+    parser.add_argument('--lookup-latency', default='lognormal:-1.2,0.4', help='Per-number lookup delay, same format')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--logged-out', action='store_true', help='Serve the QR login screen')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    outcomes = OutcomeTable(load_outcomes(args.outcomes) if args.outcomes else None, args.default)
+    stub = StubServer(outcomes, args.boot_latency, args.lookup_latency, seed=args.seed,
+                      logged_in=not args.logged_out, host=args.host, port=args.port, verbose=args.verbose)
+    print(f"[INFO] WhatsApp Web stub on {stub.url} ({len(outcomes.table)} numbers in the outcome table, "
+          f"boot ~{stub.boot_latency.mean():.2f}s, lookup ~{stub.lookup_latency.mean():.2f}s)")
+    print(f"[INFO] Point the checkers at it: WHATSAPP_BASE_URL={stub.url}")
+    try:
+        stub._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
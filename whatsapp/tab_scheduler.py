@@ -0,0 +1,228 @@
+"""
+Pipelined checking in several tabs of one logged-in browser.
+
+A single-tab checker spends most of each check waiting for WhatsApp Web
+to boot on the compose URL. :class:`TabScheduler` keeps K tabs open on one
+driver: while one tab is polled for its verdict, the next numbers are
+already loading in the other tabs, and results come back in the order the
+tabs resolve.
+
+WhatsApp Web allows one active tab per session: a tab that finishes
+loading behind another shows "Use here", and clicking it takes the
+session away from the tab that had it, whatever that tab was doing. So
+only one tab holds the session at a time. A waiting tab takes over only
+once the holder has its verdict, before the holder is refilled, and the
+oldest waiting tab goes first. Verdicts therefore come one after the
+other. What overlaps is the page load (boot, chat list, compose URL) of
+the waiting tabs with detection in the active one, which is where the
+time goes.
+
+Chrome throttles background tabs; browsers driven by the scheduler should
+be started with ``BACKGROUND_TAB_ARGUMENTS``.
+"""
+import time
+from collections import deque
+from typing import Iterable, Iterator, Optional, Tuple
+
+from whatsapp import config
+from whatsapp.readiness import COMPOSE_SIGNALS, MARK_STALE_SCRIPT, TAKEOVER_SIGNALS, TIMEOUT, probe
+from whatsapp.spa import compose_url
+
+# Keep timers and rendering of background tabs at full speed
+BACKGROUND_TAB_ARGUMENTS = [
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+]
+
+# Starts a navigation without waiting for it, whatever the driver's page
+# load strategy is, so the scheduler can move on to the next tab at once
+START_NAVIGATION_SCRIPT = MARK_STALE_SCRIPT + '\nwindow.location.href = arguments[0];'
+
+CLICK_XPATH_SCRIPT = """
+var node = document.evaluate(arguments[0], document, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (node) {
+    node.click();
+}
+return !!node;
+"""
+
+VERDICT_SIGNALS = ('registered', 'not_registered', 'login_required')
+
+SIGNALS = dict(COMPOSE_SIGNALS, **TAKEOVER_SIGNALS)
+
+
+class _Tab:
+    def __init__(self, handle: str):
+        self.handle = handle
+        self.number = None
+        self.started = 0.0
+        self.deadline = 0.0
+        # "Use here" selector while the tab waits for the session
+        self.takeover = None
+
+
+class TabScheduler:
+    """
+    Check numbers in ``tabs`` window handles of one driver at once.
+
+    Usage::
+
+        with TabScheduler(driver, tabs=3) as scheduler:
+            for number, outcome in scheduler.run(numbers):
+                ...
+    """
+
+    def __init__(self, driver, tabs: Optional[int] = None, timeout: Optional[float] = None,
+                 poll: float = 0.1):
+        """
+        Args:
+            driver: Logged-in WebDriver; its current tab becomes the first one
+            tabs (Optional[int]): Tabs to keep open, defaults to ``config.TABS``
+            timeout (Optional[float]): Per-number deadline from navigation (or
+                from getting the session) to verdict, defaults to ``config.DETECT_TIMEOUT``
+            poll (float): Pause when a full round over the tabs found nothing
+        """
+        self.driver = driver
+        self.size = max(1, config.TABS if tabs is None else tabs)
+        self.timeout = config.DETECT_TIMEOUT if timeout is None else timeout
+        self.poll = poll
+        self.tabs = []
+        self._opened = []
+        # Tab that has the WhatsApp Web session, None while nobody checks
+        self._holder = None
+        self.takeovers = 0
+
+    def open(self) -> None:
+        """Open the extra tabs; the driver's current tab is reused as the first."""
+        if self.tabs:
+            return
+        self.tabs.append(_Tab(self.driver.current_window_handle))
+        while len(self.tabs) < self.size:
+            self.driver.switch_to.new_window('tab')
+            handle = self.driver.current_window_handle
+            self._opened.append(handle)
+            self.tabs.append(_Tab(handle))
+        print(f"[INFO] Tab scheduler running {len(self.tabs)} tab(s)")
+
+    def close(self) -> None:
+        """Close the tabs this scheduler opened and go back to the first one."""
+        for handle in self._opened:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception:
+                pass
+        if self.tabs:
+            try:
+                self.driver.switch_to.window(self.tabs[0].handle)
+            except Exception:
+                pass
+        self.tabs = []
+        self._opened = []
+        self._holder = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start(self, tab: _Tab, number: str) -> None:
+        tab.number = number
+        tab.started = time.time()
+        tab.deadline = tab.started + self.timeout
+        tab.takeover = None
+        if self._holder is None:
+            # Nobody has the session, this tab's page will pick it up
+            self._holder = tab
+        self.driver.switch_to.window(tab.handle)
+        self.driver.execute_script(START_NAVIGATION_SCRIPT, compose_url(number))
+
+    def _take_over(self, tab: _Tab) -> None:
+        """Click "Use here" in a waiting tab; only while no other tab is mid-check."""
+        self.driver.switch_to.window(tab.handle)
+        try:
+            self.driver.execute_script(CLICK_XPATH_SCRIPT, tab.takeover)
+        except Exception:
+            # Re-rendered; the next poll finds the button again
+            pass
+        tab.takeover = None
+        self._holder = tab
+        self.takeovers += 1
+        # The wait for the session does not count against the check
+        tab.deadline = max(tab.deadline, time.time() + self.timeout)
+
+    def _hand_over(self) -> None:
+        """Give the free session to the tab that has waited longest."""
+        waiting = [tab for tab in self.tabs if tab.number is not None and tab.takeover]
+        if waiting:
+            self._take_over(min(waiting, key=lambda tab: tab.started))
+
+    def _poll(self, tab: _Tab) -> Optional[dict]:
+        """Probe one busy tab; returns its outcome once it has one."""
+        self.driver.switch_to.window(tab.handle)
+        elapsed = time.time() - tab.started
+        try:
+            hit = probe(self.driver, SIGNALS)
+        except Exception:
+            # Document is being replaced mid-navigation
+            hit = None
+
+        if hit and hit['signal'] == 'takeover':
+            # Clicking now would cut off the holder's check; queue instead
+            tab.takeover = hit['selector']
+            if self._holder is None or self._holder is tab or self._holder.number is None:
+                self._take_over(tab)
+            hit = None
+        elif hit and hit['signal'] in VERDICT_SIGNALS:
+            # Only the tab with the session renders a verdict
+            self._holder = tab
+
+        if hit and hit['signal'] in VERDICT_SIGNALS:
+            return {'signal': hit['signal'], 'selector': hit['selector'], 'elapsed': round(elapsed, 3)}
+        if tab.takeover is None and time.time() >= tab.deadline:
+            return {'signal': TIMEOUT, 'selector': None, 'elapsed': round(elapsed, 3)}
+        return None
+
+    def run(self, numbers: Iterable[str]) -> Iterator[Tuple[str, dict]]:
+        """
+        Check ``numbers`` across the tabs.
+
+        Yields:
+            Tuple[str, dict]: The number and its :func:`wait_for_outcome`-style
+                outcome (plus ``tab``), in the order the tabs resolve
+        """
+        self.open()
+        pending = deque(numbers)
+
+        while True:
+            for tab in self.tabs:
+                if tab.number is None and pending:
+                    self._start(tab, pending.popleft())
+
+            busy = [tab for tab in self.tabs if tab.number is not None]
+            if not busy:
+                return
+
+            resolved = False
+            for tab in busy:
+                outcome = self._poll(tab)
+                if outcome is None:
+                    continue
+                outcome['tab'] = self.tabs.index(tab)
+                number, tab.number = tab.number, None
+                if self._holder is tab:
+                    self._holder = None
+                resolved = True
+                yield number, outcome
+                # Hand the session on before this tab reloads, then refill it
+                # at once so it loads while the others are polled
+                self._hand_over()
+                if pending:
+                    self._start(tab, pending.popleft())
+
+            if not resolved:
+                time.sleep(self.poll)
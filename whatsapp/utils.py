@@ -2,7 +2,7 @@
 Utility functions for WhatsApp number checking
 """
 import os
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 def read_numbers_from_file(file_path: str) -> List[str]:
     """
@@ -122,3 +122,37 @@ def validate_phone_number(number: str) -> Optional[str]:
         return None
     
     return cleaned
+
+def canonical_number(number: str) -> str:
+    """
+    Canonical form used to recognise the same number written differently.
+    
+    Args:
+        number (str): Phone number as entered, e.g. "+91 98765-43210"
+        
+    Returns:
+        str: E.164 form from validate_phone_number, or "+<digits>" for
+            numbers it rejects so they still collapse with their duplicates
+    """
+    number = str(number).strip()
+    canonical = validate_phone_number(number)
+    if canonical:
+        return canonical
+    digits = ''.join(c for c in number if c.isdigit())
+    return '+' + digits if digits else number
+
+def group_numbers(numbers: Iterable[str]) -> Dict[str, List[int]]:
+    """
+    Collapse duplicate numbers before dispatching them to a checker.
+    
+    Args:
+        numbers (Iterable[str]): Phone numbers in their original order
+        
+    Returns:
+        Dict[str, List[int]]: Canonical number -> positions of every row that
+            holds it, in order of first appearance
+    """
+    groups = {}
+    for position, number in enumerate(numbers):
+        groups.setdefault(canonical_number(number), []).append(position)
+    return groups
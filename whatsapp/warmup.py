@@ -0,0 +1,95 @@
+"""
+Browser warm-up at server start.
+
+Without it no browser exists until the first check, which then pays for
+the Chrome launch and the WhatsApp Web login restore. The process that
+runs the checks calls :func:`start_warmup` once at boot; the browsers are
+launched in a background thread so startup itself is not delayed, and
+:func:`warmup_status` feeds ``/api/session-status``.
+
+Every browser restores the same linked-device session, and WhatsApp Web
+keeps only one of them active, so exactly one process may own browsers:
+run_check_worker for the Django app (its gunicorn workers only enqueue),
+app.py for the Flask app, whose worker attaches to that same browser.
+"""
+import os
+import sys
+import threading
+import time
+from typing import Callable, List, Optional
+
+from whatsapp import config
+
+_status = {
+    'state': 'cold',
+    'ready': 0,
+    'target': 0,
+    'error': '',
+    'started_at': None,
+    'finished_at': None,
+}
+_lock = threading.Lock()
+
+# Management commands that run browser checks; every other one (runserver,
+# migrate, collectstatic, shell, ...) must not start browsers
+CHECKING_COMMANDS = ('run_check_worker',)
+
+
+def should_warm_up(argv: Optional[List[str]] = None) -> bool:
+    """
+    Whether this process runs the browser checks and should warm up browsers.
+
+    True for ``python app.py`` and the Django job worker. Web servers
+    (gunicorn, uwsgi, runserver) of the Django app never start browsers.
+    """
+    if not config.PREWARM:
+        return False
+    argv = sys.argv if argv is None else argv
+    program = os.path.basename(argv[0]) if argv else ''
+    return any(command in argv for command in CHECKING_COMMANDS) or program == 'app.py'
+
+
+def start_warmup(warm: Callable[[], int], target: int = 1) -> bool:
+    """
+    Run ``warm`` in a background thread, once per process.
+
+    Args:
+        warm (Callable[[], int]): Launches the browsers and returns how many
+            of them ended up logged in
+        target (int): Number of browsers being launched, for the status
+
+    Returns:
+        bool: False if a warm-up already ran or is running
+    """
+    with _lock:
+        if _status['state'] in ('warming', 'ready'):
+            return False
+        _status.update(state='warming', ready=0, target=target, error='',
+                       started_at=time.time(), finished_at=None)
+
+    def run():
+        print(f"[INFO] Warming up {target} browser(s) in the background")
+        try:
+            ready = warm()
+        except Exception as e:
+            print(f"[WARNING] Browser warm-up failed: {e}")
+            with _lock:
+                _status.update(state='failed', error=str(e), finished_at=time.time())
+            return
+        with _lock:
+            _status.update(
+                state='ready' if ready else 'login_required',
+                ready=ready,
+                finished_at=time.time(),
+            )
+        print(f"[INFO] Browser warm-up finished: {ready}/{target} logged in "
+              f"after {_status['finished_at'] - _status['started_at']:.1f}s")
+
+    threading.Thread(target=run, name='browser-warmup', daemon=True).start()
+    return True
+
+
+def warmup_status() -> dict:
+    """Copy of the warm-up state: ``state`` is cold, warming, ready, login_required or failed."""
+    with _lock:
+        return dict(_status)
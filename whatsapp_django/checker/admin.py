@@ -1,3 +1,20 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import CheckJob, CheckResult, CheckWorker
+
+
+@admin.register(CheckJob)
+class CheckJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'strategy', 'progress', 'total', 'worker', 'heartbeat', 'created_at')
+    list_filter = ('status',)
+
+
+@admin.register(CheckResult)
+class CheckResultAdmin(admin.ModelAdmin):
+    list_display = ('job', 'position', 'number', 'registered', 'checked_at')
+    list_filter = ('registered',)
+
+
+@admin.register(CheckWorker)
+class CheckWorkerAdmin(admin.ModelAdmin):
+    list_display = ('name', 'heartbeat', 'warmup_requested')
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CheckerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'checker'
+
+    def ready(self):
+        from whatsapp.warmup import should_warm_up
+
+        # Only the process that runs the browser checks (run_check_worker)
+        if should_warm_up():
+            from .views import warm_up_pool
+            warm_up_pool()
@@ -0,0 +1,221 @@
+"""
+Durable batch jobs.
+
+The web tier only calls :func:`enqueue_job` and reads job rows; the
+``run_check_worker`` management command claims jobs and checks the numbers,
+saving every result as it goes so a restarted worker resumes where the
+previous one stopped.
+
+That worker is the only process with browsers: every one of them restores
+the same linked-device session, and WhatsApp Web keeps one active. Single
+checks are one-number jobs too, and the worker publishes its browser status
+(:func:`publish_worker_status`) for the web workers to report.
+"""
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from whatsapp import config
+from whatsapp.result_cache import lookup_result, store_result
+from whatsapp.utils import group_numbers
+
+from .models import CheckJob, CheckResult, CheckWorker
+
+# A running job whose worker has been silent this long is considered orphaned
+STALE_AFTER = timedelta(seconds=config.JOB_STALE_AFTER)
+
+# Largest page /api/jobs/<id>/results/ returns in one response
+RESULTS_PAGE_SIZE = 500
+
+# A worker that has not published its status for this long is gone
+WORKER_GONE_AFTER = timedelta(seconds=3 * config.WORKER_STATUS_INTERVAL)
+
+
+def enqueue_job(numbers, strategy=''):
+    """Store a batch and its numbers, to be checked with ``strategy`` (default: the worker's); returns the new CheckJob."""
+    numbers = [str(n).strip() for n in numbers if str(n).strip()]
+    with transaction.atomic():
+        job = CheckJob.objects.create(total=len(numbers), strategy=strategy or '')
+        CheckResult.objects.bulk_create([
+            CheckResult(job=job, position=i, number=number)
+            for i, number in enumerate(numbers)
+        ])
+    return job
+
+
+def job_counters(job):
+    """Status of a job without its results, cheap enough to poll."""
+    return {
+        'job_id': job.pk,
+        'status': job.status,
+        'running': job.running,
+        'progress': job.progress,
+        'total': job.total,
+    }
+
+
+def results_since(job, since=0, limit=RESULTS_PAGE_SIZE):
+    """
+    Return the checked results of a job starting at position ``since``.
+
+    Only the unbroken run of checked rows is returned, so a row that is
+    still pending can never be skipped by a client that resumes from the
+    returned cursor.
+
+    Returns:
+        tuple: (list of result dicts, cursor to pass as ``since`` next time)
+    """
+    limit = max(1, min(limit, RESULTS_PAGE_SIZE))
+    results = []
+    cursor = since
+    for item in job.results.filter(position__gte=since).order_by('position')[:limit]:
+        if item.checked_at is None:
+            break
+        results.append(item.as_dict())
+        cursor = item.position + 1
+    return results, cursor
+
+
+def wait_for_results(job, timeout, poll_interval=0.2):
+    """
+    Wait until a worker has checked every number of ``job``.
+
+    Returns:
+        bool: Whether it did within ``timeout`` seconds
+    """
+    deadline = time.time() + timeout
+    while True:
+        if not job.results.filter(checked_at__isnull=True).exists():
+            return True
+        if time.time() >= deadline:
+            return False
+        time.sleep(poll_interval)
+
+
+def publish_worker_status(worker, warmup, pool):
+    """
+    Record a worker's browser status; called by the worker every few seconds.
+
+    Returns:
+        bool: Whether a warm-up was requested through :func:`request_warmup`
+            since the last call
+    """
+    with transaction.atomic():
+        status, _ = CheckWorker.objects.select_for_update().get_or_create(
+            name=worker, defaults={'heartbeat': timezone.now()},
+        )
+        requested = status.warmup_requested
+        status.heartbeat = timezone.now()
+        status.warmup = warmup
+        status.pool = pool
+        status.warmup_requested = False
+        status.save()
+    return requested
+
+
+def worker_status():
+    """The most recent status of a live worker, or None when no worker is running."""
+    return CheckWorker.objects.filter(heartbeat__gte=timezone.now() - WORKER_GONE_AFTER).first()
+
+
+def request_warmup():
+    """
+    Ask the live workers to retry their browser warm-up.
+
+    Returns:
+        bool: False when no worker is running
+    """
+    return bool(CheckWorker.objects.filter(
+        heartbeat__gte=timezone.now() - WORKER_GONE_AFTER,
+    ).update(warmup_requested=True))
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim_job(worker):
+    """
+    Claim the oldest queued job, or a running job whose worker went silent.
+
+    The claim is a conditional UPDATE, so two workers can never both win
+    the same job.
+    """
+    now = timezone.now()
+    candidates = CheckJob.objects.filter(status=CheckJob.QUEUED).order_by('created_at')
+    orphaned = CheckJob.objects.filter(status=CheckJob.RUNNING, heartbeat__lt=now - STALE_AFTER).order_by('created_at')
+
+    for job in list(orphaned[:5]) + list(candidates[:5]):
+        claimed = CheckJob.objects.filter(
+            pk=job.pk, status=job.status, heartbeat=job.heartbeat,
+        ).update(
+            status=CheckJob.RUNNING, worker=worker, heartbeat=now,
+            started_at=job.started_at or now,
+        )
+        if claimed:
+            if job.status == CheckJob.RUNNING:
+                print(f'[WORKER] Resuming job {job.pk} abandoned by {job.worker}')
+            return CheckJob.objects.get(pk=job.pk)
+    return None
+
+
+def run_job(job, check_number, delay=None):
+    """
+    Check every pending number of a claimed job, checkpointing each result.
+
+    Numbers are canonicalized first and each distinct number is checked
+    once; its result is written to every row that holds it.
+
+    Args:
+        job (CheckJob): Job returned by :func:`claim_job`
+        check_number (Callable): canonical number -> bool, or a dict with an
+            ``error`` key; only called for numbers the result cache holds no verdict for
+        delay (Optional[float]): Pause between checks, defaults to ``config.BATCH_DELAY``
+    """
+    delay = config.BATCH_DELAY if delay is None else delay
+    pending = list(job.results.filter(checked_at__isnull=True).order_by('position'))
+    groups = group_numbers(item.number for item in pending)
+    print(f'[WORKER] Job {job.pk}: {len(pending)} of {job.total} numbers left, {len(groups)} unique')
+
+    for number, indexes in groups.items():
+        # Numbers checked recently are answered without a browser. Only a
+        # verdict is reused or remembered: an error is retried on the next
+        # check instead of being copied into other rows, jobs and single checks
+        result = lookup_result(number)
+        if not isinstance(result, bool):
+            result = None
+        live = result is None
+        if live:
+            try:
+                result = check_number(number)
+            except Exception as e:
+                result = {'error': str(e)}
+            if isinstance(result, bool):
+                store_result(number, result)
+
+        if isinstance(result, dict):
+            fields = {'registered': None, 'message': '', 'error': result['error']}
+        else:
+            message = 'REGISTERED on WhatsApp' if result else 'NOT REGISTERED on WhatsApp'
+            fields = {'registered': result, 'message': message, 'error': ''}
+
+        with transaction.atomic():
+            # Rows checked in the meantime (by a worker that was presumed
+            # dead) are neither overwritten nor counted twice
+            updated = CheckResult.objects.filter(
+                pk__in=[pending[i].pk for i in indexes], checked_at__isnull=True,
+            ).update(checked_at=timezone.now(), **fields)
+            CheckJob.objects.filter(pk=job.pk).update(
+                progress=F('progress') + updated, heartbeat=timezone.now(),
+            )
+
+        if delay and live:
+            time.sleep(delay)
+
+    CheckJob.objects.filter(pk=job.pk).update(status=CheckJob.DONE, finished_at=timezone.now())
+    print(f'[WORKER] Job {job.pk} finished')
@@ -0,0 +1,98 @@
+import os
+from django.core.management.base import BaseCommand
+from checker.jobs import enqueue_job, wait_for_results, worker_status
+from checker.views import DEFAULT_STRATEGY
+from whatsapp.strategies import UnknownStrategy, get_strategy
+from whatsapp.utils import read_numbers_from_file, get_all_number_files, save_results, validate_phone_number
+
+
+class Command(BaseCommand):
+
+    help = 'Check if a phone number or numbers in a file are registered on WhatsApp (without sending messages)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=str, help='Phone number in international format (e.g., +1234567890)')
+        parser.add_argument('--file', type=str, help='Path to .txt file with numbers (default: all .txt in C:/num/)')
+        parser.add_argument('--strategy', type=str, help='Checker strategy (see whatsapp.strategies), defaults to WHATSAPP_STRATEGY or compose-url')
+        parser.add_argument('--timeout', type=float, default=None,
+                            help='Seconds to wait for the check worker, default: until every number is checked')
+
+    def check_numbers(self, numbers, strategy, timeout):
+        """
+        Check ``numbers`` and return (number, registered or None, error) per number.
+
+        Browser strategies are queued for run_check_worker like the API's
+        checks: it is the only process with browsers, and a second browser
+        on the same linked device would take its session over. Returns
+        None when the worker did not finish within ``timeout``.
+        """
+        if not strategy.browser:
+            verdicts = [strategy.check(n) for n in numbers]
+            return [(verdict.number, verdict.registered, verdict.error) for verdict in verdicts]
+
+        if worker_status() is None:
+            self.stdout.write(self.style.WARNING('No check worker is running; start manage.py run_check_worker'))
+        job = enqueue_job(numbers, strategy.name)
+        self.stdout.write(f'Queued job {job.pk} for the check worker')
+        if not wait_for_results(job, float('inf') if timeout is None else timeout):
+            self.stdout.write(self.style.ERROR(f'Job {job.pk} is not finished; its results will be under /api/jobs/{job.pk}/results/'))
+            return None
+        return [(item.number, item.registered, item.error) for item in job.results.order_by('position')]
+
+    def handle(self, *args, **options):
+        number = options.get('number')
+        file_path = options.get('file')
+
+        try:
+            strategy = get_strategy(options.get('strategy'), default=DEFAULT_STRATEGY)
+        except UnknownStrategy as e:
+            self.stdout.write(self.style.ERROR(str(e)))
+            return
+
+        if number:
+            self.stdout.write(f'Checking WhatsApp registration for: {number} ({strategy.name})')
+            checked = self.check_numbers([number], strategy, options['timeout'])
+            if checked is None:
+                return
+            _, registered, error = checked[0]
+            if registered is None:
+                self.stdout.write(self.style.ERROR(f'{number}: check failed: {error}'))
+            elif registered:
+                self.stdout.write(self.style.SUCCESS(f'{number} is registered on WhatsApp.'))
+            else:
+                self.stdout.write(self.style.WARNING(f'{number} is NOT registered on WhatsApp.'))
+            return
+
+        # Batch mode
+        if file_path:
+            files = [file_path]
+        else:
+            files = get_all_number_files()
+            if not files:
+                self.stdout.write(self.style.ERROR('No .txt files found in C:/num/'))
+                return
+
+        for file in files:
+            self.stdout.write(f'Checking numbers from: {file}')
+            numbers = []
+            for n in read_numbers_from_file(file):
+                valid = validate_phone_number(n)
+                if not valid:
+                    self.stdout.write(self.style.WARNING(f'Skipping invalid number: {n}'))
+                    continue
+                numbers.append(valid)
+            checked = self.check_numbers(numbers, strategy, options['timeout']) if numbers else []
+            if checked is None:
+                return
+            results = {}
+            for valid, registered, error in checked:
+                if registered is None:
+                    self.stdout.write(self.style.ERROR(f'{valid}: check failed: {error}'))
+                    continue
+                results[valid] = registered
+                status = 'REGISTERED' if registered else 'NOT REGISTERED'
+                self.stdout.write(f'{valid}: {status}')
+            # Save results for this file
+            out_file = f'C:/num/results_{os.path.splitext(os.path.basename(file))[0]}.txt'
+            save_results(results, out_file)
+            self.stdout.write(self.style.SUCCESS(f'Results saved to: {out_file}'))
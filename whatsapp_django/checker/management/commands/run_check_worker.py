@@ -0,0 +1,71 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from checker.jobs import claim_job, publish_worker_status, run_job, worker_name
+from checker.views import DEFAULT_STRATEGY, warm_up_pool
+from whatsapp import config
+from whatsapp.browser_pool import pool_stats
+from whatsapp.strategies import UnknownStrategy, get_strategy
+from whatsapp.warmup import warmup_status
+
+
+class Command(BaseCommand):
+
+    help = 'Run the checks queued by /api/check-batch/ and /api/check-single/, resuming jobs abandoned by a crashed worker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when no job is waiting instead of polling')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds between queue polls when idle')
+        parser.add_argument('--strategy', help='Checker strategy, defaults to WHATSAPP_STRATEGY or compose-url')
+
+    def publish_status(self, worker):
+        """Keep the web workers informed of this process' browsers, which only it can see"""
+        while True:
+            try:
+                if publish_worker_status(worker, warmup_status(), pool_stats()):
+                    print('[WORKER] Browser warm-up requested')
+                    warm_up_pool()
+            except Exception as e:
+                print(f'[WARNING] Could not publish the worker status: {e}')
+            finally:
+                connection.close()
+            time.sleep(config.WORKER_STATUS_INTERVAL)
+
+    def handle(self, *args, **options):
+        worker = worker_name()
+        strategy = get_strategy(options['strategy'], default=DEFAULT_STRATEGY)
+        self.stdout.write(f'Check worker {worker} started ({strategy.name} strategy)')
+        threading.Thread(target=self.publish_status, args=(worker,), name='worker-status', daemon=True).start()
+
+        while True:
+            try:
+                job = claim_job(worker)
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'Could not claim a job: {e}'))
+                job = None
+
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+
+            # Single checks may name their own strategy
+            try:
+                job_strategy = get_strategy(job.strategy) if job.strategy else strategy
+            except UnknownStrategy as e:
+                self.stdout.write(self.style.WARNING(f'{e}; job {job.pk} uses {strategy.name}'))
+                job_strategy = strategy
+
+            self.stdout.write(f'Running job {job.pk} ({job.total} numbers, {job_strategy.name})')
+            try:
+                run_job(job, job_strategy.check_number)
+            except Exception as e:
+                # The job keeps its RUNNING status; once its heartbeat goes
+                # stale it is claimed again and resumed from the last result
+                self.stdout.write(self.style.ERROR(f'Job {job.pk} interrupted: {e}'))
+                continue
+            self.stdout.write(self.style.SUCCESS(f'Job {job.pk} done'))
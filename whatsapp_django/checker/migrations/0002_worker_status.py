@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('checker', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckWorker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('heartbeat', models.DateTimeField()),
+                ('warmup', models.JSONField(default=dict)),
+                ('pool', models.JSONField(blank=True, null=True)),
+                ('warmup_requested', models.BooleanField(default=False)),
+            ],
+            options={
+                'ordering': ['-heartbeat'],
+            },
+        ),
+        migrations.AddField(
+            model_name='checkjob',
+            name='strategy',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+    ]
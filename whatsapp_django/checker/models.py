@@ -1,3 +1,83 @@
 from django.db import models
 
-# Create your models here.
+
+class CheckJob(models.Model):
+    """A batch of numbers queued by /api/check-batch/ and run by a worker."""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+    ]
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    # Registered checker strategy; empty runs the worker's own
+    strategy = models.CharField(max_length=50, blank=True)
+    total = models.PositiveIntegerField(default=0)
+    progress = models.PositiveIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    heartbeat = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'Job {self.pk} ({self.status}, {self.progress}/{self.total})'
+
+    @property
+    def running(self):
+        return self.status in (self.QUEUED, self.RUNNING)
+
+
+class CheckResult(models.Model):
+    """One number of a job; ``checked_at`` stays empty until it is checked."""
+
+    job = models.ForeignKey(CheckJob, related_name='results', on_delete=models.CASCADE)
+    position = models.PositiveIntegerField()
+    number = models.CharField(max_length=64)
+    registered = models.BooleanField(null=True)
+    message = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+    checked_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['position']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'position'], name='unique_job_position'),
+        ]
+
+    def __str__(self):
+        return f'{self.number} (job {self.job_id})'
+
+    def as_dict(self):
+        if self.error:
+            return {'number': self.number, 'error': self.error}
+        return {
+            'number': self.number,
+            'registered': self.registered,
+            'message': self.message,
+        }
+
+
+class CheckWorker(models.Model):
+    """Browser status a run_check_worker process publishes for the web workers."""
+
+    name = models.CharField(max_length=100, unique=True)
+    heartbeat = models.DateTimeField()
+    # whatsapp.warmup.warmup_status() and whatsapp.browser_pool.pool_stats()
+    warmup = models.JSONField(default=dict)
+    pool = models.JSONField(null=True, blank=True)
+    # Set by /api/initialize/, cleared by the worker once it retried the warm-up
+    warmup_requested = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ['-heartbeat']
+
+    def __str__(self):
+        return f'Worker {self.name} ({self.warmup.get("state", "cold")})'
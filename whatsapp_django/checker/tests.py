@@ -1,3 +1,680 @@
-from django.test import TestCase
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from whatsapp import config, job_store, profiles, result_cache, sse, warmup
+from whatsapp.adaptive import AdaptiveDispatcher
+from whatsapp.ingest import extract_numbers, json_stream, unique_numbers
+from whatsapp.result_cache import ResultCache, lookup_result, store_result
+from whatsapp.strategies import Verdict, register
+from whatsapp.stub_server import Latency, OutcomeTable
+from whatsapp.utils import group_numbers
+
+from .jobs import claim_job, enqueue_job, publish_worker_status, run_job
+from .models import CheckJob, CheckResult
+
+
+def temp_path(test, name):
+    """Path inside a directory removed after ``test``"""
+    directory = tempfile.TemporaryDirectory()
+    test.addCleanup(directory.cleanup)
+    return os.path.join(directory.name, name)
+
+
+class FakeStrategy:
+    """Check function whose answers (and speed) a test can change"""
+
+    def __init__(self, result=True, seconds=0.0):
+        self.result = result
+        self.seconds = seconds
+        self.calls = 0
+
+    def __call__(self, number):
+        self.calls += 1
+        if self.seconds:
+            time.sleep(self.seconds)
+        return self.result
+
+
+class AdaptiveDispatcherTests(SimpleTestCase):
+
+    def setUp(self):
+        self.fast = FakeStrategy(True, seconds=0.002)
+        self.slow = FakeStrategy(False, seconds=0.008)
+        self.broken = FakeStrategy({'error': 'No registration signal within 10s'})
+        register('test-fast', self.fast, cacheable=False)
+        register('test-slow', self.slow, cacheable=False)
+        register('test-broken', self.broken, cacheable=False)
+
+    def dispatcher(self, names, **kwargs):
+        kwargs.setdefault('explore', 0.1)
+        kwargs.setdefault('rng', random.Random(1))
+        return AdaptiveDispatcher(names, **kwargs)
+
+    def test_prefers_the_best_throughput(self):
+        dispatcher = self.dispatcher(['test-fast', 'test-slow'])
+        for i in range(60):
+            dispatcher.check(str(i))
+        routed = {name: stats['routed'] for name, stats in dispatcher.stats()['strategies'].items()}
+        self.assertGreater(routed['test-fast'], routed['test-slow'])
+        # Exploration keeps the other one measured
+        self.assertGreater(routed['test-slow'], 1)
+
+    def test_error_verdicts_bench_a_strategy(self):
+        dispatcher = self.dispatcher(['test-broken'], failure_limit=3, cooldown=60)
+        for i in range(3):
+            verdict = dispatcher.check(str(i))
+            self.assertIsNone(verdict.registered)
+        stats = dispatcher.stats()['strategies']['test-broken']
+        self.assertEqual(stats['failures_in_a_row'], 3)
+        self.assertGreater(stats['benched_for'], 0)
+
+    def test_failed_check_is_retried_on_another_strategy(self):
+        dispatcher = self.dispatcher(['test-broken', 'test-fast'], explore=0.5,
+                                     failure_limit=3, cooldown=60)
+        verdicts = [dispatcher.check(str(i)) for i in range(30)]
+        self.assertTrue(all(verdict.registered for verdict in verdicts))
+        self.assertTrue(all(verdict.strategy == 'test-fast' for verdict in verdicts))
+        # Benched after its third failure, so no traffic since
+        self.assertEqual(self.broken.calls, 3)
+
+    def test_traffic_returns_after_the_cooldown(self):
+        flaky = FakeStrategy({'error': 'timeout'})
+        register('test-flaky', flaky, cacheable=False)
+        dispatcher = self.dispatcher(['test-flaky', 'test-slow'], explore=0.5,
+                                     failure_limit=2, cooldown=0.5)
+        for i in range(10):
+            dispatcher.check(str(i))
+        self.assertEqual(flaky.calls, 2)
+
+        flaky.result = True
+        time.sleep(0.5)
+        for i in range(40):
+            dispatcher.check(str(i))
+        stats = dispatcher.stats()['strategies']['test-flaky']
+        self.assertGreater(flaky.calls, 2)
+        self.assertEqual(stats['failures_in_a_row'], 0)
+        self.assertEqual(stats['benched_for'], 0)
+
+    def test_retry_does_not_read_the_cached_error(self):
+        patcher = mock.patch.object(result_cache, '_cache', ResultCache(temp_path(self, 'cache.sqlite3')))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        first, second = FakeStrategy(True), FakeStrategy(True)
+        register('test-cached-a', first)
+        register('test-cached-b', second)
+        dispatcher = self.dispatcher(['test-cached-a', 'test-cached-b'])
+
+        # A recent failure is in the cache; whichever strategy goes first
+        # reads it, and the retry has to run the other one
+        store_result('+14155550100', {'error': 'timeout'})
+        verdict = dispatcher.check('+14155550100')
+        self.assertEqual((verdict.registered, verdict.cached), (True, False))
+        ran = 'test-cached-a' if first.calls else 'test-cached-b'
+        self.assertEqual((first.calls + second.calls, verdict.strategy), (1, ran))
+        self.assertIs(lookup_result('+14155550100'), True)
+
+        # The next answer comes from the cache and says so
+        verdict = dispatcher.check('+14155550100')
+        self.assertEqual((verdict.registered, verdict.cached, verdict.strategy), (True, True, 'cache'))
+        self.assertEqual(first.calls + second.calls, 1)
+
+    def test_leaves_out_strategies_of_another_app(self):
+        register('test-other-app', 'no_such_app.views:check')
+        dispatcher = self.dispatcher(['test-other-app', 'test-fast', 'test-unknown'])
+        self.assertEqual([strategy.name for strategy in dispatcher.candidates], ['test-fast'])
+        with self.assertRaises(ValueError):
+            self.dispatcher(['test-other-app'])
+
+
+class JobStoreTests(SimpleTestCase):
+
+    def setUp(self):
+        self.db = temp_path(self, 'jobs.sqlite3')
+        # run_job answers from the process-wide result cache first
+        patcher = mock.patch.object(result_cache, '_cache', ResultCache(temp_path(self, 'cache.sqlite3')))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def set_heartbeat(self, job_id, heartbeat):
+        with job_store.connect(self.db) as conn:
+            conn.execute('UPDATE jobs SET heartbeat = ? WHERE id = ?', (heartbeat, job_id))
+
+    def test_claims_queued_jobs_oldest_first(self):
+        first = job_store.enqueue_job(['+14155550100'], db_path=self.db)
+        second = job_store.enqueue_job(['+14155550101'], db_path=self.db)
+        self.assertEqual(job_store.claim_job('a', self.db), first)
+        self.assertEqual(job_store.claim_job('b', self.db), second)
+        self.assertIsNone(job_store.claim_job('c', self.db))
+        self.assertEqual(job_store.job_counters(first, self.db)['status'], 'running')
+
+    def test_live_heartbeat_keeps_the_job(self):
+        job_id = job_store.enqueue_job(['+14155550100'], db_path=self.db)
+        job_store.claim_job('a', self.db)
+        self.set_heartbeat(job_id, time.time() - config.JOB_STALE_AFTER / 2)
+        self.assertIsNone(job_store.claim_job('b', self.db))
+
+    def test_stale_job_is_resumed_where_it_stopped(self):
+        numbers = ['+14155550100', '+1 415 555 0101', '14155550101', '+14155550102']
+        job_id = job_store.enqueue_job(numbers, db_path=self.db)
+        self.assertEqual(job_store.claim_job('a', self.db), job_id)
+        # Worker "a" checked the first number, then died
+        with job_store.connect(self.db) as conn:
+            conn.execute('UPDATE job_results SET registered = 1, checked_at = ? WHERE job_id = ? AND position = 0',
+                         (time.time(), job_id))
+            conn.execute('UPDATE jobs SET progress = 1 WHERE id = ?', (job_id,))
+        self.set_heartbeat(job_id, time.time() - config.JOB_STALE_AFTER - 1)
+
+        self.assertEqual(job_store.claim_job('b', self.db), job_id)
+        checked = []
+        job_store.run_job(job_id, lambda number: checked.append(number) or number.endswith('1'),
+                          delay=0, db_path=self.db)
+
+        # Only the pending rows, and position 2 repeats position 1 in another format
+        self.assertEqual(checked, ['+14155550101', '+14155550102'])
+        counters = job_store.job_counters(job_id, self.db)
+        self.assertEqual((counters['status'], counters['progress']), ('done', 4))
+        results, cursor = job_store.results_since(job_id, 0, db_path=self.db)
+        self.assertEqual(cursor, 4)
+        self.assertEqual([result['registered'] for result in results], [True, True, True, False])
+
+    def test_errors_are_recorded_not_answered(self):
+        job_id = job_store.enqueue_job(['+14155550100'], db_path=self.db)
+        job_store.claim_job('a', self.db)
+        job_store.run_job(job_id, lambda number: {'error': 'No registration signal within 10s'},
+                          delay=0, db_path=self.db)
+        results, _ = job_store.results_since(job_id, 0, db_path=self.db)
+        self.assertEqual(results, [{'number': '+14155550100', 'error': 'No registration signal within 10s'}])
+        self.assertIsNone(lookup_result('+14155550100'))
+
+    def test_cached_errors_are_checked_again(self):
+        store_result('+14155550100', {'error': 'Browser crashed'})
+        store_result('+14155550101', False)
+        job_id = job_store.enqueue_job(['+14155550100', '+14155550101'], db_path=self.db)
+        job_store.claim_job('a', self.db)
+        check = FakeStrategy(True)
+        job_store.run_job(job_id, check, delay=0, db_path=self.db)
+
+        self.assertEqual(check.calls, 1)
+        results, _ = job_store.results_since(job_id, 0, db_path=self.db)
+        self.assertEqual([result['registered'] for result in results], [True, False])
+        self.assertIs(lookup_result('+14155550100'), True)
+
+    def test_results_stop_at_the_first_pending_row(self):
+        job_id = job_store.enqueue_job(['+14155550100', '+14155550101', '+14155550102'], db_path=self.db)
+        with job_store.connect(self.db) as conn:
+            conn.execute('UPDATE job_results SET registered = 0, checked_at = ? WHERE job_id = ? AND position != 1',
+                         (time.time(), job_id))
+        results, cursor = job_store.results_since(job_id, 0, db_path=self.db)
+        self.assertEqual((len(results), cursor), (1, 1))
+
+
+class ResultCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.cache = ResultCache(temp_path(self, 'cache.sqlite3'), positive_ttl=300,
+                                 negative_ttl=100, error_ttl=10)
+
+    def aged(self, seconds):
+        """Patch the cache clock ``seconds`` into the future"""
+        return mock.patch('whatsapp.result_cache.time.time', return_value=time.time() + seconds)
+
+    def test_each_status_has_its_own_ttl(self):
+        store_result('+14155550100', True, self.cache)
+        store_result('+14155550101', False, self.cache)
+        store_result('+14155550102', {'error': 'timeout'}, self.cache)
+
+        with self.aged(50):
+            self.assertIs(lookup_result('+14155550100', self.cache), True)
+            self.assertIs(lookup_result('+14155550101', self.cache), False)
+            self.assertIsNone(lookup_result('+14155550102', self.cache))
+        with self.aged(200):
+            self.assertIs(lookup_result('+14155550100', self.cache), True)
+            self.assertIsNone(lookup_result('+14155550101', self.cache))
+        with self.aged(400):
+            self.assertIsNone(lookup_result('+14155550100', self.cache))
+
+    def test_errors_are_only_reused_briefly(self):
+        store_result('+14155550100', {'error': 'WebDriver error'}, self.cache)
+        self.assertEqual(lookup_result('+14155550100', self.cache), {'error': 'WebDriver error'})
+        with self.aged(11):
+            self.assertIsNone(lookup_result('+14155550100', self.cache))
+
+        # A later verdict replaces the error
+        store_result('+14155550100', True, self.cache)
+        with self.aged(11):
+            self.assertIs(lookup_result('+14155550100', self.cache), True)
+
+    def test_keyed_by_e164_and_kept_on_disk(self):
+        store_result('+1 (415) 555-0100', True, self.cache)
+        fresh = ResultCache(self.cache.db_path, positive_ttl=300)
+        self.assertIs(lookup_result('14155550100', fresh), True)
+        self.assertIsNone(lookup_result('not a number', fresh))
+
+    def test_only_checker_results_are_stored(self):
+        store_result('+14155550100', None, self.cache)
+        store_result('+14155550101', {'registered': True}, self.cache)
+        self.assertIsNone(lookup_result('+14155550100', self.cache))
+        self.assertIsNone(lookup_result('+14155550101', self.cache))
+
+
+class GroupNumbersTests(SimpleTestCase):
+
+    def test_formats_of_one_number_collapse(self):
+        groups = group_numbers(['+91 98765-43210', '+14155550100', '919876543210', '(91) 98765 43210'])
+        self.assertEqual(groups, {'+919876543210': [0, 2, 3], '+14155550100': [1]})
+
+    def test_first_appearance_order_and_invalid_numbers(self):
+        groups = group_numbers(['12345', '+14155550100', '1-2-3-4-5'])
+        self.assertEqual(list(groups), ['+12345', '+14155550100'])
+        self.assertEqual(groups['+12345'], [0, 2])
+
+
+class IngestTests(SimpleTestCase):
+
+    def numbers(self, data, filename):
+        return list(extract_numbers(io.BytesIO(data), filename))
+
+    def test_text_numbers_are_e164(self):
+        data = b'call +91 98765-43210 or (415) 555-0100\n919876543210\nshort 12345\n'
+        self.assertEqual(self.numbers(data, 'contacts.txt'),
+                         ['+919876543210', '+4155550100', '+919876543210'])
+
+    def test_csv_reads_the_phone_columns(self):
+        data = 'Name,Mobile,Notes\nA,+1 415 555 0100,10000000000 apples\nB,,\nC,14155550101,x\n'.encode()
+        self.assertEqual(self.numbers(data, 'contacts.csv'), ['+14155550100', '+14155550101'])
+
+    def test_csv_without_header_uses_the_first_number_cell(self):
+        data = b'A,+14155550100\n14155550101,B\n'
+        self.assertEqual(self.numbers(data, 'CONTACTS.CSV'), ['+14155550100', '+14155550101'])
+
+    def test_xlsx_reads_float_cells(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['Name', 'Phone'])
+        sheet.append(['A', 919876543210.0])
+        sheet.append(['B', '+1 415 555 0100'])
+        sheet.append(['C', None])
+        data = io.BytesIO()
+        workbook.save(data)
+        self.assertEqual(self.numbers(data.getvalue(), 'contacts.xlsx'), ['+919876543210', '+14155550100'])
+
+    def test_xls_reads_float_cells(self):
+        try:
+            import xlrd  # noqa: F401
+            import xlwt
+        except ImportError:
+            self.skipTest('xlrd and xlwt are needed for .xls files')
+
+        workbook = xlwt.Workbook()
+        sheet = workbook.add_sheet('Contacts')
+        for row, values in enumerate([['Name', 'Phone'], ['A', 919876543210.0], ['B', '+1 415 555 0100']]):
+            for column, value in enumerate(values):
+                sheet.write(row, column, value)
+        data = io.BytesIO()
+        workbook.save(data)
+        self.assertEqual(self.numbers(data.getvalue(), 'contacts.xls'), ['+919876543210', '+14155550100'])
+
+    def test_flask_upload_streams_the_whole_file(self):
+        import app
+
+        numbers = ['+1415555%04d' % i for i in range(3000)]
+        data = io.BytesIO('\n'.join(numbers).encode())
+        response = app.app.test_client().post('/api/upload-file', data={'file': (data, 'contacts.txt')},
+                                              content_type='multipart/form-data')
+        self.assertEqual(json.loads(response.get_data(as_text=True)),
+                         {'success': True, 'numbers': numbers, 'total_found': 3000})
+
+    def test_malformed_input(self):
+        # Undecodable bytes are replaced, not fatal
+        self.assertEqual(self.numbers(b'\xff\xfe+14155550100\n\x00\x81', 'contacts.txt'), ['+14155550100'])
+        self.assertEqual(self.numbers(b'', 'contacts.csv'), [])
+        with self.assertRaises(ValueError):
+            extract_numbers(io.BytesIO(b'+14155550100'), 'contacts.pdf')
+        with self.assertRaises(Exception):
+            self.numbers(b'not a workbook', 'contacts.xlsx')
+
+    def test_json_stream(self):
+        numbers = ['+1415555%04d' % i for i in range(2500)] + ['+14155550000']
+        body = json_stream(unique_numbers(numbers), lambda count: {'count': count})
+        self.assertEqual(json.loads(''.join(body)),
+                         {'success': True, 'numbers': numbers[:2500], 'count': 2500})
+        self.assertIsNone(json_stream(iter([]), lambda count: {}))
+
+        def broken():
+            yield '+14155550100'
+            raise OSError('disk gone')
+        document = json.loads(''.join(json_stream(broken(), lambda count: {'count': count})))
+        self.assertEqual(document['count'], 1)
+        self.assertIn('disk gone', document['error'])
+
+
+class EventStreamTests(SimpleTestCase):
+
+    def test_resume_cursor(self):
+        self.assertEqual(sse.resume_cursor('7', '3'), 7)
+        self.assertEqual(sse.resume_cursor(None, '3'), 3)
+        self.assertEqual(sse.resume_cursor('garbage', '3'), 3)
+        self.assertEqual(sse.resume_cursor('-4', None), 0)
+        self.assertEqual(sse.resume_cursor(None, None), 0)
+
+    def test_events_continue_after_the_cursor(self):
+        rows = [{'number': f'+1415555010{i}', 'registered': True, 'message': ''} for i in range(4)]
+        counters = {'job_id': 1, 'status': 'done', 'running': False, 'progress': 4, 'total': 4}
+        events = list(sse.job_events(lambda: counters, lambda since: (rows[since:], len(rows)),
+                                     cursor=2, poll_interval=0))
+        ids = [line for event in events for line in event.splitlines() if line.startswith('id: ')]
+        self.assertEqual(ids, ['id: 3', 'id: 4', 'id: 4'])
+        self.assertTrue(events[-1].startswith('id: 4\nevent: done'))
+
+
+class JobEventsViewTests(TestCase):
+
+    def test_last_event_id_resumes_the_stream(self):
+        job = enqueue_job(['+14155550100', '+14155550101', '+14155550102'])
+        job.results.update(registered=False, checked_at=timezone.now())
+        job.status, job.progress = job.DONE, 3
+        job.save()
+
+        response = self.client.get(f'/api/jobs/{job.pk}/events/?since=0', HTTP_LAST_EVENT_ID='1')
+        body = b''.join(response.streaming_content).decode()
+        numbers = [json.loads(line[6:])['number'] for line in body.splitlines()
+                   if line.startswith('data: ') and 'number' in line]
+        self.assertEqual(numbers, ['+14155550101', '+14155550102'])
+        self.assertIn('event: done', body)
+
+
+class VerdictTests(SimpleTestCase):
+
+    def test_from_result(self):
+        registered = Verdict.from_result('+14155550100', True, 'compose-url', seconds=1.5)
+        self.assertEqual((registered.status, registered.registered, registered.seconds),
+                         ('registered', True, 1.5))
+        self.assertIs(Verdict.from_result('+14155550100', False, 'compose-url').registered, False)
+
+        failed = Verdict.from_result('+14155550100', {'error': 'timeout'}, 'compose-url')
+        self.assertEqual((failed.status, failed.registered, failed.error), ('error', None, 'timeout'))
+        self.assertEqual(failed.as_result(), {'error': 'timeout'})
+
+    def test_anything_else_is_an_error(self):
+        for result in (None, 1, 'yes', {'registered': True}, {'error': ''}):
+            verdict = Verdict.from_result('+14155550100', result, 'compose-url')
+            self.assertEqual(verdict.status, 'error', result)
+            self.assertIsNone(verdict.registered)
+
+
+class RerenderingDriver:
+    """Probe target whose first scripts run while the page is being replaced"""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self._network_log = False
+
+    def execute_script(self, script, *args):
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'signal': 'registered', 'selector': 'footer', 'elapsed': 0.5}
+
+
+class ReadinessTests(SimpleTestCase):
+
+    def errors(self):
+        from selenium.common.exceptions import JavascriptException, StaleElementReferenceException
+
+        return [JavascriptException('document unloaded'), StaleElementReferenceException('stale')]
+
+    def test_wait_for_outcome_polls_through_a_rerender(self):
+        from whatsapp.readiness import wait_for_outcome
+
+        outcome = wait_for_outcome(RerenderingDriver(self.errors()), timeout=2, poll=0.01)
+        self.assertEqual(outcome['signal'], 'registered')
+
+    def test_network_outcome_polls_through_a_rerender(self):
+        from whatsapp.network_detector import wait_for_network_outcome
+
+        outcome = wait_for_network_outcome(RerenderingDriver(self.errors()), timeout=2, poll=0.01)
+        self.assertEqual((outcome['signal'], outcome['source']), ('registered', 'dom'))
+
+    def test_network_detector_is_for_the_stub_only(self):
+        from whatsapp.network_detector import LIVE_BASE_URL, network_detection_enabled
+
+        with mock.patch.object(config, 'DETECTOR', 'network'):
+            with mock.patch.object(config, 'BASE_URL', LIVE_BASE_URL):
+                self.assertFalse(network_detection_enabled())
+            with mock.patch.object(config, 'BASE_URL', 'http://127.0.0.1:8765'):
+                self.assertTrue(network_detection_enabled())
+
+
+class SpaNavigationTests(SimpleTestCase):
+
+    def open_compose(self, driver, in_app_outcome):
+        from whatsapp import spa
+
+        reload_outcome = {'signal': 'registered', 'selector': 'footer'}
+        with mock.patch.object(spa, '_open_in_app', return_value=('link', in_app_outcome)) as in_app, \
+                mock.patch.object(spa, 'navigate'), \
+                mock.patch.object(spa, '_detector', return_value=lambda *args, **kwargs: dict(reload_outcome)):
+            outcome = spa.open_compose(driver, '14155550100', timeout=1, mode='spa')
+        return in_app.called, outcome['navigation']
+
+    def test_in_app_navigation_is_retried_after_failing(self):
+        from whatsapp.spa import MAX_SPA_FAILURES, SPA_RETRY_AFTER
+
+        driver = mock.Mock(spec=[])
+        for _ in range(MAX_SPA_FAILURES):
+            self.assertEqual(self.open_compose(driver, None), (True, 'reload'))
+        for _ in range(SPA_RETRY_AFTER):
+            self.assertEqual(self.open_compose(driver, None), (False, 'reload'))
+
+        # One more try, and a verdict puts the browser back on in-app navigation
+        self.assertEqual(self.open_compose(driver, {'signal': 'registered', 'navigation': 'spa-link'}),
+                         (True, 'spa-link'))
+        self.assertEqual(driver._spa_failures, 0)
+        self.assertEqual(self.open_compose(driver, None), (True, 'reload'))
+
+
+class FakeBrowser:
+    """Logged-in WebDriver stand-in for the browser pool"""
+
+    window_handles = ['main']
+
+    def get(self, url):
+        pass
+
+    def find_elements(self, by, selector):
+        return ['chat-list']
+
+    def quit(self):
+        pass
+
+
+class BrowserPoolTests(SimpleTestCase):
+
+    def test_discarding_a_browser_wakes_a_waiting_checkout(self):
+        import threading
+
+        from whatsapp.browser_pool import BrowserPool
+
+        pool = BrowserPool(FakeBrowser, size=1)
+        self.addCleanup(pool.close)
+        busy = pool.checkout()
+        waited = []
+
+        def borrow():
+            started = time.time()
+            pool.checkin(pool.checkout(timeout=5))
+            waited.append(time.time() - started)
+
+        thread = threading.Thread(target=borrow)
+        thread.start()
+        time.sleep(0.1)
+        # The slot frees up without a browser coming back to the idle list
+        pool.checkin(busy, healthy=False)
+        thread.join(5)
+        self.assertLess(waited[0], 1)
+        self.assertEqual(pool.stats(), {'size': 1, 'live': 1, 'idle': 1, 'in_use': 0})
+
+
+class StubServerTests(SimpleTestCase):
+
+    def test_outcome_table(self):
+        table = OutcomeTable({'+91 98765-43210': 'no_answer'}, default='registered')
+        self.assertEqual(table.outcome('919876543210'), 'no_answer')
+        self.assertEqual(table.outcome('+14155550100'), 'registered')
+
+    def test_default_share_is_stable_per_number(self):
+        table = OutcomeTable(default='0.3')
+        numbers = ['+1415555%04d' % i for i in range(2000)]
+        outcomes = [table.outcome(number) for number in numbers]
+        self.assertEqual(outcomes, [table.outcome(number) for number in numbers])
+        self.assertAlmostEqual(outcomes.count('registered') / len(numbers), 0.3, delta=0.05)
+        self.assertEqual(OutcomeTable(default=0).outcome('+14155550100'), 'not_registered')
+
+    def test_latency(self):
+        rng = random.Random(1)
+        self.assertEqual(Latency('fixed:0.3').sample(rng), 0.3)
+        samples = [Latency('uniform:0.1,0.2').sample(rng) for _ in range(100)]
+        self.assertTrue(all(0.1 <= sample <= 0.2 for sample in samples))
+        # Negative draws are clipped
+        self.assertEqual(Latency('normal:-5,0.1').sample(rng), 0.0)
+        self.assertAlmostEqual(Latency('uniform:0.1,0.5').mean(), 0.3)
+
+    def test_latency_spec_errors(self):
+        for spec in ('gamma:1', 'uniform:0.1', 'fixed:fast', 'normal'):
+            with self.assertRaises(ValueError, msg=spec):
+                Latency(spec)
+
+
+class BrowserOwnerTests(TestCase):
+    """Browser checks run in run_check_worker only; the web workers queue them"""
+
+    def setUp(self):
+        patcher = mock.patch.object(result_cache, '_cache', ResultCache(temp_path(self, 'cache.sqlite3')))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, url, body):
+        return self.client.post(url, json.dumps(body), content_type='application/json')
+
+    def test_only_the_check_worker_warms_up(self):
+        with mock.patch.object(config, 'PREWARM', True), mock.patch.dict('os.environ', {'RUN_MAIN': 'true'}):
+            self.assertTrue(warmup.should_warm_up(['manage.py', 'run_check_worker']))
+            self.assertTrue(warmup.should_warm_up(['app.py']))
+            for argv in (['gunicorn', 'whatsapp_django.wsgi'], ['manage.py', 'runserver'], ['manage.py', 'migrate']):
+                self.assertFalse(warmup.should_warm_up(argv), argv)
+
+    def test_browser_check_is_queued_for_the_worker(self):
+        with mock.patch.object(config, 'SINGLE_CHECK_WAIT', 0):
+            response = self.post('/api/check-single/', {'number': '+14155550100', 'strategy': 'spa-route'})
+        self.assertEqual(response.status_code, 202)
+        job = CheckJob.objects.get(pk=response.json()['job_id'])
+        self.assertEqual((job.strategy, list(job.results.values_list('number', flat=True))),
+                         ('spa-route', ['+14155550100']))
+
+    def test_cached_verdicts_and_browser_free_strategies_need_no_worker(self):
+        store_result('+14155550100', True)
+        self.assertIs(self.post('/api/check-single/', {'number': '+1 415 555 0100'}).json()['registered'], True)
+        self.assertIn('registered', self.post('/api/check-single/', {'number': '+14155550101', 'strategy': 'mock'}).json())
+        self.assertFalse(CheckJob.objects.exists())
+
+    def test_command_line_checks_go_through_the_worker(self):
+        from django.core.management import call_command
+
+        out = io.StringIO()
+        call_command('check_whatsapp_number', number='+14155550100', strategy='compose-url', timeout=0, stdout=out)
+        job = CheckJob.objects.get()
+        self.assertEqual((job.strategy, job.total), ('compose-url', 1))
+        self.assertIn(f'Job {job.pk} is not finished', out.getvalue())
+
+        out = io.StringIO()
+        call_command('check_whatsapp_number', number='+14155550101', strategy='mock', stdout=out)
+        self.assertEqual(CheckJob.objects.count(), 1)
+        self.assertIn('registered on WhatsApp', out.getvalue())
+
+    def test_session_status_comes_from_the_worker(self):
+        self.assertFalse(self.client.get('/api/session-status/').json()['initialized'])
+        self.assertFalse(self.post('/api/initialize/', {}).json()['success'])
+
+        publish_worker_status('host:1', {'state': 'ready'}, {'live': 1})
+        status = self.client.get('/api/session-status/').json()
+        self.assertEqual((status['ready'], status['driver_active'], status['worker']), (True, True, 'host:1'))
+
+        self.assertTrue(self.post('/api/initialize/', {}).json()['success'])
+        self.assertTrue(publish_worker_status('host:1', {'state': 'ready'}, {'live': 1}))
+        self.assertFalse(publish_worker_status('host:1', {'state': 'ready'}, {'live': 1}))
+
+
+class JobRunnerTests(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(result_cache, '_cache', ResultCache(temp_path(self, 'cache.sqlite3')))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_progress_counts_each_row_once(self):
+        job = enqueue_job(['+14155550100', '+1 415 555 0100', '+14155550101', '+14155550102'])
+        claim_job('a')
+
+        def check(number):
+            # Another worker, presumed dead, still checks the last number
+            if number == '+14155550100':
+                CheckResult.objects.filter(job=job, position=3).update(
+                    registered=False, checked_at=timezone.now(),
+                )
+                CheckJob.objects.filter(pk=job.pk).update(progress=1)
+            return True
+
+        run_job(job, check, delay=0)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress), (CheckJob.DONE, 4))
+        self.assertIs(job.results.get(position=3).registered, False)
+
+    def test_only_verdicts_are_reused(self):
+        store_result('+14155550100', {'error': 'Browser crashed'})
+        store_result('+14155550101', True)
+        job = enqueue_job(['+14155550100', '+14155550101', '+14155550102'])
+        claim_job('a')
+        check = FakeStrategy({'error': 'No registration signal within 10s'})
+        run_job(job, check, delay=0)
+
+        self.assertEqual(check.calls, 2)
+        self.assertEqual([(row.registered, row.error) for row in job.results.order_by('position')], [
+            (None, 'No registration signal within 10s'), (True, ''), (None, 'No registration signal within 10s'),
+        ])
+        self.assertIsNone(lookup_result('+14155550102'))
+
+
+class LinkedProfileTests(SimpleTestCase):
+
+    def template(self, name):
+        path = temp_path(self, name)
+        os.makedirs(os.path.join(path, config.CHROME_PROFILE_NAME))
+        with open(os.path.join(path, config.CHROME_PROFILE_NAME, 'Preferences'), 'w') as f:
+            f.write(name)
+        return path
+
+    def test_one_linked_profile_per_worker(self):
+        templates = [self.template('first'), self.template('second')]
+        clones = profiles.clone_worker_profiles(2, templates, base_dir=temp_path(self, 'clones'))
+        self.addCleanup(profiles.remove_worker_profiles, clones)
+        for clone, name in zip(clones, ['first', 'second']):
+            with open(os.path.join(clone, config.CHROME_PROFILE_NAME, 'Preferences')) as f:
+                self.assertEqual(f.read(), name)
+
+        # Two copies of one linked device would take the session from each other
+        with self.assertRaises(ValueError):
+            profiles.clone_worker_profiles(3, templates, base_dir=temp_path(self, 'clones'))
+
+    def test_linked_profiles_come_from_the_settings(self):
+        with mock.patch.object(config, 'CHROME_PROFILE_DIR', '/a'), \
+                mock.patch.object(config, 'LINKED_PROFILES', ['/b', '/a', '/c']):
+            self.assertEqual(profiles.linked_profiles(), ['/a', '/b', '/c'])
@@ -1,9 +1,9 @@
-﻿﻿from django.urls import path
+﻿from django.urls import path
 from . import views
 
 urlpatterns = [
     path('', views.index, name='home'),
-    path('api/initialize/', views.session_status, name='initialize'),
+    path('api/initialize/', views.initialize_session, name='initialize'),
     path('api/check-single/', views.check_single, name='check_single'),
     path('api/check-single-smart/', views.check_single_smart, name='check_single_smart'),
     path('api/check-batch/', views.check_batch, name='check_batch'),
@@ -1,37 +1,51 @@
 ﻿from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import json
-import threading
-import time
 from datetime import datetime
-import csv
-import io
-
-# Global variables for batch processing
-checking_status = {
-    'running': False,
-    'progress': 0,
-    'total': 0,
-    'results': []
-}
-
-def check_whatsapp_registration_compose_url(number):
+
+from whatsapp import config, sse
+from whatsapp.browser_pool import PoolTimeout, get_pool
+from whatsapp.driver_factory import create_driver
+from whatsapp.ingest import extract_numbers, json_stream, unique_numbers
+from whatsapp.profiles import linked_profiles
+from whatsapp.resource_blocking import page_traffic
+from whatsapp.spa import open_compose
+from whatsapp.result_cache import lookup_result
+from whatsapp.strategies import CACHE_STRATEGY, UnknownStrategy, Verdict, get_strategy, strategies
+from whatsapp.warmup import start_warmup
+
+from .jobs import enqueue_job, job_counters, request_warmup, results_since, wait_for_results, worker_status
+from .models import CheckJob
+
+# Checker used when neither the request nor WHATSAPP_STRATEGY names one
+DEFAULT_STRATEGY = 'compose-url'
+
+def create_compose_driver(user_data_dir=None):
+    '''Launch Chrome with the logged-in profile used by the compose URL checker'''
+    # Flags, page load strategy and resource blocking come from the
+    # configured profile (WHATSAPP_DRIVER_PROFILE, see whatsapp.driver_factory)
+    return create_driver(user_data_dir=user_data_dir)
+
+def warm_up_pool():
+    '''Launch and log in the pool browsers in the background (see whatsapp.warmup)'''
+    return start_warmup(lambda: get_pool(create_compose_driver).prewarm(),
+                        min(config.POOL_SIZE, len(linked_profiles())))
+
+def check_whatsapp_registration_compose_url(number, mode=None):
     '''
     Check if a phone number is registered on WhatsApp using compose URL method
     This method works for ANY number, not just non-contacts
+    
+    Returns True/False, or {'error': ...} when no verdict could be reached
+    (so failures are never mistaken for, or cached as, "not registered").
+    ``mode`` is the navigation ('spa' or 'reload'), WHATSAPP_NAVIGATION_MODE by default
     '''
     print(f' Checking WhatsApp registration for: {number}')
     
     try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
         import re
-        import os
         
         # Clean and format the number
         clean_number = re.sub(r'[^\d+]', '', number)
@@ -40,106 +54,60 @@ def check_whatsapp_registration_compose_url(number):
         
         print(f' Cleaned number: {clean_number}')
         
-        # Chrome profile path
-        profile_path = r'C:\num\chrome_profile'
-        
-        # Chrome options
-        chrome_options = Options()
-        chrome_options.add_argument(f'--user-data-dir={profile_path}')
-        chrome_options.add_argument('--profile-directory=Default')
-        chrome_options.add_argument('--disable-notifications')
-        chrome_options.add_argument('--disable-popup-blocking')
-        chrome_options.add_argument('--disable-infobars')
-        chrome_options.add_argument('--no-first-run')
-        chrome_options.add_argument('--no-default-browser-check')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--disable-images')
-        chrome_options.add_argument('--disable-plugins')
-        chrome_options.add_argument('--disable-extensions')
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.maximize_window()
+        # Borrow a warm, logged-in browser instead of cold-starting Chrome
+        pool = get_pool(create_compose_driver)
+        with pool.driver() as driver:
+            return _check_compose_url(driver, clean_number, mode)
+            
+    except PoolTimeout as e:
+        print(f' Browser pool busy: {str(e)}')
+        return {'error': f'Browser pool busy: {str(e)}'}
+    except Exception as e:
+        print(f' WebDriver error: {str(e)}')
+        return {'error': f'WebDriver error: {str(e)}'}
+
+def _check_compose_url(driver, clean_number, mode=None):
+    # Open the compose chat inside the running app when possible, with a
+    # full load of the compose URL as fallback; either way the "not on
+    # WhatsApp" alert is raced against the chat interface
+    print(f' Opening compose chat for: {clean_number}')
+    outcome = open_compose(driver, clean_number, timeout=config.DETECT_TIMEOUT, mode=mode)
+    traffic = page_traffic(driver)
+    
+    try:
+        if traffic:
+            print(f' Transferred {traffic["bytes"] / 1024:.0f} KB in {traffic["requests"]} requests')
+        print(f' Signal: {outcome["signal"]} ({outcome["selector"]}) after {outcome["elapsed"]}s'
+              f' via {outcome["navigation"]}, from the {outcome.get("source") or "dom"}')
         
-        # Go to WhatsApp Web compose URL
-        compose_url = f'https://web.whatsapp.com/send?phone={clean_number}'
-        print(f' Opening compose URL: {compose_url}')
+        if outcome['signal'] == 'not_registered':
+            print(' Number NOT registered on WhatsApp')
+            return False
         
-        driver.get(compose_url)
-        time.sleep(1)
+        if outcome['signal'] == 'registered':
+            print(' Number IS registered on WhatsApp')
+            return True
         
-        # Wait for page to load completely
-        wait = WebDriverWait(driver, 5)
+        if outcome['signal'] == 'login_required':
+            print(' WhatsApp Web is not logged in')
+            return {'error': 'WhatsApp Web is not logged in'}
         
-        print(' Waiting for WhatsApp Web to load...')
+        # No signal: the compose URL is in the address bar either way (the
+        # in-app route pushes it before anything renders), so it says nothing
+        print(' Unable to determine registration status clearly')
+        return {'error': f'No registration signal within {config.DETECT_TIMEOUT}s'}
         
-        # Check for various indicators
-        try:
-            # Method 1: Look for error message about number not on WhatsApp
-            error_selectors = [
-                '[data-testid="alert-phone-number-not-on-whatsapp"]',
-                '[data-testid="invalid-phone-number"]',
-                'div[data-animate-alert-toast="true"]',
-                'div[role="alert"]'
-            ]
-            
-            for selector in error_selectors:
-                try:
-                    error_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    error_text = error_element.text.lower()
-                    print(f' Error found: {error_text}')
-                    
-                    if any(phrase in error_text for phrase in ['not on whatsapp', 'invalid', 'not found']):
-                        print(' Number NOT registered on WhatsApp')
-                        return False
-                        
-                except Exception:
-                    continue
-            
-            # Method 2: Check if we reach the chat interface
-            chat_selectors = [
-                '[data-testid="conversation-compose-box-input"]',
-                'div[contenteditable="true"][data-tab="10"]',
-                '[data-testid="msg-container"]',
-                'footer[data-testid="compose"]'
-            ]
-            
-            for selector in chat_selectors:
-                try:
-                    chat_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    print(f' Chat interface found: {selector}')
-                    print(' Number IS registered on WhatsApp')
-                    return True
-                except Exception:
-                    continue
-            
-            # Method 3: Check URL for success/failure patterns
-            time.sleep(3)
-            current_url = driver.current_url
-            print(f' Current URL: {current_url}')
-            
-            if 'send?phone=' in current_url and clean_number in current_url:
-                # Still on compose URL might mean success
-                print(' Still on compose URL - likely registered')
-                return True
-            
-            print(' Unable to determine registration status clearly')
-            return False
-            
-        except Exception as e:
-            print(f' Error during checking: {str(e)}')
-            return False
-            
     except Exception as e:
-        print(f' WebDriver error: {str(e)}')
-        return False
-        
-    finally:
-        try:
-            driver.quit()
-            print(' Browser closed')
-        except:
-            pass
+        print(f' Error during checking: {str(e)}')
+        return {'error': f'Error during checking: {str(e)}'}
+
+def check_whatsapp_registration_spa_route(number):
+    '''Compose URL check routed inside the running app (the 'spa-route' strategy)'''
+    return check_whatsapp_registration_compose_url(number, mode='spa')
+
+def check_whatsapp_registration_compose_reload(number):
+    '''Compose URL check with a full page load (the 'compose-reload' strategy)'''
+    return check_whatsapp_registration_compose_url(number, mode='reload')
 
 def index(request):
     return render(request, 'index.html')
@@ -150,7 +118,29 @@ def home(request):
 @csrf_exempt
 @require_http_methods(['POST'])
 def initialize_session(request):
-    return JsonResponse({'success': True, 'message': 'Django session ready'})
+    # The browsers belong to run_check_worker, which warms them up at start;
+    # this asks it to retry a warm-up that failed or found WhatsApp Web logged out
+    if not request_warmup():
+        return JsonResponse({'success': False, 'message': 'No check worker is running (manage.py run_check_worker)'})
+    return JsonResponse({'success': True, 'message': 'Browser warm-up requested from the check worker'})
+
+def _worker_check(number, strategy):
+    '''
+    Check one number in run_check_worker, the only process that has browsers.
+
+    Returns:
+        tuple: (Verdict, or None if the worker did not answer in time, job id)
+    '''
+    cached = lookup_result(number)
+    if isinstance(cached, bool):
+        return Verdict.from_result(number, cached, CACHE_STRATEGY, cached=True), None
+
+    job = enqueue_job([number], strategy.name)
+    if not wait_for_results(job, config.SINGLE_CHECK_WAIT):
+        return None, job.pk
+    item = job.results.get()
+    result = {'error': item.error} if item.error else item.registered
+    return Verdict.from_result(number, result, strategy.name), job.pk
 
 @csrf_exempt
 @require_http_methods(['POST'])
@@ -162,13 +152,40 @@ def check_single(request):
         if not number:
             return JsonResponse({'error': 'No number provided'}, status=400)
         
-        print(f'[DJANGO DEBUG] Checking {number}...')
-        result = check_whatsapp_registration_compose_url(number)
+        # Optional "strategy" picks the checker for this request (see whatsapp.strategies)
+        try:
+            strategy = get_strategy(data.get('strategy'), default=DEFAULT_STRATEGY)
+        except UnknownStrategy as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        
+        print(f'[DJANGO DEBUG] Checking {number} with {strategy.name}...')
+        if not strategy.browser:
+            verdict = strategy.check(number)
+        else:
+            verdict, job_id = _worker_check(number, strategy)
+            if verdict is None:
+                # Still queued or running; its result shows up under the job
+                return JsonResponse({
+                    'number': number,
+                    'error': f'No answer from the check worker within {config.SINGLE_CHECK_WAIT:.0f}s',
+                    'job_id': job_id,
+                    'strategy': strategy.name,
+                    'timestamp': datetime.now().strftime('%H:%M:%S')
+                }, status=202)
+        
+        if verdict.registered is None:
+            return JsonResponse({
+                'number': number,
+                'error': verdict.error,
+                'strategy': verdict.strategy,
+                'timestamp': datetime.now().strftime('%H:%M:%S')
+            })
         
         return JsonResponse({
             'number': number,
-            'registered': result,
-            'message': 'REGISTERED on WhatsApp' if result else 'NOT REGISTERED on WhatsApp',
+            'registered': verdict.registered,
+            'message': 'REGISTERED on WhatsApp' if verdict.registered else 'NOT REGISTERED on WhatsApp',
+            'strategy': verdict.strategy,
             'timestamp': datetime.now().strftime('%H:%M:%S')
         })
     except Exception as e:
@@ -177,8 +194,6 @@ def check_single(request):
 @csrf_exempt
 @require_http_methods(['POST'])
 def check_batch(request):
-    global checking_status
-    
     try:
         data = json.loads(request.body)
         numbers = data.get('numbers', [])
@@ -186,43 +201,98 @@ def check_batch(request):
         if not numbers:
             return JsonResponse({'error': 'No numbers provided'}, status=400)
         
-        checking_status = {'running': True, 'progress': 0, 'total': len(numbers), 'results': []}
+        # Optional "strategy" for the whole batch, else the worker's own
+        strategy = data.get('strategy') or ''
+        if strategy:
+            try:
+                get_strategy(strategy)
+            except UnknownStrategy as e:
+                return JsonResponse({'error': str(e)}, status=400)
         
-        def batch_process():
-            global checking_status
-            print(f'[BATCH] Starting batch of {len(numbers)} numbers')
-            for i, number in enumerate(numbers):
-                try:
-                    result = check_whatsapp_registration_compose_url(number.strip())
-                    checking_status['results'].append({
-                        'number': number,
-                        'registered': result,
-                        'message': 'REGISTERED on WhatsApp' if result else 'NOT REGISTERED on WhatsApp'
-                    })
-                    checking_status['progress'] = i + 1
-                    time.sleep(3)
-                except Exception as e:
-                    checking_status['results'].append({
-                        'number': number,
-                        'error': str(e)
-                    })
-            checking_status['running'] = False
+        # The run_check_worker command picks the job up from the database
+        job = enqueue_job(numbers, strategy)
+        print(f'[BATCH] Queued job {job.pk} with {job.total} numbers')
         
-        thread = threading.Thread(target=batch_process)
-        thread.daemon = True
-        thread.start()
-        
-        return JsonResponse({'message': 'Batch checking started', 'total': len(numbers)})
+        return JsonResponse({'message': 'Batch checking started', 'total': job.total, 'job_id': job.pk})
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
 def get_status(request):
-    return JsonResponse(checking_status)
+    job = CheckJob.objects.first()
+    if job is None:
+        return JsonResponse({'running': False, 'progress': 0, 'total': 0, 'results': []})
+    
+    return JsonResponse({
+        'job_id': job.pk,
+        'running': job.running,
+        'progress': job.progress,
+        'total': job.total,
+        'results': [r.as_dict() for r in job.results.filter(checked_at__isnull=False)]
+    })
+
+def job_status(request, job_id):
+    '''Counters only; poll this instead of /api/status/ for large batches'''
+    job = CheckJob.objects.filter(pk=job_id).first()
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    return JsonResponse(job_counters(job))
+
+def job_results(request, job_id):
+    '''Results checked since the cursor, e.g. /api/jobs/7/results/?since=120'''
+    job = CheckJob.objects.filter(pk=job_id).first()
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    try:
+        since = max(0, int(request.GET.get('since', 0)))
+        limit = int(request.GET.get('limit', 500))
+    except ValueError:
+        return JsonResponse({'error': 'since and limit must be integers'}, status=400)
+
+    results, cursor = results_since(job, since, limit)
+    return JsonResponse({
+        'job_id': job.pk,
+        'results': results,
+        'cursor': cursor,
+        'complete': not job.running and cursor >= job.total,
+    })
+
+def job_events(request, job_id):
+    '''Server-sent events: one "result" event per checked number, then "done"'''
+    if not CheckJob.objects.filter(pk=job_id).exists():
+        return JsonResponse({'error': 'Job not found'}, status=404)
+
+    def fetch_counters():
+        job = CheckJob.objects.filter(pk=job_id).first()
+        return job_counters(job) if job else None
+
+    def fetch_results(cursor):
+        return results_since(CheckJob(pk=job_id), cursor)
+
+    cursor = sse.resume_cursor(request.headers.get('Last-Event-ID'), request.GET.get('since'))
+    response = StreamingHttpResponse(
+        sse.job_events(fetch_counters, fetch_results, cursor),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 def session_status(request):
+    # Published by run_check_worker, whose browsers this process cannot see
+    worker = worker_status()
+    warmup = worker.warmup if worker else {'state': 'cold'}
+    pool = worker.pool if worker else None
     return JsonResponse({
-        'initialized': True,
-        'driver_active': True
+        # Checks work either way while a worker runs; without a warm
+        # browser the first one pays for the launch and login restore
+        'initialized': worker is not None,
+        'driver_active': bool(pool and pool['live']),
+        'ready': warmup.get('state') == 'ready',
+        'warmup': warmup,
+        'pool': pool,
+        'worker': worker.name if worker else None,
+        'strategy': get_strategy(default=DEFAULT_STRATEGY).name,
+        'strategies': strategies(),
     })
 
 @csrf_exempt
@@ -234,49 +304,25 @@ def upload_file(request):
         
         uploaded_file = request.FILES['file']
         
-        if uploaded_file.size > 5 * 1024 * 1024:  # 5MB limit
-            return JsonResponse({'error': 'File too large (max 5MB)'}, status=400)
-        
-        numbers = []
-        file_name = uploaded_file.name.lower()
+        if uploaded_file.size > config.UPLOAD_MAX_SIZE:
+            return JsonResponse({'error': f'File too large (max {config.UPLOAD_MAX_SIZE // (1024 * 1024)}MB)'}, status=400)
         
         try:
-            if file_name.endswith('.txt'):
-                # Process text file
-                content = uploaded_file.read().decode('utf-8')
-                numbers = [line.strip() for line in content.split('\n') if line.strip()]
-                
-            elif file_name.endswith('.csv'):
-                # Process CSV file
-                content = uploaded_file.read().decode('utf-8')
-                csv_reader = csv.reader(io.StringIO(content))
-                
-                for row in csv_reader:
-                    if row and row[0].strip():
-                        numbers.append(row[0].strip())
-                        
-            else:
-                return JsonResponse({'error': 'Unsupported file format. Use .txt or .csv'}, status=400)
-            
-            # Clean and validate numbers
-            clean_numbers = []
-            for num in numbers:
-                clean_num = str(num).strip()
-                if clean_num and len(clean_num) >= 10:
-                    clean_numbers.append(clean_num)
-            
-            if not clean_numbers:
-                return JsonResponse({'error': 'No valid phone numbers found in file'}, status=400)
-            
-            return JsonResponse({
-                'success': True,
-                'numbers': clean_numbers,
-                'count': len(clean_numbers),
-                'message': f'Successfully loaded {len(clean_numbers)} phone numbers'
-            })
-            
+            # Parsed chunk by chunk (large uploads are spooled to disk by
+            # Django) and sent back as the numbers come out of the parser
+            body = json_stream(
+                unique_numbers(extract_numbers(uploaded_file, uploaded_file.name)),
+                lambda count: {'count': count, 'message': f'Successfully loaded {count} phone numbers'}
+            )
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
         except Exception as e:
             return JsonResponse({'error': f'Error processing file: {str(e)}'}, status=500)
+        
+        if body is None:
+            return JsonResponse({'error': 'No valid phone numbers found in file'}, status=400)
+        
+        return StreamingHttpResponse(body, content_type='application/json')
             
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
@@ -6,12 +6,9 @@
     print(f' Fast checking: {number}')
     
     try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.common.exceptions import TimeoutException
+        from whatsapp import config
+        from whatsapp.driver_factory import create_driver
+        from whatsapp.spa import open_compose
         import re
         import time
         
@@ -24,55 +21,30 @@
         if not hasattr(check_whatsapp_registration_fast, 'driver') or check_whatsapp_registration_fast.driver is None:
             print(' Starting persistent browser...')
             
-            chrome_options = Options()
-            chrome_options.add_argument(f'--user-data-dir=C:\\num\\chrome_profile')
-            chrome_options.add_argument('--profile-directory=Default')
-            chrome_options.add_argument('--disable-notifications')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--disable-images')
-            
-            check_whatsapp_registration_fast.driver = webdriver.Chrome(options=chrome_options)
-            check_whatsapp_registration_fast.driver.get('https://web.whatsapp.com')
+            check_whatsapp_registration_fast.driver = create_driver()
+            check_whatsapp_registration_fast.driver.get(config.BASE_URL)
             time.sleep(3)
         
         driver = check_whatsapp_registration_fast.driver
         
-        # Fast navigation
-        compose_url = f'https://web.whatsapp.com/send?phone={clean_number}'
-        driver.get(compose_url)
-        
-        # Quick detection with short timeout
-        wait = WebDriverWait(driver, 3)
-        
-        try:
-            # Quick error check
-            error_element = wait.until(EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'invalid')]")))
+        # Fast navigation: route inside the running app, reload only if
+        # that gives no verdict; race error and chat signals, 3s deadline
+        outcome = open_compose(driver, clean_number, timeout=3)
+        if outcome['signal'] == 'not_registered':
             print(' FAST: NOT registered')
             return False
-        except TimeoutException:
-            pass
-        
-        try:
-            # Quick chat check
-            chat_element = driver.find_element(By.CSS_SELECTOR, 'div[contenteditable="true"]')
-            if chat_element.is_displayed():
-                print(' FAST: REGISTERED')
-                return True
-        except:
-            pass
-        
-        # URL check as fallback
-        if 'send?phone=' in driver.current_url:
-            print(' FAST: REGISTERED (URL)')
+        if outcome['signal'] == 'registered':
+            print(' FAST: REGISTERED')
             return True
         
-        print(' FAST: Assuming NOT registered')
-        return False
+        # No signal is no verdict: the compose URL stays in the address bar
+        # and the chat list search box is contenteditable on every page
+        print(f' FAST: No signal ({outcome["signal"]})')
+        return {'error': f'No registration signal within 3s ({outcome["signal"]})'}
         
     except Exception as e:
         print(f' FAST error: {str(e)}')
-        return False
+        return {'error': f'FAST error: {str(e)}'}
 
 # Initialize driver
 check_whatsapp_registration_fast.driver = None
@@ -1,11 +1,15 @@
 ﻿from concurrent.futures import ThreadPoolExecutor
 import asyncio
+import queue
+from whatsapp import config
 
-def check_whatsapp_super_fast(number):
+from whatsapp.driver_factory import create_driver
+from whatsapp.profiles import clone_worker_profiles, linked_profiles, remove_worker_profiles
+from whatsapp.readiness import phrases, probe, wait_for_outcome
+
+def check_whatsapp_super_fast(number, profile_dir=None):
     """SUPER FAST checker with minimal waits"""
     try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
         from selenium.webdriver.common.by import By
         from selenium.common.exceptions import TimeoutException, NoSuchElementException
         import re
@@ -18,70 +22,80 @@ def check_whatsapp_super_fast(number):
         if clean_number.startswith('+'):
             clean_number = clean_number[1:]
         
-        # Lightning-fast Chrome options
-        chrome_options = Options()
-        chrome_options.add_argument(f'--user-data-dir=C:\\num\\chrome_profile')
-        chrome_options.add_argument('--profile-directory=Default')
-        chrome_options.add_argument('--headless')  # No GUI for speed
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--disable-images')
-        chrome_options.add_argument('--disable-javascript')
-        chrome_options.add_argument('--disable-css')
-        chrome_options.add_argument('--disable-plugins')
-        chrome_options.add_argument('--disable-extensions')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        
-        driver = webdriver.Chrome(options=chrome_options)
+        # Lightning-fast Chrome: headless, images and fonts blocked
+        driver = create_driver('headless-fast', user_data_dir=profile_dir)
         
         try:
             # Ultra-fast navigation
-            compose_url = f'https://web.whatsapp.com/send?phone={clean_number}'
+            compose_url = f'{config.BASE_URL}/send?phone={clean_number}'
             driver.get(compose_url)
             
-            # Minimal wait - just 2 seconds max
-            time.sleep(2)
-            
-            # Quick DOM check
-            page_source = driver.page_source.lower()
-            
-            # Fast text-based detection
-            if any(error_text in page_source for error_text in 
-                   ['invalid', 'not on whatsapp', 'phone number shared via url is invalid']):
+            # Minimal wait - resolve on the first signal, 2 seconds max
+            outcome = wait_for_outcome(driver, timeout=2)
+            if outcome['signal'] == 'not_registered':
                 print(f' {number}: NOT registered')
                 return False
-            
-            # Check for chat indicators
-            if any(success_text in page_source for success_text in 
-                   ['type a message', 'contenteditable', 'data-testid="compose"']):
-                print(f' {number}: REGISTERED')  
+            if outcome['signal'] == 'registered':
+                print(f' {number}: REGISTERED')
                 return True
             
-            # URL-based check
-            current_url = driver.current_url
-            if 'send?phone=' in current_url and clean_number in current_url:
-                print(f' {number}: REGISTERED (URL)')
+            # Quick text and element check, one round trip
+            hit = probe(driver, {
+                'not_registered': phrases('invalid', 'not on whatsapp', 'phone number shared via url is invalid'),
+                'registered': phrases('type a message') + ['[data-testid="compose"]'],
+            })
+            if hit and hit['signal'] == 'not_registered':
+                print(f' {number}: NOT registered')
+                return False
+            if hit and hit['signal'] == 'registered':
+                print(f' {number}: REGISTERED')  
                 return True
             
-            print(f' {number}: Unclear - assuming NOT registered')
-            return False
+            # The compose URL stays in the address bar whatever the outcome,
+            # so no signal means no verdict
+            print(f' {number}: Unclear - no signal')
+            return {'error': f'No registration signal within 2s ({outcome["signal"]})'}
             
         finally:
             driver.quit()
             
     except Exception as e:
         print(f' {number}: Error - {str(e)}')
-        return False
+        return {'error': str(e)}
 
 def batch_check_parallel(numbers, max_workers=3):
-    """Check multiple numbers in parallel"""
+    """
+    Check multiple numbers in parallel, one browser per worker.
+
+    Each worker needs a separately linked profile (WHATSAPP_LINKED_PROFILES,
+    see whatsapp.profiles): browsers on copies of one linked device take
+    the WhatsApp Web session from each other. ``max_workers`` is capped at
+    the number of linked profiles.
+    """
+    linked = len(linked_profiles())
+    if max_workers > linked:
+        print(f' Only {linked} linked profile(s), using {linked} worker(s) instead of {max_workers}')
+        max_workers = linked
     print(f' Starting parallel checking of {len(numbers)} numbers with {max_workers} workers')
     
     results = []
     
+    # Every worker runs on a copy of its own linked profile, Chrome locks user-data-dir
+    profile_dirs = clone_worker_profiles(max_workers)
+    free_profiles = queue.Queue()
+    for profile_dir in profile_dirs:
+        free_profiles.put(profile_dir)
+    
+    def check_with_own_profile(number):
+        profile_dir = free_profiles.get()
+        try:
+            return check_whatsapp_super_fast(number, profile_dir)
+        finally:
+            free_profiles.put(profile_dir)
+    
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         # Submit all tasks
-        future_to_number = {executor.submit(check_whatsapp_super_fast, number.strip()): number.strip() 
+        future_to_number = {executor.submit(check_with_own_profile, number.strip()): number.strip() 
                           for number in numbers}
         
         # Collect results as they complete
@@ -89,6 +103,8 @@ def batch_check_parallel(numbers, max_workers=3):
             number = future_to_number[future]
             try:
                 result = future.result()
+                if isinstance(result, dict):
+                    raise RuntimeError(result['error'])
                 results.append({
                     'number': number,
                     'registered': result,
@@ -103,4 +119,6 @@ def batch_check_parallel(numbers, max_workers=3):
                 })
                 print(f' Failed: {number} -> {str(e)}')
     
+    # Every browser has quit, the clones are no longer needed
+    remove_worker_profiles(profile_dirs)
     return results
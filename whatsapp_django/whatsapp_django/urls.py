@@ -9,7 +9,12 @@ urlpatterns = [
     path('api/check-batch/', views.check_batch, name='check_batch'),
     path('api/upload-file/', views.upload_file, name='upload_file'),
     path('api/status/', views.get_status, name='get_status'),
+    path('api/jobs/<int:job_id>/status/', views.job_status, name='job_status'),
+    path('api/jobs/<int:job_id>/results/', views.job_results, name='job_results'),
+    path('api/jobs/<int:job_id>/events/', views.job_events, name='job_events'),
     path('api/download/<str:filename>/', views.download_results, name='download_results'),
+    path('api/initialize/', views.initialize_session, name='initialize'),
+    path('api/session-status/', views.session_status, name='api_session_status'),
     path('session-status/', views.session_status, name='session_status'),
     path('test/', views.test_page, name='test'),
     path('test-api/', views.test_api, name='test_api'),
@@ -6,8 +6,7 @@ Manages persistent WhatsApp Web sessions to avoid QR scanning every time
 
 import os
 import shutil
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from whatsapp.driver_factory import create_driver
 
 class WhatsAppSessionManager:
     def __init__(self, session_name="default"):
@@ -25,33 +24,14 @@ class WhatsAppSessionManager:
     
     def create_driver(self, headless=False):
         """Create Chrome driver with persistent session"""
-        options = Options()
-        
-        # Use session-specific profile
-        options.add_argument(f"--user-data-dir={self.session_dir}")
-        options.add_argument("--profile-directory=Profile")
-        
-        # Chrome options for stability
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-plugins")
-        options.add_argument("--disable-images")
-        options.add_argument("--disable-javascript")
-        options.add_argument("--window-size=1200,800")
-        
-        if headless:
-            options.add_argument("--headless")
-        
-        # Anti-detection options
-        options.add_experimental_option("useAutomationExtension", False)
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        
         try:
-            driver = webdriver.Chrome(options=options)
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            return driver
+            # Session-specific profile; flags, background tabs and resource
+            # blocking come from the profile (see whatsapp.driver_factory)
+            return create_driver(
+                'headless-fast' if headless else 'interactive',
+                user_data_dir=self.session_dir,
+                profile_directory='Profile',
+            )
         except Exception as e:
             print(f"Error creating driver: {e}")
             return None